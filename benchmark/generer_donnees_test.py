@@ -0,0 +1,149 @@
+"""
+Generateur de fichiers sources synthetiques pour le dashboard retailer.
+
+Produit dans un dossier les quatre classeurs attendus par generer_dashboard.py,
+avec les memes noms de feuilles et de colonnes que les exports reels :
+ExcelStock-*, ExcelVenteHebdo-*, *RECAP* et *LABBURINTEL*.
+
+Exemple :
+    python benchmark/generer_donnees_test.py --articles 10000 --semaines 12 --enseignes 3 --sortie D:\\bench_data
+"""
+import argparse
+import importlib.util
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+ENSEIGNES = ["ELECTROPLANET", "MARJANE", "CARREFOUR", "BIM", "ASWAK ASSALAM", "LABEL VIE"]
+MARQUES = ["SAMSUNG", "LG", "SONY", "PHILIPS", "HISENSE", "TCL", "BOSCH", "WHIRLPOOL",
+           "BEKO", "CANDY", "XIAOMI", "APPLE", "HUAWEI", "MOULINEX", "TEFAL", "BRANDT"]
+FAMILLES = ["TV LED", "REFRIGERATEUR", "LAVE LINGE", "SMARTPHONE", "CLIMATISEUR",
+            "MICRO ONDES", "ASPIRATEUR", "FOUR", "CAFETIERE", "BARRE DE SON"]
+COULEURS = ["NOIR", "BLANC", "INOX", "GRIS", "ARGENT"]
+MAGASINS = ["CASA ANFA", "RABAT AGDAL", "MARRAKECH MENARA", "TANGER CITY", "FES SAISS", "AGADIR"]
+
+LIGNES_MAX_EXCEL = 1_048_575
+
+
+def _libelles(rng, n):
+    """Libelles articles et descriptions Burintel (meme produit, ecriture differente)"""
+    marques = rng.choice(MARQUES, n)
+    familles = rng.choice(FAMILLES, n)
+    couleurs = rng.choice(COULEURS, n)
+    modeles = [f"{m[:2]}{rng.integers(100, 9999)}{chr(65 + rng.integers(0, 26))}" for m in marques]
+    tailles = rng.integers(20, 90, n)
+    libelles = [f"{f.title()} {m.title()} {t}\" {mo} {c.lower()}"
+                for f, m, t, mo, c in zip(familles, marques, tailles, modeles, couleurs)]
+    descriptions = [f"{m} {f} {mo} {t}P {c}" for f, m, t, mo, c in zip(familles, marques, tailles, modeles, couleurs)]
+    return marques, libelles, descriptions
+
+
+def _colonnes_extra(rng, n, nb):
+    """Colonnes inutilisees par le dashboard, comme dans les exports reels"""
+    return {f"Info {i + 1}": rng.integers(0, 1000, n) for i in range(nb)}
+
+
+def generer(dossier, nb_articles=1000, nb_semaines=4, nb_enseignes=2, taux_vente=0.6,
+            colonnes_extra=10, graine=0, date_fin="2024-12-30"):
+    """Ecrit les quatre classeurs dans `dossier` et retourne leurs chemins"""
+    rng = np.random.default_rng(graine)
+    os.makedirs(dossier, exist_ok=True)
+    enseignes = ENSEIGNES[:max(1, nb_enseignes)]
+    semaines = pd.date_range(end=pd.Timestamp(date_fin), periods=nb_semaines, freq="W-MON")
+    suffixe = semaines[-1].strftime("%Y%m%d")
+
+    eans = 6111000000000 + rng.choice(10_000_000, nb_articles, replace=False)
+    marques, libelles, descriptions = _libelles(rng, nb_articles)
+    p_achat = rng.integers(50, 15000, nb_articles)
+    p_vente = (p_achat * rng.uniform(1.1, 1.6, nb_articles)).round(0)
+    codes = np.array([f"BUR{i:06d}" for i in range(nb_articles)])
+    avec_code = rng.random(nb_articles) < 0.7
+
+    # RECAP (articles EP)
+    recap = pd.DataFrame({
+        "EAN": eans.astype(str),
+        "MARQUE": marques,
+        "Code Burintel": np.where(avec_code, codes, None),
+        "Libelle EP": libelles,
+        "Stock EP": rng.integers(0, 60, nb_articles),
+        "P.Vente": p_vente,
+        "P.Achat": p_achat,
+        "BURINTEL DEPOT": rng.integers(0, 40, nb_articles),
+        **_colonnes_extra(rng, nb_articles, colonnes_extra),
+    })
+
+    # STOCK (une ligne par article et par enseigne)
+    stock = pd.concat([pd.DataFrame({
+        "Enseigne": enseigne,
+        "EAN": eans.astype(str),
+        "Libellé article": libelles,
+        "Quantité": rng.integers(0, 60, nb_articles),
+        "P.Vente": p_vente,
+        "P.Achat": p_achat,
+        "MARQUE": marques,
+    }) for enseigne in enseignes], ignore_index=True)
+    stock = pd.concat([stock, pd.DataFrame(_colonnes_extra(rng, len(stock), colonnes_extra))], axis=1)
+
+    # VENTES (articles vendus par enseigne et par semaine, demande propre a chaque article)
+    demande = rng.gamma(1.2, 2.0, nb_articles)
+    blocs = []
+    for enseigne in enseignes:
+        for semaine in semaines:
+            vendus = np.flatnonzero(rng.random(nb_articles) < taux_vente)
+            blocs.append(pd.DataFrame({
+                "EAN": eans[vendus].astype(str),
+                "Libellé Enseigne": enseigne,
+                "Magasin": rng.choice(MAGASINS, len(vendus)),
+                "Début semaine": semaine.strftime("%d/%m/%Y"),
+                "Libellé article": np.asarray(libelles, dtype=object)[vendus],
+                "Quantité": rng.poisson(demande[vendus]) + 1,
+            }))
+    ventes = pd.concat(blocs, ignore_index=True)
+    if len(ventes) > LIGNES_MAX_EXCEL:
+        print(f"{len(ventes)} lignes de ventes > limite Excel -> tronque a {LIGNES_MAX_EXCEL}")
+        ventes = ventes.iloc[-LIGNES_MAX_EXCEL:]
+    ventes = pd.concat([ventes.reset_index(drop=True),
+                        pd.DataFrame(_colonnes_extra(rng, len(ventes), colonnes_extra))], axis=1)
+
+    # BURINTEL (stock depot, une partie des articles seulement)
+    dans_burintel = rng.random(nb_articles) < 0.8
+    burintel = pd.DataFrame({
+        "N°": codes[dans_burintel],
+        "Description": np.asarray(descriptions, dtype=object)[dans_burintel],
+        "Stock Burintel": rng.integers(0, 80, int(dans_burintel.sum())),
+    })
+
+    fichiers = {
+        "stock": (os.path.join(dossier, f"ExcelStock-{suffixe}.xlsx"), "Stock", stock),
+        "ventes": (os.path.join(dossier, f"ExcelVenteHebdo-{suffixe}.xlsx"), "Ventes hebdomadaires", ventes),
+        "recap": (os.path.join(dossier, f"RECAP_EP_{suffixe}.xlsx"), "RECAP", recap),
+        "burintel": (os.path.join(dossier, f"LABBURINTEL_{suffixe}.xlsx"), "Stock", burintel),
+    }
+    engine = "xlsxwriter" if importlib.util.find_spec("xlsxwriter") else "openpyxl"
+    for nom, (chemin, feuille, df) in fichiers.items():
+        debut = time.perf_counter()
+        df.to_excel(chemin, sheet_name=feuille, index=False, engine=engine)
+        print(f"   {os.path.basename(chemin)}: {len(df)} lignes ({time.perf_counter() - debut:.1f}s)")
+    return {nom: chemin for nom, (chemin, _, _) in fichiers.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genere des fichiers sources synthetiques pour le dashboard")
+    parser.add_argument("--sortie", required=True, help="dossier de destination")
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--semaines", type=int, default=4)
+    parser.add_argument("--enseignes", type=int, default=2)
+    parser.add_argument("--taux-vente", type=float, default=0.6, help="part des articles vendus chaque semaine")
+    parser.add_argument("--colonnes-extra", type=int, default=10, help="colonnes inutilisees ajoutees a chaque fichier")
+    parser.add_argument("--graine", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"Generation: {args.articles} articles, {args.semaines} semaines, {args.enseignes} enseignes")
+    generer(args.sortie, args.articles, args.semaines, args.enseignes, args.taux_vente,
+            args.colonnes_extra, args.graine)
+
+
+if __name__ == "__main__":
+    main()
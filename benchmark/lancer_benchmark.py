@@ -0,0 +1,190 @@
+"""
+Benchmark du dashboard par etape, sur des donnees synthetiques de tailles croissantes.
+
+Pour chaque taille (articles x semaines x enseignes), les fichiers sont generes
+avec generer_donnees_test.py puis chaque etape du package dashboard_rotation est
+chronometree (temps reel, temps CPU) et profilee en memoire (pic tracemalloc) :
+decouverte, chargement, normalisation, fusion, KPI, recommandations,
+modele de rendu et ecriture Excel (styles et sauvegarde compris).
+
+Les resultats sont ecrits en JSON pour comparer les versions entre elles.
+
+Exemple :
+    python benchmark/lancer_benchmark.py --tailles 1000x4x2 10000x12x3 --moteur les_deux
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+
+from dashboard_rotation import catalogue, chargement, indicateurs, modele_rendu, rendu_excel  # noqa: E402
+from dashboard_rotation.config import Config  # noqa: E402
+from generer_donnees_test import generer  # noqa: E402
+
+
+class Chrono:
+    """Mesure temps reel, temps CPU et pic memoire de chaque etape"""
+
+    def __init__(self, memoire=True):
+        self.memoire = memoire
+        self.etapes = []
+
+    @contextmanager
+    def etape(self, nom, lignes=None):
+        if self.memoire:
+            tracemalloc.reset_peak()
+            avant, _ = tracemalloc.get_traced_memory()
+        debut, debut_cpu = time.perf_counter(), time.process_time()
+        infos = {"etape": nom, "lignes": lignes}
+        yield infos
+        mesure = {
+            "etape": nom,
+            "duree_s": round(time.perf_counter() - debut, 4),
+            "cpu_s": round(time.process_time() - debut_cpu, 4),
+            "lignes": infos["lignes"],
+        }
+        if self.memoire:
+            _, pic = tracemalloc.get_traced_memory()
+            mesure["memoire_pic_mo"] = round((pic - avant) / 1e6, 2)
+        self.etapes.append(mesure)
+
+
+def version_code():
+    """Commit git courant (ou 'inconnue')"""
+    try:
+        return subprocess.check_output(["git", "describe", "--always", "--dirty"], cwd=RACINE,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "inconnue"
+
+
+def mesurer_pipeline(dossier_data, dossier_sortie, moteur, memoire=True):
+    """Execute le pipeline simple (derniere semaine de ENSEIGNE) etape par etape"""
+    chrono = Chrono(memoire)
+    if memoire:
+        tracemalloc.start()
+    try:
+        return _mesurer_etapes(chrono, dossier_data, dossier_sortie, moteur)
+    finally:
+        if memoire:
+            tracemalloc.stop()
+
+
+def _mesurer_etapes(chrono, dossier_data, dossier_sortie, moteur):
+    """Enchaine les etapes du pipeline sous le chrono"""
+    config = Config(dossier_data=dossier_data, dossier_sortie=dossier_sortie, cache_actif=False)
+    with chrono.etape("decouverte"):
+        fichiers = catalogue.trouver_fichiers(dossier_data)
+
+    sources = {}
+    for nom in ["stock", "ventes", "burintel", "recap"]:
+        with chrono.etape(f"chargement_{nom}") as infos:
+            df = chargement.lire_source(nom, fichiers[nom], config) if fichiers[nom] else pd.DataFrame()
+            infos["lignes"] = len(df)
+        sources[nom] = df
+
+    df_stock, df_ventes, df_burintel, df_recap = sources["stock"], sources["ventes"], sources["burintel"], sources["recap"]
+    with chrono.etape("normalisation") as infos:
+        if df_recap.empty and not df_stock.empty:
+            df_recap = chargement.recap_depuis_stock(df_stock, config.enseigne)
+        chargement.normaliser(df_recap, df_ventes, df_stock, df_burintel)
+        infos["lignes"] = len(df_recap) + len(df_ventes) + len(df_stock) + len(df_burintel)
+
+    with chrono.etape("fusion") as infos:
+        df_ventes_sem, date_semaine = chargement.ventes_derniere_semaine(df_ventes, config.enseigne)
+        ventes_ean = df_ventes_sem.groupby("EAN")["Quantité"].sum().reset_index(name="VENTES_HEBDO")
+        dashboard = indicateurs.calculer_dashboard(df_recap, ventes_ean, config)
+        infos["lignes"] = len(dashboard)
+    week_num = date_semaine.isocalendar()[1]
+
+    with chrono.etape("kpi", len(dashboard)):
+        metriques = indicateurs.calculer_metriques(dashboard, week_num, config)
+        indicateurs.calculer_kpi(metriques)
+
+    with chrono.etape("recommandations", len(dashboard)):
+        recommandations = indicateurs.generer_recommandations(metriques, config)
+
+    with chrono.etape("preparation_export", len(dashboard)):
+        blocs = rendu_excel.preparer_export(dashboard, metriques, recommandations, config)
+    dashboard_export = blocs[-1]
+
+    with chrono.etape("modele_rendu", len(dashboard_export)):
+        feuilles = modele_rendu.modele_classeur(*blocs, week_num)
+
+    fichier = os.path.join(dossier_sortie, f"bench_{moteur}.xlsx")
+    with chrono.etape("ecriture_excel", len(dashboard_export)):
+        if moteur == "xlsxwriter":
+            rendu_excel.exporter_xlsxwriter(fichier, feuilles)
+        else:
+            rendu_excel.exporter_openpyxl(fichier, feuilles)
+
+    return chrono.etapes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark par etape du dashboard retailer")
+    parser.add_argument("--tailles", nargs="+", default=["1000x4x2", "10000x12x3"],
+                        help="articles x semaines x enseignes, ex: 1000x4x2 200000x52x4")
+    parser.add_argument("--moteur", choices=["openpyxl", "xlsxwriter", "les_deux"], default="openpyxl")
+    parser.add_argument("--sans-memoire", action="store_true", help="desactive tracemalloc (temps plus justes)")
+    parser.add_argument("--dossier", help="dossier de travail (temporaire par defaut)")
+    parser.add_argument("--resultats", help="fichier JSON de sortie")
+    args = parser.parse_args()
+
+    moteurs = ["openpyxl", "xlsxwriter"] if args.moteur == "les_deux" else [args.moteur]
+    dossier_travail = args.dossier or tempfile.mkdtemp(prefix="bench_dashboard_")
+    resultats = {
+        "version": version_code(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "plateforme": platform.platform(),
+        "memoire": not args.sans_memoire,
+        "mesures": [],
+    }
+
+    for taille in args.tailles:
+        nb_articles, nb_semaines, nb_enseignes = (int(x) for x in taille.lower().split("x"))
+        dossier_data = os.path.join(dossier_travail, taille, "data")
+        dossier_sortie = os.path.join(dossier_travail, taille, "sortie")
+        os.makedirs(dossier_sortie, exist_ok=True)
+        if not os.path.isdir(dossier_data):
+            print(f"\nGeneration des donnees {taille}...")
+            generer(dossier_data, nb_articles, nb_semaines, nb_enseignes)
+
+        for moteur in moteurs:
+            print(f"\nBenchmark {taille} ({moteur})")
+            etapes = mesurer_pipeline(dossier_data, dossier_sortie, moteur, memoire=not args.sans_memoire)
+            for e in etapes:
+                memoire = f"{e['memoire_pic_mo']:>9.1f} Mo" if "memoire_pic_mo" in e else ""
+                print(f"   {e['etape']:<22} {e['duree_s']:>8.3f}s  cpu {e['cpu_s']:>8.3f}s {memoire}")
+            resultats["mesures"].append({
+                "taille": {"articles": nb_articles, "semaines": nb_semaines, "enseignes": nb_enseignes},
+                "moteur": moteur,
+                "total_s": round(sum(e["duree_s"] for e in etapes), 4),
+                "etapes": etapes,
+            })
+
+    chemin = args.resultats or os.path.join(RACINE, "benchmark", "resultats",
+                                            f"bench_{resultats['version']}_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+    with open(chemin, "w", encoding="utf-8") as f:
+        json.dump(resultats, f, indent=2, ensure_ascii=False)
+    print(f"\nResultats: {chemin}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Dashboard retailer : rotation, couverture et STATUS des articles d'une enseigne.
+
+    from dashboard_rotation import Config, build_dashboard, render_dashboard
+    resultat = build_dashboard("D:/Data", Config(enseigne="ELECTROPLANET"))
+    render_dashboard(resultat)
+
+pandas n'est importe qu'au premier acces a l'API de calcul, openpyxl/xlsxwriter qu'a l'ecriture.
+"""
+from .config import Config
+
+_API = {
+    "build_dashboard": "pipeline",
+    "render_dashboard": "pipeline",
+    "ResultatDashboard": "pipeline",
+    "generer_batch": "batch",
+    "MetriquesDashboard": "indicateurs",
+}
+
+__all__ = ["Config", *_API]
+
+
+def __getattr__(nom):
+    if nom in _API:
+        from importlib import import_module
+        return getattr(import_module(f".{_API[nom]}", __name__), nom)
+    raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
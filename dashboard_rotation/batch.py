@@ -0,0 +1,177 @@
+"""Mode batch : toutes les enseignes x toutes les semaines sur un pool de processus."""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from . import instrumentation
+from .chargement import (
+    charger_en_parallele, extraire_stock_burintel, lire_source, normaliser, recap_depuis_stock,
+    ventes_par_enseigne_semaine,
+)
+from .commandes import calculer_commandes
+from .config import Config
+from .demande import demande_semaine, matrice_demande
+from .export_donnees import exporter_donnees
+from .historique import ventes_depuis_historique
+from .indicateurs import calculer_dashboard, calculer_metriques
+from .instrumentation import etape
+from .pipeline import code_enseigne, decouvrir_sources
+from .rendu_excel import exporter_dashboard
+from .sensibilite import calculer_sensibilite
+from .validation import valider_sources
+from .variations import variations_semaine
+
+
+def _exporter_tache(tache):
+    """Tache du pool de processus : ecrit les fichiers Suivi_*_Wxx -> (principal ou None, mesures du processus)"""
+    fichier, dashboard, enseigne, date_semaine, variations, commandes, anomalies, sensibilite, config = tache
+    nb = instrumentation.nb_mesures()
+    with etape(os.path.basename(fichier), len(dashboard)):
+        with etape("kpi", len(dashboard)):
+            metriques = calculer_metriques(dashboard, date_semaine.isocalendar()[1], config)
+        if "xlsx" in config.formats_export:
+            exporter_dashboard(fichier, dashboard, metriques, config=config, variations=variations,
+                               commandes=commandes, anomalies=anomalies, sensibilite=sensibilite)
+        donnees = exporter_donnees(os.path.splitext(fichier)[0], dashboard, metriques, enseigne, date_semaine,
+                                   config=config, variations=variations, commandes=commandes, anomalies=anomalies,
+                                   sensibilite=sensibilite)
+    if "xlsx" not in config.formats_export:
+        fichier = donnees[0] if donnees else None
+    return fichier, instrumentation.extraire_mesures(nb)
+
+
+def generer_batch(sources=None, config=None):
+    """Charge les sources une fois et genere un classeur par (enseigne, semaine) en parallele"""
+    config = config or Config()
+    instrumentation.activer(config.instrumentation)
+    fichiers = decouvrir_sources(sources, config)
+    semaines_batch = None
+    if config.batch_semaines is not None:
+        semaines_batch = list(pd.to_datetime(pd.Series(config.batch_semaines), dayfirst=True))
+
+    taches = {}
+    if fichiers["stock"]:
+        taches["stock"] = (lire_source, ("stock", fichiers["stock"], config))
+    if config.historique_actif:
+        # le moteur de demande a besoin des semaines precedentes
+        semaines_lues = semaines_batch if config.demande == "hebdo" else None
+        taches["ventes"] = (ventes_depuis_historique, (config, config.batch_enseignes, semaines_lues))
+    elif fichiers["ventes"]:
+        taches["ventes"] = (lire_source, ("ventes", fichiers["ventes"], config))
+    if fichiers["recap"]:
+        taches["recap"] = (lire_source, ("recap", fichiers["recap"], config))
+    if (config.commandes_actives or config.rapprochement_burintel) and fichiers["burintel"]:
+        taches["burintel"] = (lire_source, ("burintel", fichiers["burintel"], config))
+    sources = charger_en_parallele(taches, config.chargement_parallele)
+
+    df_stock = sources.get("stock", pd.DataFrame())
+    df_ventes = sources.get("ventes", pd.DataFrame())
+    df_recap_ep = sources.get("recap", pd.DataFrame())
+    df_burintel = sources.get("burintel", pd.DataFrame())
+    with etape("normalisation", len(df_stock) + len(df_ventes) + len(df_recap_ep) + len(df_burintel)):
+        normaliser(df_stock, df_ventes, df_recap_ep, df_burintel)
+    burintel_stock = extraire_stock_burintel(df_burintel)
+
+    with etape("ventes par enseigne et semaine", len(df_ventes)):
+        ventes = ventes_par_enseigne_semaine(df_ventes, config.enseigne)
+    if ventes.empty:
+        print("Pas de ventes exploitables -> EXIT")
+        return []
+
+    cibles = ventes.index.droplevel("EAN").unique()
+    if config.batch_enseignes is not None:
+        cibles = cibles[cibles.get_level_values("ENSEIGNE").isin(config.batch_enseignes)]
+    if semaines_batch is not None:
+        cibles = cibles[cibles.get_level_values("SEMAINE").isin(semaines_batch)]
+    print(f"\nBATCH: {len(cibles)} couples (enseigne, semaine)")
+
+    # RECAP par enseigne : fichier RECAP pour ENSEIGNE, sinon Stock filtre
+    recaps = {}
+    matrices = {}
+    photos = {}     # enseigne -> (semaine, photo) de la derniere semaine traitee
+    taches = []
+    echecs = 0      # couples (enseigne, semaine) en erreur avant l'export
+    stamp = datetime.now().strftime('%d%m%Y_%H%M')
+    os.makedirs(config.dossier_sortie, exist_ok=True)
+    for (enseigne, date_semaine), ventes_sem in ventes.groupby(level=["ENSEIGNE", "SEMAINE"], observed=True):
+        if (enseigne, date_semaine) not in cibles:
+            continue
+        if enseigne not in recaps:
+            if enseigne == config.enseigne and not df_recap_ep.empty:
+                recaps[enseigne] = df_recap_ep
+            elif not df_stock.empty:
+                recaps[enseigne] = recap_depuis_stock(df_stock, enseigne)
+            else:
+                recaps[enseigne] = pd.DataFrame()
+            if recaps[enseigne].empty:
+                print(f"   {enseigne}: aucun article -> ignoree")
+        df_recap = recaps[enseigne]
+        if df_recap.empty:
+            continue
+
+        # un couple en erreur est signale et saute, les autres sont generes
+        try:
+            ventes_ean = ventes_sem.droplevel(["ENSEIGNE", "SEMAINE"]).reset_index(name="VENTES_HEBDO")
+            if config.demande != "hebdo":
+                # matrice EAN x semaine construite une fois par enseigne, lue a chaque semaine
+                if enseigne not in matrices:
+                    ventes_enseigne = ventes.xs(enseigne, level="ENSEIGNE")
+                    with etape(f"matrice demande {enseigne}", len(ventes_enseigne)):
+                        matrices[enseigne] = matrice_demande(ventes_enseigne.index.get_level_values("SEMAINE"),
+                                                             ventes_enseigne.index.get_level_values("EAN"),
+                                                             ventes_enseigne.to_numpy())
+                ventes_ean = demande_semaine(*matrices[enseigne], date_semaine, config)
+            anomalies = None
+            if config.validation_active:
+                with etape(f"validation {enseigne} {date_semaine:%d/%m/%Y}", len(df_recap) + len(ventes_ean)):
+                    df_recap, ventes_ean, anomalies = valider_sources(df_recap, ventes_ean, config)
+            with etape(f"fusion {enseigne} {date_semaine:%d/%m/%Y}", len(df_recap)):
+                dashboard = calculer_dashboard(df_recap, ventes_ean, config, burintel_stock)
+            variations = None
+            if config.variations_actives:
+                # semaines parcourues dans l'ordre : la precedente est deja en memoire
+                with etape(f"variations {enseigne} {date_semaine:%d/%m/%Y}", len(dashboard)):
+                    variations, photos[enseigne] = variations_semaine(dashboard, enseigne, date_semaine, config,
+                                                                      photos.get(enseigne))
+            commandes = None
+            if config.commandes_actives:
+                with etape(f"commandes {enseigne} {date_semaine:%d/%m/%Y}", len(dashboard)):
+                    commandes = calculer_commandes(dashboard, burintel_stock, config)
+            sensibilite = None
+            if config.sensibilite_active:
+                with etape(f"sensibilite {enseigne} {date_semaine:%d/%m/%Y}", len(dashboard)):
+                    sensibilite = calculer_sensibilite(dashboard, config)
+        except Exception as e:
+            print(f"   Erreur {enseigne} {date_semaine:%d/%m/%Y}: {e}")
+            echecs += 1
+            continue
+        annee, week_num, _ = date_semaine.isocalendar()
+        code = code_enseigne(enseigne, config.codes_enseignes)
+        fichier = os.path.join(config.dossier_sortie, f"Suivi_{code}_W{week_num:02d}_{annee}_{stamp}.xlsx")
+        taches.append((fichier, dashboard, enseigne, date_semaine, variations, commandes, anomalies, sensibilite,
+                       config))
+
+    print(f"Generation de {len(taches)} fichiers Excel...")
+    generes = []
+    with etape("export", len(taches)), \
+            ProcessPoolExecutor(max_workers=config.batch_processus, initializer=instrumentation.init_pool,
+                                initargs=instrumentation.args_pool()) as pool:
+        futures = [pool.submit(_exporter_tache, tache) for tache in taches]
+        for future in as_completed(futures):
+            try:
+                fichier, mesures = future.result()
+            except Exception as e:
+                print(f"   Erreur export: {e}")
+                continue
+            instrumentation.ajouter_mesures(mesures)
+            if fichier is None:
+                continue
+            generes.append(fichier)
+            print(f"   {os.path.basename(fichier)}")
+
+    print(f"\n{'='*80}")
+    print(f"BATCH TERMINE : {len(generes)}/{len(taches) + echecs} fichiers")
+    print(f"{'='*80}")
+    return generes
@@ -0,0 +1,183 @@
+"""Catalogue persistant des fichiers du dossier de donnees : type, semaines et enseignes couvertes, taille, mtime.
+
+Un seul parcours du dossier (os.scandir) par lancement ; seuls les fichiers nouveaux
+ou modifies sont inspectes, les autres sont repris du catalogue JSON.
+"""
+import fnmatch
+import json
+import os
+import re
+
+import pandas as pd
+
+from .chargement import _en_date, cible_semaine, lire_schema
+from .schemas import SCHEMAS
+
+FICHIER_CATALOGUE = "catalogue_donnees.json"
+VERSION = 1
+
+# Motifs des exports (l'ordre tranche si un nom correspond a plusieurs)
+MOTIFS = [
+    ("stock", "ExcelStock-*.xlsx"),
+    ("ventes", "ExcelVenteHebdo-*.xlsx"),
+    ("recap", "*RECAP*.xlsx"),
+    ("burintel", "*LABBURINTEL*.xlsx"),
+]
+TYPES = [t for t, _ in MOTIFS]
+
+
+def type_fichier(nom):
+    """Type d'export deduit du nom (None si le fichier n'est pas une source)"""
+    if nom.startswith("~$"):
+        return None
+    for type_, motif in MOTIFS:
+        if fnmatch.fnmatch(nom, motif):
+            return type_
+    return None
+
+
+def couverture_ventes(chemin):
+    """Semaines ('AAAA-MM-JJ') et enseignes presentes dans un fichier de ventes (seules ces 2 colonnes sont lues)"""
+    schema = SCHEMAS["ventes"].restreint(["Libellé Enseigne", "Début semaine"])
+    try:
+        try:
+            df = lire_schema(chemin, schema)
+        except ValueError:
+            # pas de feuille "Ventes hebdomadaires" : premiere feuille
+            df = lire_schema(chemin, schema, 0)
+    except Exception as e:
+        print(f"Catalogue: {os.path.basename(chemin)} illisible ({e})")
+        return [], []
+    if "Début semaine" not in df.columns:
+        return [], []
+
+    memo = {}
+    semaines = {_en_date(d, memo) for d in df["Début semaine"].drop_duplicates().tolist()}
+    semaines = sorted(d.strftime("%Y-%m-%d") for d in semaines if not pd.isna(d))
+    enseignes = df["Libellé Enseigne"].dropna().unique().tolist() if "Libellé Enseigne" in df.columns else []
+    return semaines, sorted(str(e) for e in enseignes)
+
+
+class Catalogue:
+    """Fichiers sources d'un dossier, indexes par type, semaine et numero de semaine"""
+
+    def __init__(self, dossier, fichier=None):
+        self.dossier = dossier
+        self.fichier = fichier or os.path.join(dossier, FICHIER_CATALOGUE)
+        self.entrees = {}           # nom -> {type, taille, mtime_ns, annee, semaines, enseignes}
+        self._lire()
+
+    def _lire(self):
+        try:
+            with open(self.fichier, encoding="utf-8") as f:
+                contenu = json.load(f)
+        except (OSError, ValueError):
+            return
+        if contenu.get("version") == VERSION:
+            self.entrees = contenu.get("fichiers", {})
+
+    def sauver(self):
+        """Ecrit le catalogue (remplacement atomique ; ignore si le support est en lecture seule)"""
+        tmp = self.fichier + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": VERSION, "fichiers": self.entrees}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.fichier)
+        except OSError as e:
+            print(f"Catalogue non ecrit: {e}")
+
+    def mettre_a_jour(self):
+        """Parcourt le dossier une fois et n'inspecte que les fichiers nouveaux ou modifies : nb inspectes"""
+        vus, inspectes = set(), 0
+        try:
+            entrees = list(os.scandir(self.dossier))
+        except OSError:
+            entrees = []
+        for e in entrees:
+            type_ = type_fichier(e.name)
+            if type_ is None or not e.is_file():
+                continue
+            st = e.stat()
+            vus.add(e.name)
+            connu = self.entrees.get(e.name)
+            if connu and connu["taille"] == st.st_size and connu["mtime_ns"] == st.st_mtime_ns:
+                continue
+            annee = re.search(r"(?<!\d)(20\d\d)(?!\d)", e.name)
+            semaines, enseignes = couverture_ventes(e.path) if type_ == "ventes" else ([], [])
+            self.entrees[e.name] = {
+                "type": type_, "taille": st.st_size, "mtime_ns": st.st_mtime_ns,
+                "annee": int(annee.group(1)) if annee else None,
+                "semaines": semaines, "enseignes": enseignes,
+            }
+            inspectes += 1
+        disparus = set(self.entrees) - vus
+        for nom in disparus:
+            del self.entrees[nom]
+        if inspectes or disparus:
+            self.sauver()
+        self._indexer()
+        return inspectes
+
+    def _indexer(self):
+        """Index en memoire : plus recent par type, fichiers par semaine et par numero ISO (plus recent d'abord)"""
+        par_mtime = sorted(self.entrees.items(), key=lambda kv: kv[1]["mtime_ns"], reverse=True)
+        self._dernier, self._par_semaine, self._par_numero = {}, {}, {}
+        for nom, entree in par_mtime:
+            type_ = entree["type"]
+            self._dernier.setdefault(type_, nom)
+            for s in entree["semaines"]:
+                self._par_semaine.setdefault((type_, s), []).append(nom)
+                numero = pd.Timestamp(s).isocalendar()[1]
+                self._par_numero.setdefault((type_, numero), []).append(nom)
+
+    def chemin(self, nom):
+        return os.path.join(self.dossier, nom) if nom else None
+
+    def dernier(self, type_):
+        """Fichier le plus recemment modifie du type (mtime : conserve par une copie, contrairement a ctime)"""
+        return self.chemin(self._dernier.get(type_))
+
+    def pour_semaine(self, type_, semaine, enseigne=None):
+        """Fichier le plus recent couvrant `semaine` (date 'JJ/MM/AAAA', Timestamp ou numero ISO), None sinon"""
+        cible = cible_semaine(semaine)
+        if cible is None:
+            return self.dernier(type_)
+        if isinstance(cible, pd.Timestamp):
+            noms = self._par_semaine.get((type_, cible.strftime("%Y-%m-%d")), [])
+        else:
+            noms = self._par_numero.get((type_, cible), [])
+        for nom in noms:
+            enseignes = self.entrees[nom]["enseignes"]
+            if enseigne is None or not enseignes or enseigne in enseignes:
+                return self.chemin(nom)
+        return None
+
+    def sur_periode(self, type_, debut, fin):
+        """Fichiers du type couvrant au moins une semaine entre debut et fin (inclus), plus ancien d'abord"""
+        debut = pd.Timestamp(debut).strftime("%Y-%m-%d")
+        fin = pd.Timestamp(fin).strftime("%Y-%m-%d")
+        noms = {nom for (t, s), liste in self._par_semaine.items() if t == type_ and debut <= s <= fin for nom in liste}
+        return [self.chemin(nom) for nom in sorted(noms, key=lambda n: self.entrees[n]["mtime_ns"])]
+
+    def fichiers(self, type_):
+        """Tous les fichiers du type, plus ancien d'abord"""
+        noms = [nom for nom, e in self.entrees.items() if e["type"] == type_]
+        return [self.chemin(nom) for nom in sorted(noms, key=lambda n: self.entrees[n]["mtime_ns"])]
+
+
+def ouvrir_catalogue(dossier, fichier=None):
+    """Catalogue du dossier, mis a jour"""
+    catalogue = Catalogue(dossier, fichier)
+    inspectes = catalogue.mettre_a_jour()
+    if inspectes:
+        print(f"Catalogue: {inspectes} fichier(s) inspecte(s), {len(catalogue.entrees)} au total")
+    return catalogue
+
+
+def trouver_fichiers(dossier, semaine=None, enseigne=None, fichier_catalogue=None):
+    """Fichiers Stock / Ventes / RECAP / Burintel a utiliser : les plus recents, ventes couvrant `semaine` si demandee"""
+    catalogue = ouvrir_catalogue(dossier, fichier_catalogue)
+    fichiers = {type_: catalogue.dernier(type_) for type_ in TYPES}
+    if semaine is not None:
+        fichiers["ventes"] = catalogue.pour_semaine("ventes", semaine, enseigne) or fichiers["ventes"]
+    return fichiers
@@ -0,0 +1,353 @@
+"""Chargement des sources : decouverte des fichiers, lecture Excel avec cache, normalisation, ventes de la semaine."""
+import hashlib
+import os
+import pickle
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from . import instrumentation
+from .compact import cle_ean, compacter, en_dates
+from .config import Config
+from .instrumentation import etape
+from .lecture_xlsx import lire_colonnes
+from .schemas import SCHEMAS
+
+
+def _cle_cache(file_path, sheet_name, kwargs):
+    """Cle du cache : chemin + taille + date de modification + feuille + options"""
+    st = os.stat(file_path)
+    brut = f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}|{sheet_name}|{sorted(kwargs.items())!r}"
+    return hashlib.sha1(brut.encode("utf-8")).hexdigest()
+
+
+def lire_cache(cle, config):
+    """Relit une feuille depuis le cache, None si absente"""
+    for ext in (".feather", ".pkl"):
+        chemin = os.path.join(config.dossier_cache, cle + ext)
+        if not os.path.exists(chemin):
+            continue
+        try:
+            df = pd.read_feather(chemin) if ext == ".feather" else pd.read_pickle(chemin)
+        except Exception as e:
+            print(f"Cache illisible ({e}) -> relecture Excel")
+            os.remove(chemin)
+            return None
+        os.utime(chemin)
+        return df
+    return None
+
+
+def ecrire_cache(cle, df, config):
+    """Stocke une feuille parsee (Feather, ou pickle si colonnes non compatibles Arrow)"""
+    os.makedirs(config.dossier_cache, exist_ok=True)
+    chemin = os.path.join(config.dossier_cache, cle)
+    try:
+        if not all(isinstance(c, str) for c in df.columns):
+            raise TypeError("noms de colonnes non textuels")
+        df.to_feather(chemin + ".feather")
+    except Exception:
+        # pyarrow absent ou colonne de types mixtes : repli sur pickle
+        if os.path.exists(chemin + ".feather"):
+            os.remove(chemin + ".feather")
+        df.to_pickle(chemin + ".pkl", protocol=pickle.HIGHEST_PROTOCOL)
+    purger_cache(config)
+
+
+def purger_cache(config):
+    """Supprime les entrees trop anciennes puis les moins recemment utilisees"""
+    if not os.path.isdir(config.dossier_cache):
+        return
+    entrees = []
+    for e in os.scandir(config.dossier_cache):
+        if e.is_file() and e.name.endswith((".feather", ".pkl")):
+            entrees.append((e.stat().st_mtime, e.path))
+    entrees.sort(reverse=True)
+    limite = time.time() - config.cache_max_age_jours * 86400
+    for rang, (mtime, chemin) in enumerate(entrees):
+        if rang >= config.cache_max_entrees or mtime < limite:
+            try:
+                os.remove(chemin)
+            except OSError:
+                pass
+
+
+def lire_schema(file_path, schema, sheet_name=None, **kwargs):
+    """Feuille reduite aux colonnes du schema, renommees et typees.
+
+    Lecture directe des seules colonnes retenues (xlsx), sinon pandas avec usecols :
+    l'entete suffit a choisir les colonnes, les autres ne sont pas converties.
+    """
+    sheet_name = schema.feuille if sheet_name is None else sheet_name
+    if not kwargs:
+        try:
+            df = lire_colonnes(file_path, sheet_name, lambda entete: list(schema.resoudre(entete).values()))
+            return schema.appliquer(df)
+        except (ValueError, KeyError, zipfile.BadZipFile):
+            pass
+    candidats = {i for c in schema.colonnes for i in (c.nom,) + c.alias}
+    df = pd.read_excel(file_path, sheet_name=sheet_name, usecols=lambda c: str(c).strip() in candidats, **kwargs)
+    return schema.appliquer(df)
+
+
+def safe_read_excel(file_path, sheet_name=0, config=None, use_cache=None, schema=None, **kwargs):
+    """Lecture Excel robuste (avec cache des feuilles deja lues), limitee aux colonnes de `schema` s'il est donne"""
+    config = config or Config()
+    if use_cache is None:
+        use_cache = config.cache_actif
+    cle = None
+    if use_cache and sheet_name is not None:
+        try:
+            cle = _cle_cache(file_path, sheet_name, dict(kwargs, schema=schema.signature()) if schema else kwargs)
+            df = lire_cache(cle, config)
+            if df is not None:
+                print(f"Cache: {os.path.basename(file_path)} [{sheet_name}]")
+                return df
+        except OSError:
+            cle = None
+    try:
+        if schema is not None:
+            df = lire_schema(file_path, schema, sheet_name, **kwargs)
+        else:
+            df = pd.read_excel(file_path, sheet_name=sheet_name, **kwargs)
+    except Exception as e:
+        print(f"Erreur lecture: {e}")
+        return pd.DataFrame()
+    if cle is not None and isinstance(df, pd.DataFrame):
+        try:
+            ecrire_cache(cle, df, config)
+        except Exception as e:
+            print(f"Cache non ecrit: {e}")
+    return df
+
+
+def lire_source(type_fichier, file_path, config=None):
+    """Fichier source lu selon son schema (voir schemas.SCHEMAS)"""
+    schema = SCHEMAS[type_fichier]
+    return safe_read_excel(file_path, schema.feuille, config, schema=schema)
+
+
+def _en_date(valeur, memo):
+    """Convertit une cellule 'Début semaine' en Timestamp (memorise les textes deja vus)"""
+    if valeur is None:
+        return pd.NaT
+    if isinstance(valeur, datetime):
+        return pd.Timestamp(valeur)
+    if valeur not in memo:
+        memo[valeur] = pd.to_datetime(str(valeur).strip(), dayfirst=True, errors='coerce')
+    return memo[valeur]
+
+
+def cible_semaine(semaine):
+    """Semaine demandee : None (derniere), Timestamp (date de debut) ou numero de semaine ISO (int)"""
+    if semaine is None or isinstance(semaine, pd.Timestamp):
+        return semaine
+    if isinstance(semaine, (int, np.integer)):
+        return int(semaine)
+    if isinstance(semaine, datetime):
+        return pd.Timestamp(semaine)
+    texte = str(semaine).strip().upper()
+    if texte.lstrip("W").isdigit():
+        return int(texte.lstrip("W"))
+    return pd.to_datetime(texte, dayfirst=True)
+
+
+def lire_ventes_streaming(file_path, enseigne, sheet_name="Ventes hebdomadaires", semaine=None):
+    """Parcourt la feuille des ventes ligne a ligne (lecture seule) et cumule Quantité par EAN.
+
+    Seules les lignes de l'enseigne et de la derniere semaine (ou de `semaine`)
+    sont gardees : la memoire depend du nombre d'EAN, pas de la taille du fichier.
+    Retourne (ventes_ean, date_semaine, nb_lignes_lues, nb_lignes_semaine) ou None
+    si les colonnes attendues sont absentes.
+    """
+    from openpyxl import load_workbook
+
+    try:
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+    except Exception as e:
+        print(f"Erreur lecture: {e}")
+        return None
+
+    try:
+        ws = wb[sheet_name] if sheet_name in wb.sheetnames else wb.worksheets[0]
+        lignes = ws.iter_rows(values_only=True)
+        entete = [str(c).strip() if c is not None else "" for c in next(lignes, ())]
+        positions = {nom: entete.index(brut) for nom, brut in SCHEMAS["ventes"].resoudre(entete).items()}
+
+        i_ean = positions.get("EAN")
+        i_qte = positions.get("Quantité")
+        i_sem = positions.get("Début semaine")
+        i_ens = positions.get("Libellé Enseigne")
+        if i_ean is None or i_qte is None or i_sem is None:
+            return None
+
+        cible = cible_semaine(semaine)
+        date_cible = cible if isinstance(cible, pd.Timestamp) else None
+        numero_cible = cible if isinstance(cible, int) else None
+        semaine_courante = pd.NaT
+        cumul = {}
+        nb_lues = 0
+        nb_semaine = 0
+        memo_dates = {}
+
+        for ligne in lignes:
+            nb_lues += 1
+            if i_ens is not None and ligne[i_ens] != enseigne:
+                continue
+            d = _en_date(ligne[i_sem], memo_dates)
+            if pd.isna(d):
+                continue
+            if date_cible is not None:
+                if d != date_cible:
+                    continue
+                semaine_courante = d
+            elif numero_cible is not None and d.isocalendar()[1] != numero_cible:
+                continue
+            elif pd.isna(semaine_courante) or d > semaine_courante:
+                # Nouvelle semaine plus recente : on repart de zero
+                semaine_courante = d
+                cumul = {}
+                nb_semaine = 0
+            elif d < semaine_courante:
+                continue
+
+            qte = pd.to_numeric(ligne[i_qte], errors='coerce')
+            ean = str(ligne[i_ean]).strip()
+            cumul[ean] = cumul.get(ean, 0) + (0 if pd.isna(qte) else qte)
+            nb_semaine += 1
+    finally:
+        wb.close()
+
+    ventes_ean = pd.DataFrame({"EAN": cle_ean(list(cumul.keys())), "VENTES_HEBDO": list(cumul.values())})
+    # '611...' et 611... lus dans des cellules differentes : meme article
+    if ventes_ean["EAN"].duplicated().any():
+        ventes_ean = ventes_ean.groupby("EAN", as_index=False, sort=False)["VENTES_HEBDO"].sum()
+    return ventes_ean, semaine_courante, nb_lues, nb_semaine
+
+
+def _nb_lignes(resultat):
+    """Nombre de lignes d'un resultat de chargement (DataFrame ou tuple du streaming)"""
+    if isinstance(resultat, (pd.DataFrame, pd.Series)):
+        return len(resultat)
+    if isinstance(resultat, tuple):
+        return resultat[2]
+    return None
+
+
+def _charger_source(nom, fonction, args):
+    """Tache de chargement (thread ou processus) : (nom, resultat, duree, mesure)"""
+    debut = time.perf_counter()
+    with etape(f"chargement {nom}") as mesure:
+        resultat = fonction(*args)
+        mesure["lignes"] = _nb_lignes(resultat)
+    return nom, resultat, time.perf_counter() - debut, mesure
+
+
+def charger_en_parallele(taches, mode="processus"):
+    """Lance les lectures {nom: (fonction, args)} en parallele et affiche le temps de chaque fichier.
+
+    mode : "processus", "threads" ou None (sequentiel)
+    """
+    debut = time.perf_counter()
+    resultats, durees = {}, {}
+    with etape("chargement"):
+        if not mode or len(taches) < 2:
+            for nom, (fonction, args) in taches.items():
+                _, resultats[nom], durees[nom], _ = _charger_source(nom, fonction, args)
+        else:
+            Executor = ProcessPoolExecutor if mode == "processus" else ThreadPoolExecutor
+            with Executor(max_workers=len(taches), initializer=instrumentation.init_pool,
+                          initargs=instrumentation.args_pool()) as pool:
+                futures = [pool.submit(_charger_source, nom, fonction, args) for nom, (fonction, args) in taches.items()]
+                for future in as_completed(futures):
+                    nom, resultats[nom], durees[nom], mesure = future.result()
+                    # mesures prises dans un autre processus : a rapatrier
+                    if mesure.get("pid", os.getpid()) != os.getpid():
+                        instrumentation.ajouter_mesures([mesure])
+
+    print(f"\nTemps de chargement ({mode or 'sequentiel'}):")
+    for nom in taches:
+        print(f"   {nom}: {durees[nom]:.2f}s")
+    print(f"   total: {time.perf_counter() - debut:.2f}s")
+    return resultats
+
+
+def recap_depuis_stock(df_stock, enseigne):
+    """FALLBACK : Stock EP filtre sur l'enseigne (colonnes deja au format RECAP, voir le schema "stock")"""
+    df_stock.columns = [str(c).strip() for c in df_stock.columns]
+    
+    if "Enseigne" in df_stock.columns:
+        df_recap = df_stock[df_stock["Enseigne"] == enseigne].copy()
+    else:
+        df_recap = df_stock.copy()
+    
+    return df_recap
+
+
+def normaliser(*dfs):
+    """Noms de colonnes nettoyes puis modele compact (EAN Int64, textes categoriels, entiers int32)"""
+    for df in dfs:
+        if isinstance(df, pd.DataFrame) and not df.empty:
+            df.columns = [str(c).strip() for c in df.columns]
+            compacter(df)
+
+
+def extraire_stock_burintel(df_burintel):
+    """Stock par article du fichier LABBURINTEL"""
+    burintel_stock = pd.DataFrame()
+    if not df_burintel.empty and "Stock Burintel" in df_burintel.columns:
+        burintel_stock = df_burintel[["N°", "Description", "Stock Burintel"]].copy()
+        burintel_stock.columns = ["N°", "Description", "STOCK_BURINTEL"]
+        burintel_stock["STOCK_BURINTEL"] = pd.to_numeric(burintel_stock["STOCK_BURINTEL"], errors='coerce').fillna(0)
+    return burintel_stock
+
+
+def colonne_enseigne(df_ventes):
+    """Nom de la colonne enseigne du fichier des ventes (None si absente)"""
+    return "Libellé Enseigne" if "Libellé Enseigne" in df_ventes.columns else None
+
+
+def ventes_derniere_semaine(df_ventes, enseigne, semaine=None):
+    """Ventes de l'enseigne sur la derniere semaine (ou `semaine`) : (lignes de la semaine, date_semaine).
+
+    date_semaine vaut NaT si la semaine demandee est absente des ventes.
+    """
+    col = colonne_enseigne(df_ventes)
+    if col is not None:
+        df_ventes_ep = df_ventes[df_ventes[col] == enseigne].copy()
+    else:
+        df_ventes_ep = df_ventes.copy()
+
+    date_semaine = pd.Timestamp.now()
+    df_ventes_sem = pd.DataFrame()
+    
+    if not df_ventes_ep.empty and "Début semaine" in df_ventes_ep.columns:
+        df_ventes_ep["Début semaine"] = en_dates(df_ventes_ep["Début semaine"])
+        dates = df_ventes_ep["Début semaine"]
+        cible = cible_semaine(semaine)
+        if isinstance(cible, pd.Timestamp):
+            date_semaine = cible if (dates == cible).any() else pd.NaT
+        elif cible is not None:
+            date_semaine = dates[dates.dt.isocalendar().week == cible].max()
+        else:
+            date_semaine = dates.max()
+        df_ventes_sem = df_ventes_ep[df_ventes_ep["Début semaine"] == date_semaine].copy()
+
+    return df_ventes_sem, date_semaine
+
+
+def ventes_par_enseigne_semaine(df_ventes, enseigne_defaut):
+    """Quantité par (enseigne, semaine, EAN) en un seul groupby (enseigne_defaut si pas de colonne enseigne)"""
+    col = colonne_enseigne(df_ventes)
+    if "Début semaine" not in df_ventes.columns or "Quantité" not in df_ventes.columns:
+        return pd.Series(dtype=float)
+
+    enseignes = df_ventes[col] if col is not None else pd.Series(enseigne_defaut, index=df_ventes.index)
+    semaines = en_dates(df_ventes["Début semaine"])
+    quantites = pd.to_numeric(df_ventes["Quantité"], errors='coerce').fillna(0)
+    return quantites.groupby([enseignes.rename("ENSEIGNE"), semaines.rename("SEMAINE"), df_ventes["EAN"]],
+                             observed=True).sum()
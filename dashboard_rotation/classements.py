@@ -0,0 +1,70 @@
+"""Classements top / flop par MARQUE et par STATUS : un tri par indicateur, rangs de tous les groupes en une passe."""
+import numpy as np
+import pandas as pd
+
+from .compact import texte_ean
+from .config import Config
+
+INDICATEURS_CLASSEMENT = ["CA_HEBDO", "ROTATION", "VALEUR_IMMOBILISEE"]
+GROUPES_CLASSEMENT = {"MARQUE": "STATUS", "STATUS": "MARQUE"}   # groupe -> colonne affichee en contexte
+
+
+def _codes_groupes(serie):
+    """Codes entiers des groupes (ordre des categories, sinon alphabetique) et libelles des groupes"""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy(), serie.cat.categories
+    return pd.factorize(serie.astype(str), sort=True)
+
+
+def rangs_par_groupe(codes, valeurs):
+    """Un seul tri (groupe, valeur decroissante) : (ordre, rang depuis le haut, rang depuis le bas), rangs a partir de 0"""
+    ordre = np.lexsort((-valeurs, codes))
+    tries = codes[ordre]
+    debuts = np.flatnonzero(np.r_[True, tries[1:] != tries[:-1]])
+    tailles = np.diff(np.r_[debuts, len(tries)])
+    rang = np.arange(len(tries)) - np.repeat(debuts, tailles)
+    return ordre, rang, np.repeat(tailles, tailles) - 1 - rang
+
+
+def classement(dashboard, groupe, n=5):
+    """Top n et flop n de chaque valeur de `groupe` pour CA_HEBDO, ROTATION et VALEUR_IMMOBILISEE"""
+    contexte = GROUPES_CLASSEMENT[groupe]
+    valeurs = {
+        "CA_HEBDO": dashboard["CA_HEBDO"].to_numpy(dtype=float),
+        "ROTATION": dashboard["ROTATION"].to_numpy(dtype=float),
+        "VALEUR_IMMOBILISEE": dashboard["STOCK_EP"].to_numpy(dtype=float) * dashboard["P.ACHAT"].to_numpy(dtype=float),
+    }
+    codes, libelles = _codes_groupes(dashboard[groupe])
+
+    lignes, cles = [], []
+    for i_ind, indicateur in enumerate(INDICATEURS_CLASSEMENT):
+        ordre, rang, rang_bas = rangs_par_groupe(codes, np.nan_to_num(valeurs[indicateur]))
+        for i_sens, (sens, r) in enumerate([("TOP", rang), ("FLOP", rang_bas)]):
+            garde = r < n
+            positions = ordre[garde]
+            lignes.append((positions, indicateur, sens, r[garde] + 1))
+            cles.append(np.column_stack([codes[positions], np.full(len(positions), i_ind),
+                                         np.full(len(positions), i_sens), r[garde]]))
+
+    positions = np.concatenate([p for p, _, _, _ in lignes])
+    table = pd.DataFrame({
+        groupe: np.asarray(libelles)[codes[positions]],
+        "INDICATEUR": np.concatenate([np.full(len(p), ind, dtype=object) for p, ind, _, _ in lignes]),
+        "SENS": np.concatenate([np.full(len(p), sens, dtype=object) for p, _, sens, _ in lignes]),
+        "RANG": np.concatenate([r for _, _, _, r in lignes]),
+        "EAN": texte_ean(dashboard["EAN"].to_numpy()[positions]) if "EAN" in dashboard.columns else "",
+        "LIBELLE": dashboard["LIBELLE"].to_numpy()[positions],
+        contexte: dashboard[contexte].astype(str).to_numpy()[positions],
+        "CA_HEBDO": valeurs["CA_HEBDO"][positions],
+        "ROTATION": valeurs["ROTATION"][positions],
+        "VALEUR_IMMOBILISEE": valeurs["VALEUR_IMMOBILISEE"][positions],
+    })
+    # Affichage : groupe, indicateur, top puis flop, rang (tri du seul resultat, n lignes par groupe)
+    cles = np.concatenate(cles)
+    return table.iloc[np.lexsort(cles.T[::-1])].reset_index(drop=True)
+
+
+def calculer_classements(dashboard, config=None):
+    """{groupe: classement} pour MARQUE et STATUS avec config.classement_top_n lignes par sens"""
+    config = config or Config()
+    return {groupe: classement(dashboard, groupe, config.classement_top_n) for groupe in GROUPES_CLASSEMENT}
@@ -0,0 +1,182 @@
+"""Ligne de commande : python -m dashboard_rotation --data D:\\Data --sortie D:\\Dashboard --enseigne MARJANE --semaine W12"""
+import argparse
+import os
+from dataclasses import replace
+
+from . import instrumentation
+from .config import Config
+
+
+def parser_arguments():
+    """Options de la ligne de commande (toutes facultatives : la Config fournit les valeurs par defaut)"""
+    parser = argparse.ArgumentParser(prog="dashboard_rotation", description="Dashboard retailer : rotation, couverture et STATUS")
+    parser.add_argument("--data", dest="dossier_data", help="dossier des fichiers sources")
+    parser.add_argument("--sortie", dest="dossier_sortie", help="dossier des classeurs generes")
+    parser.add_argument("--enseigne", help="enseigne analysee (ex: ELECTROPLANET)")
+    parser.add_argument("--semaine", help="semaine analysee : date 'JJ/MM/AAAA' ou numero ISO (12, W12) ; derniere par defaut")
+    parser.add_argument("--moteur", dest="moteur_excel", choices=["openpyxl", "xlsxwriter"])
+    parser.add_argument("--demande", choices=["hebdo", "moyenne", "lissage", "tendance"],
+                        help="base de ROTATION / COUVERTURE / STATUS (hebdo = semaine seule)")
+    parser.add_argument("--demande-semaines", dest="demande_semaines", type=int, metavar="N",
+                        help="fenetre de la moyenne mobile et de la tendance")
+    parser.add_argument("--formats", dest="formats_export", nargs="+", choices=["xlsx", "parquet", "csv", "json"],
+                        help="fichiers produits (ex: --formats parquet pour les donnees seules, sans Excel)")
+    parser.add_argument("--classements", dest="classement_top_n", type=int, metavar="N",
+                        help="feuilles top / flop N par MARQUE et par STATUS")
+    parser.add_argument("--chargement", choices=["processus", "threads", "sequentiel"])
+    parser.add_argument("--batch", action="store_true", help="toutes les enseignes x toutes les semaines")
+    parser.add_argument("--surveiller", nargs="?", const=0, type=float, metavar="SECONDES",
+                        help="reste ouvert et regenere a chaque nouvel export (releve toutes les N secondes)")
+    parser.add_argument("--serveur", nargs="?", const=0, type=int, metavar="PORT",
+                        help="serveur JSON local (127.0.0.1) : kpi, ean, status, top, sans classeur")
+    parser.add_argument("--historique", action="store_true", help="ventes lues depuis l'historique SQLite")
+    parser.add_argument("--validation", action="store_true",
+                        help="controle des sources avant la fusion + feuille ANOMALIES")
+    parser.add_argument("--doublons", dest="politique_doublons", choices=["premier", "rejeter", "garder"],
+                        help="EAN en double : premiere ligne gardee, toutes ecartees ou conservees")
+    parser.add_argument("--commandes", action="store_true",
+                        help="feuille COMMANDES : quantite a commander par article et depot source")
+    parser.add_argument("--couverture-cible", dest="couverture_cible", type=float, metavar="JOURS",
+                        help="couverture visee par les commandes (jours)")
+    parser.add_argument("--delai", dest="delai_livraison", type=float, metavar="JOURS",
+                        help="delai de livraison des commandes (jours)")
+    parser.add_argument("--rapprochement", action="store_true",
+                        help="stock LABBURINTEL joint aux articles (code, puis libelle) et compte dans STOCK_TOTAL")
+    parser.add_argument("--seuil-rapprochement", dest="seuil_rapprochement", type=float, metavar="CONFIANCE",
+                        help="confiance minimale d'un rapprochement par libelle (0 a 1)")
+    parser.add_argument("--sensibilite", action="store_true",
+                        help="feuille SENSIBILITE : STATUS pour chaque combinaison des grilles de seuils")
+    parser.add_argument("--grille-urgent", dest="grille_urgent", nargs="+", type=float, metavar="JOURS",
+                        help="seuils URGENT essayes (ex: --grille-urgent 7 10 14 21)")
+    parser.add_argument("--grille-commande", dest="grille_commande", nargs="+", type=float, metavar="JOURS",
+                        help="seuils A COMMANDE essayes")
+    parser.add_argument("--grille-blockbuster", dest="grille_blockbuster", nargs="+", type=float, metavar="ROTATION",
+                        help="seuils BLOCKBUSTER essayes")
+    parser.add_argument("--grille-stock-mort", dest="grille_stock_mort", nargs="+", type=float, metavar="UNITES",
+                        help="seuils STOCK MORT essayes")
+    parser.add_argument("--variations", action="store_true",
+                        help="photo de la semaine + feuille VARIATIONS (ecarts avec la semaine precedente)")
+    parser.add_argument("--streaming", action="store_true", help="lecture des ventes ligne a ligne")
+    parser.add_argument("--sans-cache", action="store_true", help="relit toujours les fichiers Excel")
+    parser.add_argument("--regenerer", action="store_true",
+                        help="regenere le classeur meme si sources et reglages sont inchanges")
+    parser.add_argument("--sans-excel", action="store_true", help="indicateurs seulement, aucun classeur ecrit")
+    parser.add_argument("--instrumentation", action="store_true", help="mesures par etape + trace Chrome")
+    parser.add_argument("--trace", dest="fichier_trace", help="chemin du fichier de trace JSON")
+    parser.add_argument("--pause", action="store_true", help="attend Entree avant de fermer (double-clic)")
+    return parser
+
+
+def config_depuis_arguments(args, config=None):
+    """Config de base (ou par defaut) + options passees en ligne de commande"""
+    modifs = {nom: getattr(args, nom) for nom in ("dossier_data", "dossier_sortie", "enseigne", "semaine",
+                                                   "moteur_excel", "formats_export", "classement_top_n", "demande", "demande_semaines",
+                                                   "politique_doublons", "couverture_cible", "delai_livraison", "seuil_rapprochement",
+                                                   "grille_urgent", "grille_commande", "grille_blockbuster", "grille_stock_mort",
+                                                   "fichier_trace")
+              if getattr(args, nom) is not None}
+    if args.chargement:
+        modifs["chargement_parallele"] = None if args.chargement == "sequentiel" else args.chargement
+    for option, champ in [("batch", "mode_batch"), ("historique", "historique_actif"),
+                          ("streaming", "ventes_streaming"), ("validation", "validation_active"),
+                          ("commandes", "commandes_actives"), ("rapprochement", "rapprochement_burintel"),
+                          ("sensibilite", "sensibilite_active"), ("variations", "variations_actives"),
+                          ("instrumentation", "instrumentation")]:
+        if getattr(args, option):
+            modifs[champ] = True
+    if args.sans_cache:
+        modifs["cache_actif"] = False
+    if args.regenerer:
+        modifs["reutiliser_sorties"] = False
+    if args.serveur is not None:
+        modifs["serveur"] = True
+        if args.serveur > 0:
+            modifs["serveur_port"] = args.serveur
+    if args.surveiller is not None:
+        modifs["surveillance"] = True
+        if args.surveiller > 0:
+            modifs["intervalle_surveillance"] = args.surveiller
+    return replace(config or Config(), **modifs)
+
+
+def lancer(config, sans_excel=False):
+    """Un lancement complet (simple ou batch) : code retour 0 si termine, 1 sinon"""
+    from .batch import generer_batch
+    from .indicateurs import calculer_kpi
+    from .manifeste import Manifeste
+    from .pipeline import build_dashboard, decouvrir_fichiers, render_dashboard
+    from .serveur import servir
+    from .surveillance import surveiller
+
+    print("="*80)
+    print("LANCEMENT GENERATION DASHBOARD RETAILER")
+    print("="*80)
+
+    if config.mode_batch:
+        generer_batch(config=config)
+        return 0
+    if config.surveillance:
+        surveiller(config)
+        return 0
+    if config.serveur:
+        servir(config)
+        return 0
+
+    # SORTIE DEJA GENEREE (memes sources, memes reglages, meme code) : rien a recalculer
+    sources, manifeste, cle = None, None, None
+    if config.reutiliser_sorties and not sans_excel and not config.historique_actif and not config.variations_actives:
+        sources = decouvrir_fichiers(config)
+        manifeste = Manifeste(config)
+        cle = manifeste.cle(sources, config)
+        deja = manifeste.sortie(cle)
+        manifeste.sauver()
+        if deja:
+            print(f"\nSources et reglages inchanges depuis le {deja['date']} -> {os.path.basename(deja['fichier'])} "
+                  f"deja genere (--regenerer pour forcer)")
+            afficher_resume(deja["fichier"], deja["week_num"], deja["kpi"])
+            return 0
+
+    try:
+        resultat = build_dashboard(sources, config=config)
+    except ValueError as e:
+        print(f"{e} -> EXIT")
+        return 1
+
+    fichier = None
+    if not sans_excel:
+        fichier = render_dashboard(resultat, config)
+    kpi_data = calculer_kpi(resultat.metriques)
+    if manifeste is not None and fichier is not None:
+        manifeste.enregistrer(cle, fichier, resultat.week_num, kpi_data)
+        manifeste.sauver()
+    afficher_resume(fichier, resultat.week_num, kpi_data)
+    return 0
+
+
+def afficher_resume(fichier, week_num, kpi_data):
+    """Resume de fin de lancement : fichier produit et KPI de la semaine"""
+    print(f"\n{'='*80}")
+    print(f"DASHBOARD TERMINE")
+    print(f"{'='*80}")
+    if fichier:
+        print(f"Fichier: {os.path.basename(fichier)}")
+    print(f"\nRESUME SEMAINE W{week_num}")
+    print(f"{'-'*80}")
+    for k, v in list(kpi_data.items()):
+        print(f"   {k}: {v}")
+    print(f"{'='*80}")
+    if fichier and fichier.endswith(".xlsx"):
+        print(f"\nDashboard avec Emojis compatibles Excel genere!")
+
+
+def main(argv=None, config=None, pause=False):
+    """Point d'entree : options de la ligne de commande appliquees sur `config`"""
+    args = parser_arguments().parse_args(argv)
+    config = config_depuis_arguments(args, config)
+    try:
+        code = lancer(config, sans_excel=args.sans_excel)
+        instrumentation.rapport(config.dossier_sortie, config.fichier_trace)
+    finally:
+        if pause or args.pause:
+            input("\nAppuyez sur Entree pour fermer...")
+    return code
@@ -0,0 +1,101 @@
+"""Proposition de commande par EAN : quantite a commander pour tenir la couverture cible, et depot source.
+
+Calcul vectorise sur tout le catalogue : besoin = demande journaliere x (couverture cible + delai de livraison),
+servi d'abord par le BURINTEL DEPOT de l'article, puis par le stock LABBURINTEL (partage entre les articles
+d'un meme code Burintel, les plus urgents d'abord), le reste etant a commander au fournisseur. Le code est
+celui du rapprochement (CODE_BURINTEL, libelles compris) s'il a ete fait, sinon le "Code Burintel" du RECAP.
+"""
+import numpy as np
+import pandas as pd
+
+from .compact import texte_ean
+from .config import Config
+from .indicateurs import STATUS_ORDRE
+from .rapprochement import codes_burintel, stock_burintel_par_code
+
+# Source selon les depots qui servent la ligne : DEPOT EP (4), BURINTEL (2), FOURNISSEUR (1)
+SOURCES = np.array(["", "FOURNISSEUR", "BURINTEL", "BURINTEL + FOURNISSEUR", "DEPOT EP", "DEPOT EP + FOURNISSEUR",
+                    "DEPOT EP + BURINTEL", "DEPOT EP + BURINTEL + FOURNISSEUR"], dtype=object)
+
+
+def _allouer(besoin, groupes, disponible, priorite):
+    """Part de `disponible[groupe]` servie a chaque ligne, dans l'ordre de `priorite` (groupe -1 : rien)"""
+    servi = np.zeros(len(besoin))
+    lignes = np.flatnonzero((groupes >= 0) & (besoin > 0))
+    if not len(lignes):
+        return servi
+    lignes = lignes[np.lexsort((priorite[lignes], groupes[lignes]))]
+    g, b = groupes[lignes], besoin[lignes]
+    # besoin cumule des lignes precedentes du meme groupe
+    cumul = np.cumsum(b)
+    debuts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+    avant = cumul - b - np.repeat(cumul[debuts] - b[debuts], np.diff(np.r_[debuts, len(g)]))
+    servi[lignes] = np.clip(disponible[g] - avant, 0, b)
+    return servi
+
+
+def calculer_commandes(dashboard, burintel_stock=None, config=None):
+    """Proposition de commande des articles a reapprovisionner, les plus urgents d'abord"""
+    config = config or Config()
+    n = len(dashboard)
+    demande = dashboard["DEMANDE_HEBDO"] if "DEMANDE_HEBDO" in dashboard.columns else dashboard["VENTES_HEBDO"]
+    demande = demande.to_numpy(dtype=float)
+    stock_ep = dashboard["STOCK_EP"].to_numpy(dtype=float)
+    depot = np.maximum(dashboard["BURINTEL_DEPOT"].to_numpy(dtype=float), 0)
+    p_achat = dashboard["P.ACHAT"].to_numpy(dtype=float)
+
+    # BESOIN : stock cible couvrant le delai de livraison puis la couverture cible
+    cible = demande / 7 * (config.couverture_cible + config.delai_livraison)
+    besoin = np.ceil(np.maximum(cible - stock_ep, 0) - 1e-9)
+
+    # SOURCES : depot de l'article, puis stock Burintel du code (jointure par hachage), puis fournisseur
+    qte_depot = np.minimum(besoin, np.floor(depot))
+    stock_code = stock_burintel_par_code(burintel_stock if burintel_stock is not None else pd.DataFrame())
+    groupes = np.full(n, -1)
+    stock_burintel = np.zeros(n)
+    colonne = "CODE_BURINTEL" if "CODE_BURINTEL" in dashboard.columns else "Code Burintel"
+    if len(stock_code) and colonne in dashboard.columns:
+        groupes = pd.Index(stock_code.index).get_indexer(codes_burintel(dashboard[colonne]))
+        disponible = np.maximum(np.floor(stock_code.to_numpy(dtype=float)), 0)
+        stock_burintel = np.where(groupes >= 0, disponible[groupes], 0)
+        qte_burintel = _allouer(besoin - qte_depot, groupes, disponible, dashboard["COUVERTURE"].to_numpy(dtype=float))
+    else:
+        qte_burintel = np.zeros(n)
+    qte_fournisseur = besoin - qte_depot - qte_burintel
+
+    garde = np.flatnonzero(besoin > 0)
+    statut = dashboard["STATUS"].astype(str).to_numpy()
+    rang = pd.Categorical(statut, categories=STATUS_ORDRE).codes
+    garde = garde[np.lexsort((-besoin[garde] * p_achat[garde], rang[garde]))]
+    source = SOURCES[4 * (qte_depot > 0) + 2 * (qte_burintel > 0) + (qte_fournisseur > 0)]
+    return pd.DataFrame({
+        "EAN": texte_ean(dashboard["EAN"].to_numpy()[garde]) if "EAN" in dashboard.columns else "",
+        "MARQUE": dashboard["MARQUE"].astype(object).to_numpy()[garde],
+        "LIBELLE": dashboard["LIBELLE"].astype(object).to_numpy()[garde],
+        "STATUS": statut[garde],
+        "STOCK_EP": stock_ep[garde],
+        "DEMANDE_HEBDO": demande[garde],
+        "COUVERTURE": dashboard["COUVERTURE"].to_numpy(dtype=float)[garde],
+        "BURINTEL_DEPOT": depot[garde],
+        "STOCK_BURINTEL": stock_burintel[garde],
+        "QTE_COMMANDE": besoin[garde].astype(np.int64),
+        "QTE_DEPOT": qte_depot[garde].astype(np.int64),
+        "QTE_BURINTEL": qte_burintel[garde].astype(np.int64),
+        "QTE_FOURNISSEUR": qte_fournisseur[garde].astype(np.int64),
+        "P.ACHAT": p_achat[garde],
+        "VALEUR_ACHAT": besoin[garde] * p_achat[garde],
+        "SOURCE": source[garde],
+    })
+
+
+def synthese_commandes(commandes):
+    """Articles, quantites et valeur d'achat par source"""
+    colonnes = ["SOURCE", "ARTICLES", "QTE_COMMANDE", "VALEUR_ACHAT"]
+    if commandes.empty:
+        return pd.DataFrame(columns=colonnes)
+    par_source = commandes.groupby("SOURCE", sort=False).agg(
+        ARTICLES=("SOURCE", "size"), QTE_COMMANDE=("QTE_COMMANDE", "sum"), VALEUR_ACHAT=("VALEUR_ACHAT", "sum"))
+    par_source = par_source.sort_values("VALEUR_ACHAT", ascending=False).reset_index()
+    total = pd.DataFrame([["TOTAL", len(commandes), commandes["QTE_COMMANDE"].sum(), commandes["VALEUR_ACHAT"].sum()]],
+                         columns=colonnes)
+    return pd.concat([par_source[colonnes], total], ignore_index=True)
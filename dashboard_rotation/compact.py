@@ -0,0 +1,105 @@
+"""Modele memoire compact des sources : EAN en entier, textes repetes en categories, entiers reduits."""
+import numpy as np
+import pandas as pd
+
+# Un texte devient categoriel si chaque valeur distincte revient en moyenne au moins 2 fois
+RATIO_CATEGORIES = 0.5
+# Largeur d'un EAN-13 : les zeros de tete perdus en Int64 sont rendus a l'export
+LARGEUR_EAN = 13
+
+
+def cle_ean(valeurs):
+    """EAN canoniques en Int64 : '6111234567890', 6111234567890.0 et '6.11123456789E+12' donnent la meme cle.
+
+    Les codes non numeriques (vides, 'nan', texte) deviennent <NA>.
+    """
+    valeurs = pd.Series(valeurs)
+    if pd.api.types.is_numeric_dtype(valeurs) and not pd.api.types.is_bool_dtype(valeurs):
+        nombres = valeurs.astype("float64")
+    else:
+        nombres = pd.to_numeric(valeurs.astype(str).str.strip(), errors="coerce")
+    # Float exact jusqu'a 2**53 : largement au dela des 14 chiffres d'un EAN/GTIN
+    nombres = nombres.where(np.isfinite(nombres) & (nombres >= 0))
+    return nombres.round().astype("Int64")
+
+
+def texte_ean(valeurs):
+    """EAN en texte pour l'export : 13 chiffres avec les zeros de tete, sans '.0', vide si inconnu"""
+    texte = pd.Series(valeurs).astype("Int64").astype(str).replace("<NA>", "")
+    return texte.where(texte == "", texte.str.zfill(LARGEUR_EAN))
+
+
+def texte_code(valeurs):
+    """Codes article (Code Burintel, N°) en texte canonique : 12345, 12345.0 et ' 12345 ' donnent '12345'.
+
+    Une colonne de codes avec des vides est lue en float64 (12345.0) : les deux cotes d'une jointure
+    passent par ici pour produire le meme texte. Manquants : chaine vide.
+    """
+    serie = pd.Series(valeurs)
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # valeurs distinctes converties une fois
+        categories = texte_code(serie.cat.categories.to_numpy(dtype=object)).to_numpy(dtype=object)
+        return pd.Series(np.append(categories, "")[serie.cat.codes.to_numpy()], index=serie.index, dtype=object)
+    textes = serie.astype(object).where(serie.notna(), "").astype(str).str.strip()
+    return textes.str.replace(r"^(-?\d+)\.0*$", r"\1", regex=True).astype(object)
+
+
+def en_dates(serie, dayfirst=True):
+    """Dates d'une colonne ; en categoriel seules les valeurs distinctes sont converties"""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        dates = pd.to_datetime(pd.Series(serie.cat.categories), dayfirst=dayfirst, errors="coerce")
+        codes = serie.cat.codes.to_numpy()
+        valeurs = dates.to_numpy()[codes]
+        valeurs[codes < 0] = np.datetime64("NaT")
+        return pd.Series(valeurs, index=serie.index, name=serie.name)
+    return pd.to_datetime(serie, dayfirst=dayfirst, errors="coerce")
+
+
+def _textes(serie):
+    """Vrai si la colonne ne contient que du texte (ou des vides)"""
+    if pd.api.types.is_string_dtype(serie.dtype) and not pd.api.types.is_object_dtype(serie.dtype):
+        return True
+    if not pd.api.types.is_object_dtype(serie.dtype):
+        return False
+    non_vides = serie.dropna()
+    return non_vides.map(type).eq(str).all()
+
+
+def _entiers(serie):
+    """Entiers (ou flottants entiers sans vide) ramenes en int32 quand les valeurs le permettent"""
+    if pd.api.types.is_bool_dtype(serie.dtype) or not pd.api.types.is_numeric_dtype(serie.dtype):
+        return serie
+    if pd.api.types.is_float_dtype(serie.dtype):
+        valeurs = serie.to_numpy()
+        if serie.isna().any() or not np.array_equal(valeurs, np.round(valeurs)):
+            return serie
+    elif serie.dtype.itemsize <= 4:
+        return serie
+    info = np.iinfo(np.int32)
+    if len(serie) and (serie.min() < info.min or serie.max() > info.max):
+        return serie
+    return serie.astype(np.int32)
+
+
+def compacter(df):
+    """Passe un DataFrame (en place) au modele compact : EAN Int64, textes repetes categoriels, entiers int32.
+
+    Les flottants non entiers restent en float64 (prix : aucune perte de precision).
+    """
+    if "EAN" in df.columns:
+        df["EAN"] = cle_ean(df["EAN"])
+    for nom in df.columns:
+        if nom == "EAN":
+            continue
+        serie = df[nom]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            continue
+        if _textes(serie):
+            if len(serie) and serie.nunique() <= len(serie) * RATIO_CATEGORIES:
+                df[nom] = serie.astype("category")
+        else:
+            compacte = _entiers(serie)
+            if compacte is not serie:
+                df[nom] = compacte
+    return df
+
@@ -0,0 +1,114 @@
+"""Parametres d'un lancement : dossiers, enseigne, seuils des STATUS, cache, moteurs."""
+import re
+from dataclasses import dataclass, field, fields
+
+
+@dataclass
+class Config:
+    """Reglages du dashboard (chemins relatifs au dossier courant par defaut)"""
+    dossier_data: str = "Data"
+    dossier_sortie: str = "Dashboard"
+    enseigne: str = "ELECTROPLANET"
+    semaine: object = None          # None = derniere semaine, sinon date 'JJ/MM/AAAA' ou numero ISO (12, 'W12')
+
+    # SEUILS DES STATUS
+    seuil_urgent: float = 14        # couverture (jours) en dessous de laquelle l'article est URGENT
+    seuil_commande: float = 28      # couverture (jours) en dessous de laquelle l'article est A COMMANDE
+    seuil_blockbuster: float = 0.5  # rotation hebdo au dessus de laquelle l'article est BLOCKBUSTER
+    seuil_stock_mort: float = 10    # stock minimum d'un article sans vente pour etre STOCK MORT
+
+    # DEMANDE utilisee pour ROTATION / COUVERTURE / STATUS : "hebdo" (ventes de la semaine seule),
+    # "moyenne" (moyenne mobile), "lissage" (lissage exponentiel), "tendance" (tendance prolongee d'une semaine)
+    demande: str = "hebdo"
+    demande_semaines: int = 4       # fenetre de la moyenne mobile et de la tendance
+    demande_alpha: float = 0.3      # poids de la derniere semaine dans le lissage exponentiel
+
+    # CACHE (feuilles deja parsees, format Arrow/Feather si pyarrow est installe)
+    dossier_cache: str = ".cache"
+    cache_actif: bool = True
+    cache_max_entrees: int = 40
+    cache_max_age_jours: int = 30
+    # Catalogue des fichiers du dossier de donnees (None = catalogue_donnees.json dans dossier_data)
+    fichier_catalogue: str = None
+
+    # SORTIES : classeur deja genere reutilise si sources (contenu), reglages et code sont inchanges
+    reutiliser_sorties: bool = True
+    fichier_manifeste: str = None   # None = manifeste_sorties.json dans dossier_sortie
+
+    # Chargement des sources en parallele : "processus", "threads" ou None (sequentiel)
+    chargement_parallele: str = "processus"
+    # Lecture des ventes ligne a ligne (filtre enseigne/semaine pendant le parcours)
+    ventes_streaming: bool = False
+    # Moteur d'ecriture Excel : "openpyxl" (styles cellule par cellule) ou "xlsxwriter" (constant_memory)
+    moteur_excel: str = "openpyxl"
+    # Fichiers produits : "xlsx" (classeur mis en forme) et/ou "parquet", "csv", "json" (donnees brutes, sans Excel)
+    formats_export: list = field(default_factory=lambda: ["xlsx"])
+    # Feuilles TOP FLOP par MARQUE et par STATUS : articles par sens (top / flop), 0 = pas de classements
+    classement_top_n: int = 0
+
+    # BATCH : toutes les enseignes x toutes les semaines en un seul passage
+    mode_batch: bool = False
+    batch_enseignes: list = None    # None = toutes les enseignes du fichier ventes
+    batch_semaines: list = None     # None = toutes les semaines, sinon liste de dates 'JJ/MM/AAAA'
+    batch_processus: int = None     # None = nombre de coeurs
+    codes_enseignes: dict = field(default_factory=lambda: {"ELECTROPLANET": "EP"})
+
+    # SURVEILLANCE : regenere le dashboard a chaque nouvel export depose dans dossier_data
+    surveillance: bool = False
+    intervalle_surveillance: float = 5      # secondes entre deux releves du dossier
+
+    # SERVEUR local (127.0.0.1) : STATUS, couverture, stock par EAN et KPI en JSON, sans regenerer de classeur
+    serveur: bool = False
+    serveur_port: int = 8765
+    serveur_cache: int = 8          # dashboards (enseigne, semaine) gardes en memoire
+
+    # HISTORIQUE : base SQLite locale alimentee par chaque fichier ExcelVenteHebdo
+    historique_actif: bool = False
+    fichier_historique: str = "historique_ventes.sqlite"
+
+    # VALIDATION : controle des sources avant la fusion (cles EAN, couverture, valeurs) + feuille ANOMALIES
+    validation_active: bool = False
+    politique_doublons: str = "premier"     # EAN en double : "premier" (1re ligne gardee), "rejeter" ou "garder"
+    validation_budget: float = 2    # secondes ; au dela, les controles hors cles EAN sont sautes
+
+    # COMMANDES : quantite a commander par EAN pour tenir la couverture cible (depot EP, Burintel, fournisseur)
+    commandes_actives: bool = False
+    couverture_cible: float = 28    # jours de demande a couvrir apres livraison
+    delai_livraison: float = 7      # jours entre la commande et la livraison
+
+    # RAPPROCHEMENT : stock LABBURINTEL joint aux articles (code Burintel, puis libelle) et compte dans STOCK_TOTAL
+    rapprochement_burintel: bool = False
+    seuil_rapprochement: float = 0.6    # confiance minimale d'un rapprochement par libelle (Dice des trigrammes)
+
+    # SENSIBILITE : STATUS, valeur immobilisee et CA urgent pour chaque combinaison des grilles de seuils
+    sensibilite_active: bool = False
+    grille_urgent: list = None      # None = 50 %, 75 %, 100 %, 125 % et 150 % du seuil de la config
+    grille_commande: list = None
+    grille_blockbuster: list = None
+    grille_stock_mort: list = None
+
+    # VARIATIONS : photo compacte de chaque semaine calculee + feuille VARIATIONS (ecarts avec la photo precedente)
+    variations_actives: bool = False
+    dossier_snapshots: str = "Snapshots"
+    variations_top_n: int = 10      # plus fortes hausses / baisses de CA affichees
+
+    # INSTRUMENTATION : temps reel, CPU, pic memoire et lignes par etape + trace Chrome
+    instrumentation: bool = False
+    fichier_trace: str = None       # None = Trace_<date>.json dans dossier_sortie
+
+
+def config_depuis_module(module):
+    """Config construite a partir des constantes MAJUSCULES d'un script (ex : generer_dashboard.py)"""
+    valeurs = {}
+    for f in fields(Config):
+        nom = f.name.upper()
+        if hasattr(module, nom):
+            valeurs[f.name] = getattr(module, nom)
+    return Config(**valeurs)
+
+
+def code_enseigne(enseigne, codes=None):
+    """Code court de l'enseigne pour le nom de fichier"""
+    if codes and enseigne in codes:
+        return codes[enseigne]
+    return re.sub(r"[^A-Za-z0-9]+", "_", str(enseigne)).strip("_").upper() or "NC"
@@ -0,0 +1,106 @@
+"""Moteur de demande : matrice EAN x semaine construite une fois, moyenne mobile, lissage exponentiel et tendance.
+
+Tous les calculs sont des operations NumPy sur la matrice entiere (aucune boucle par article) ;
+la demande obtenue remplace les ventes de la seule semaine dans ROTATION, COUVERTURE et STATUS.
+"""
+import numpy as np
+import pandas as pd
+
+from .chargement import colonne_enseigne
+from .compact import en_dates
+from .config import Config
+
+# Au-dela, le poids d'une semaine dans le lissage exponentiel est negligeable
+POIDS_MIN_LISSAGE = 1e-4
+
+
+def matrice_demande(semaines, eans, quantites):
+    """Matrice EAN x semaine (semaines sans vente a 0) : (eans, dates des colonnes, matrice float32)"""
+    semaines = pd.DatetimeIndex(semaines)
+    eans = pd.Series(eans).reset_index(drop=True)
+    valides = (~semaines.isna() & eans.notna().to_numpy())
+    semaines = semaines[valides]
+    codes_ean, uniques = pd.factorize(eans[valides])
+    if len(uniques) == 0:
+        return uniques, pd.DatetimeIndex([]), np.zeros((0, 0), dtype=np.float32)
+
+    debut = semaines.min()
+    colonnes = ((semaines - debut).days // 7).to_numpy()
+    nb_semaines = int(colonnes.max()) + 1
+    quantites = pd.to_numeric(pd.Series(quantites).reset_index(drop=True)[valides], errors="coerce")
+    matrice = np.bincount(codes_ean * nb_semaines + colonnes, weights=quantites.fillna(0).to_numpy(dtype=float),
+                          minlength=len(uniques) * nb_semaines).astype(np.float32)
+    dates = pd.date_range(debut, periods=nb_semaines, freq="7D")
+    return uniques, dates, matrice.reshape(len(uniques), nb_semaines)
+
+
+def _fenetre(matrice, colonne, nb):
+    """Les `nb` dernieres semaines jusqu'a `colonne` incluse (moins en debut d'historique), en float64"""
+    return matrice[:, max(0, colonne - nb + 1):colonne + 1].astype(float)
+
+
+def _pente(fenetre):
+    """Pente des moindres carres de chaque ligne (unites par semaine)"""
+    nb = fenetre.shape[1]
+    if nb < 2:
+        return np.zeros(len(fenetre))
+    t = np.arange(nb) - (nb - 1) / 2
+    return (fenetre @ t) / (t @ t)
+
+
+def _lissage(matrice, colonne, alpha):
+    """Lissage exponentiel s = alpha*y + (1-alpha)*s_prec, initialise sur la premiere semaine, en un produit matriciel"""
+    nb = colonne + 1
+    if 0 < alpha < 1:
+        nb = min(nb, int(np.ceil(np.log(POIDS_MIN_LISSAGE) / np.log(1 - alpha))) + 1)
+    fenetre = _fenetre(matrice, colonne, nb)
+    age = np.arange(nb)[::-1]
+    poids = alpha * (1 - alpha) ** age
+    # la semaine la plus ancienne porte le reste du poids (initialisation)
+    poids[0] = (1 - alpha) ** age[0]
+    return fenetre @ poids
+
+
+def indicateurs_demande(matrice, colonne=-1, config=None):
+    """(DEMANDE_HEBDO, TENDANCE) de chaque EAN a la semaine `colonne` selon config.demande"""
+    config = config or Config()
+    if matrice.shape[1] == 0:
+        return np.zeros(len(matrice)), np.zeros(len(matrice))
+    colonne = colonne % matrice.shape[1]
+    fenetre = _fenetre(matrice, colonne, config.demande_semaines)
+    tendance = _pente(fenetre)
+
+    if config.demande == "moyenne":
+        demande = fenetre.mean(axis=1)
+    elif config.demande == "lissage":
+        demande = _lissage(matrice, colonne, config.demande_alpha)
+    elif config.demande == "tendance":
+        # droite de tendance prolongee d'une semaine
+        demande = np.maximum(fenetre.mean(axis=1) + tendance * (fenetre.shape[1] + 1) / 2, 0)
+    else:
+        demande = fenetre[:, -1]
+    return demande, tendance
+
+
+def demande_semaine(eans, dates, matrice, date_semaine, config=None):
+    """Ventes, demande et tendance par EAN pour `date_semaine` (colonnes EAN, VENTES_HEBDO, DEMANDE_HEBDO, TENDANCE)"""
+    if len(dates) == 0 or pd.isna(date_semaine) or date_semaine < dates[0]:
+        return pd.DataFrame({"EAN": eans[:0], "VENTES_HEBDO": [], "DEMANDE_HEBDO": [], "TENDANCE": []})
+    colonne = min((date_semaine - dates[0]).days // 7, len(dates) - 1)
+    demande, tendance = indicateurs_demande(matrice, colonne, config)
+    return pd.DataFrame({
+        "EAN": eans,
+        "VENTES_HEBDO": matrice[:, colonne].astype(float),
+        "DEMANDE_HEBDO": demande.round(2),
+        "TENDANCE": tendance.round(2),
+    })
+
+
+def demande_depuis_ventes(df_ventes, enseigne, date_semaine, config=None):
+    """Demande de l'enseigne a `date_semaine` calculee sur tout l'historique du fichier de ventes"""
+    col = colonne_enseigne(df_ventes)
+    df = df_ventes[df_ventes[col] == enseigne] if col is not None else df_ventes
+    semaines = en_dates(df["Début semaine"])
+    passees = (semaines <= date_semaine).to_numpy()
+    eans, dates, matrice = matrice_demande(semaines[passees], df["EAN"][passees], df["Quantité"][passees])
+    return demande_semaine(eans, dates, matrice, date_semaine, config)
@@ -0,0 +1,148 @@
+"""Export "donnees" du dashboard (Parquet / CSV / JSON) : schema stable, sans emojis ni mise en forme, sans Excel."""
+import json
+
+import numpy as np
+import pandas as pd
+
+from .classements import calculer_classements
+from .compact import texte_ean
+from .config import Config
+from .indicateurs import calculer_kpi, generer_recommandations
+from .instrumentation import etape
+
+FORMATS_DONNEES = ["parquet", "csv", "json"]
+VERSION_SCHEMA = 1
+
+# Colonnes du SUIVI, toujours presentes et dans cet ordre (absentes du dashboard = vides)
+COLONNES_SUIVI = {
+    "ENSEIGNE": "str", "SEMAINE": "datetime64[ns]", "MARQUE": "str", "EAN": "str", "LIBELLE": "str",
+    "P.VENTE": "float64", "STOCK_EP": "float64", "BURINTEL_DEPOT": "float64", "VENTES_HEBDO": "float64",
+    "CA_HEBDO": "float64", "ROTATION": "float64", "COUVERTURE": "float64", "STATUS": "str",
+    "DEMANDE_HEBDO": "float64", "TENDANCE": "float64",
+}
+COLONNES_TOP_CA = {"RANG": "int64", "MARQUE": "str", "ARTICLE": "str", "CA": "float64", "VENTES": "float64", "STATUS": "str"}
+COLONNES_RECO = {"RUBRIQUE": "str", "DETAIL": "str"}
+
+
+def _typer(df, colonnes):
+    """Colonnes et types du schema (texte sans categories, vides en chaine vide)"""
+    df = df.reindex(columns=list(colonnes))
+    for nom, type_ in colonnes.items():
+        if type_ == "str":
+            df[nom] = df[nom].astype(object).where(df[nom].notna(), "").astype(str)
+        else:
+            df[nom] = df[nom].astype(type_)
+    return df
+
+
+def tables_donnees(dashboard, metriques, enseigne, date_semaine, recommandations=None, config=None):
+    """Blocs du dashboard au schema stable : (suivi, top_ca, recommandations, kpi)"""
+    config = config or Config()
+    if recommandations is None:
+        recommandations = generer_recommandations(metriques, config)
+
+    suivi = dashboard.sort_values("CA_HEBDO", ascending=False).reset_index(drop=True)
+    suivi = suivi.reindex(columns=[c for c in COLONNES_SUIVI if c in dashboard.columns])
+    suivi["EAN"] = texte_ean(suivi["EAN"]) if "EAN" in suivi.columns else ""
+    if "DEMANDE_HEBDO" not in suivi.columns and "VENTES_HEBDO" in suivi.columns:
+        # mode "hebdo" : la demande est la vente de la semaine
+        suivi["DEMANDE_HEBDO"] = suivi["VENTES_HEBDO"]
+    suivi["ENSEIGNE"] = enseigne
+    suivi["SEMAINE"] = pd.Timestamp(date_semaine)
+    suivi = _typer(suivi, COLONNES_SUIVI)
+
+    top_ca = metriques.top_ca.copy()
+    if not top_ca.empty:
+        top_ca.columns = ["RANG", "MARQUE", "ARTICLE", "CA", "VENTES", "STATUS"]
+        top_ca["RANG"] = np.arange(1, len(top_ca) + 1)
+    top_ca = _typer(top_ca, COLONNES_TOP_CA)
+
+    reco = _typer(pd.DataFrame(recommandations, columns=list(COLONNES_RECO)), COLONNES_RECO)
+
+    kpi = {
+        "version_schema": VERSION_SCHEMA,
+        "enseigne": enseigne,
+        "semaine": pd.Timestamp(date_semaine).strftime("%Y-%m-%d"),
+        "week_num": int(metriques.week_num),
+        "nb_articles": int(metriques.nb_articles),
+        "ca_total": metriques.ca_total,
+        "stock_total_ep": metriques.stock_total_ep,
+        "burintel_total": metriques.burintel_total,
+        "ventes_totales": metriques.ventes_totales,
+        "nb_urgents": int(metriques.nb_urgents),
+        "nb_a_commander": int(metriques.nb_a_commander),
+        "nb_stock_mort": int(metriques.nb_stock_mort),
+        "nb_blockbusters": int(metriques.nb_blockbusters),
+        "valeur_immobilisee": metriques.valeur_immobilisee,
+        "demande": config.demande,
+        "libelles": calculer_kpi(metriques),
+    }
+    if "STOCK_BURINTEL" in dashboard.columns:
+        kpi["stock_burintel"] = float(dashboard["STOCK_BURINTEL"].sum())
+        kpi["nb_rapproches_code"] = int((dashboard["RAPPROCHEMENT"] == "CODE").sum())
+        kpi["nb_rapproches_libelle"] = int((dashboard["RAPPROCHEMENT"] == "LIBELLE").sum())
+    return suivi, top_ca, reco, kpi
+
+
+def _ecrire_table(df, chemin_sans_ext, format_):
+    """Une table en Parquet (CSV si pyarrow est absent) ou en CSV : chemin ecrit"""
+    if format_ == "parquet":
+        try:
+            df.to_parquet(chemin_sans_ext + ".parquet", index=False)
+            return chemin_sans_ext + ".parquet"
+        except ImportError:
+            print("pyarrow absent -> export CSV a la place du Parquet")
+    df.to_csv(chemin_sans_ext + ".csv", index=False, encoding="utf-8", date_format="%Y-%m-%d")
+    return chemin_sans_ext + ".csv"
+
+
+def exporter_donnees(base, dashboard, metriques, enseigne, date_semaine, formats=None, config=None, variations=None,
+                     commandes=None, anomalies=None, sensibilite=None):
+    """Ecrit <base>_suivi, <base>_top_ca, <base>_recommandations (+ <base>_classement_*, <base>_commandes,
+    <base>_sensibilite, <base>_variations_*, <base>_anomalies*) et <base>_kpi.json.
+
+    formats : parmi "parquet", "csv" (une table par fichier) et "json" (tout dans <base>_donnees.json).
+    """
+    config = config or Config()
+    formats = [f for f in (formats or config.formats_export) if f in FORMATS_DONNEES]
+    if not formats:
+        return []
+    with etape("tables donnees", len(dashboard)):
+        suivi, top_ca, reco, kpi = tables_donnees(dashboard, metriques, enseigne, date_semaine, config=config)
+
+    tables = [("suivi", suivi), ("top_ca", top_ca), ("recommandations", reco)]
+    if config.classement_top_n:
+        with etape("classements", len(dashboard)):
+            for groupe, table in calculer_classements(dashboard, config).items():
+                tables.append((f"classement_{groupe.lower()}", table))
+    if commandes is not None:
+        tables.append(("commandes", commandes))
+        kpi["nb_articles_a_commander"] = len(commandes)
+        kpi["valeur_commandes"] = float(commandes["VALEUR_ACHAT"].sum())
+    if sensibilite is not None:
+        tables.append(("sensibilite", sensibilite))
+    if variations is not None:
+        tables += [(f"variations_{nom}", table) for nom, table in variations.tables.items()]
+        kpi["semaine_precedente"] = variations.semaine_precedente.strftime("%Y-%m-%d")
+    if anomalies is not None:
+        tables += [("anomalies", anomalies.synthese), ("anomalies_lignes", anomalies.lignes)]
+        kpi["nb_anomalies"] = len(anomalies.synthese)
+
+    fichiers = []
+    with etape("export donnees", len(suivi)):
+        for format_ in formats:
+            if format_ == "json":
+                contenu = {"kpi": kpi}
+                for nom, table in tables:
+                    contenu[nom] = json.loads(table.to_json(orient="records", date_format="iso", force_ascii=False))
+                with open(base + "_donnees.json", "w", encoding="utf-8") as f:
+                    json.dump(contenu, f, ensure_ascii=False, indent=1)
+                fichiers.append(base + "_donnees.json")
+                continue
+            for nom, table in tables:
+                fichiers.append(_ecrire_table(table, f"{base}_{nom}", format_))
+        if "json" not in formats:
+            with open(base + "_kpi.json", "w", encoding="utf-8") as f:
+                json.dump(kpi, f, ensure_ascii=False, indent=1)
+            fichiers.append(base + "_kpi.json")
+    return fichiers
@@ -0,0 +1,115 @@
+"""Historique local des ventes (SQLite) alimente par chaque fichier ExcelVenteHebdo."""
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from .catalogue import ouvrir_catalogue
+from .chargement import lire_source, normaliser, ventes_par_enseigne_semaine
+from .config import Config
+
+
+def ouvrir_historique(chemin):
+    """Ouvre (et cree si besoin) la base d'historique des ventes"""
+    os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+    conn = sqlite3.connect(chemin)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS ventes (
+            enseigne TEXT NOT NULL,
+            debut_semaine TEXT NOT NULL,
+            ean TEXT NOT NULL,
+            quantite REAL NOT NULL,
+            PRIMARY KEY (enseigne, debut_semaine, ean)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_ventes_ean ON ventes (ean);
+        CREATE TABLE IF NOT EXISTS fichiers_ingeres (
+            chemin TEXT PRIMARY KEY,
+            taille INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            nb_lignes INTEGER NOT NULL,
+            date_ingestion TEXT NOT NULL
+        );
+    """)
+    return conn
+
+
+def ingerer_ventes(conn, vente_file, config=None):
+    """Ajoute les ventes d'un fichier a l'historique : (nb lignes ajoutees, nb deja presentes).
+
+    Un fichier deja ingere (meme chemin, taille et mtime) n'est pas rouvert ;
+    les lignes (enseigne, semaine, EAN) deja connues sont ignorees.
+    """
+    st = os.stat(vente_file)
+    chemin = os.path.abspath(vente_file)
+    deja = conn.execute("SELECT 1 FROM fichiers_ingeres WHERE chemin = ? AND taille = ? AND mtime_ns = ?",
+                        (chemin, st.st_size, st.st_mtime_ns)).fetchone()
+    if deja:
+        return 0, 0
+
+    config = config or Config()
+    df_ventes = lire_source("ventes", vente_file, config)
+    normaliser(df_ventes)
+    ventes = ventes_par_enseigne_semaine(df_ventes, config.enseigne)
+    ventes = ventes[ventes.index.get_level_values("SEMAINE").notna()]
+
+    lignes = [(str(enseigne), semaine.strftime("%Y-%m-%d"), str(ean), float(qte))
+              for (enseigne, semaine, ean), qte in ventes.items()]
+    avant = conn.total_changes
+    with conn:
+        conn.executemany("INSERT OR IGNORE INTO ventes (enseigne, debut_semaine, ean, quantite) VALUES (?, ?, ?, ?)", lignes)
+        ajoutees = conn.total_changes - avant
+        conn.execute("INSERT OR REPLACE INTO fichiers_ingeres VALUES (?, ?, ?, ?, ?)",
+                     (chemin, st.st_size, st.st_mtime_ns, len(lignes), datetime.now().isoformat(timespec="seconds")))
+    return ajoutees, len(lignes) - ajoutees
+
+
+def alimenter_historique(conn, config=None):
+    """Ingere tous les fichiers ExcelVenteHebdo du dossier de donnees qui ne l'ont pas encore ete"""
+    config = config or Config()
+    vente_files = ouvrir_catalogue(config.dossier_data, config.fichier_catalogue).fichiers("ventes")
+    nb_fichiers = nb_ajoutees = nb_ignorees = 0
+    for vente_file in vente_files:
+        ajoutees, ignorees = ingerer_ventes(conn, vente_file, config)
+        if ajoutees or ignorees:
+            nb_fichiers += 1
+            nb_ajoutees += ajoutees
+            nb_ignorees += ignorees
+    print(f"Historique: {nb_fichiers} fichier(s) ingere(s), {nb_ajoutees} lignes ajoutees, {nb_ignorees} deja presentes")
+
+
+def derniere_semaine_historique(conn, enseigne):
+    """Derniere semaine connue pour l'enseigne (Timestamp ou None)"""
+    row = conn.execute("SELECT MAX(debut_semaine) FROM ventes WHERE enseigne = ?", (enseigne,)).fetchone()
+    return pd.Timestamp(row[0]) if row and row[0] else None
+
+
+def lire_historique(conn, enseignes=None, semaines=None):
+    """Ventes de l'historique au format du fichier ExcelVenteHebdo (colonnes EAN, Libellé Enseigne, Début semaine, Quantité)"""
+    requete = "SELECT ean, enseigne, debut_semaine, quantite FROM ventes"
+    filtres, params = [], []
+    if enseignes is not None:
+        filtres.append(f"enseigne IN ({','.join('?' * len(enseignes))})")
+        params += [str(e) for e in enseignes]
+    if semaines is not None:
+        filtres.append(f"debut_semaine IN ({','.join('?' * len(semaines))})")
+        params += [pd.Timestamp(d).strftime("%Y-%m-%d") for d in semaines]
+    if filtres:
+        requete += " WHERE " + " AND ".join(filtres)
+    df = pd.read_sql_query(requete, conn, params=params)
+    df.columns = ["EAN", "Libellé Enseigne", "Début semaine", "Quantité"]
+    df["Début semaine"] = pd.to_datetime(df["Début semaine"], format="%Y-%m-%d")
+    return df
+
+
+def ventes_depuis_historique(config, enseignes=None, semaines=None, derniere_semaine=False):
+    """Met l'historique a jour puis ne lit que les semaines demandees"""
+    conn = ouvrir_historique(config.fichier_historique)
+    try:
+        alimenter_historique(conn, config)
+        if derniere_semaine and enseignes:
+            derniere = derniere_semaine_historique(conn, enseignes[0])
+            semaines = [derniere] if derniere is not None else []
+        return lire_historique(conn, enseignes, semaines)
+    finally:
+        conn.close()
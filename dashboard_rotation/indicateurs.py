@@ -0,0 +1,337 @@
+"""Fusion RECAP + ventes, STATUS, indicateurs de la semaine, recommandations et guide de lecture."""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .config import Config
+from .rapprochement import rapprocher_burintel
+
+
+def _texte(valeurs, defaut):
+    """Colonne texte dont les vides valent `defaut` (categorie ajoutee si besoin)"""
+    if not isinstance(valeurs, pd.Series):
+        return valeurs
+    if isinstance(valeurs.dtype, pd.CategoricalDtype) and defaut not in valeurs.cat.categories:
+        valeurs = valeurs.cat.add_categories([defaut])
+    return valeurs.fillna(defaut)
+
+
+def _nombres(df, nom):
+    """Colonne numerique, vides et textes a 0 (colonne de 0 si le fichier ne l'a pas, ex : Stock sans BURINTEL DEPOT)"""
+    if nom not in df.columns:
+        return pd.Series(0, index=df.index)
+    return pd.to_numeric(df[nom], errors='coerce').fillna(0)
+
+
+def calculer_dashboard(df_recap, ventes_ean, config=None, burintel_stock=None):
+    """Fusion RECAP + ventes, colonnes normalisees, KPI et STATUS.
+
+    Si ventes_ean porte une colonne DEMANDE_HEBDO (moteur de demande), elle remplace
+    VENTES_HEBDO dans ROTATION, COUVERTURE et STATUS ; CA_HEBDO reste celui de la semaine.
+    Avec config.rapprochement_burintel, le stock LABBURINTEL rapproche (STOCK_BURINTEL) entre dans STOCK_TOTAL.
+    """
+    config = config or Config()
+    dashboard = df_recap.merge(ventes_ean, on="EAN", how="left").fillna(
+        {"VENTES_HEBDO": 0, "DEMANDE_HEBDO": 0, "TENDANCE": 0})
+    
+    # COLONNES
+    dashboard["MARQUE"] = _texte(dashboard.get("MARQUE", "NC"), "NC")
+    dashboard["LIBELLE"] = _texte(dashboard.get("Libelle EP", "Article"), "Article")
+    dashboard["STOCK_EP"] = _nombres(dashboard, "Stock EP")
+    dashboard["P.VENTE"] = _nombres(dashboard, "P.Vente")
+    dashboard["P.ACHAT"] = _nombres(dashboard, "P.Achat")
+    dashboard["BURINTEL_DEPOT"] = _nombres(dashboard, "BURINTEL DEPOT")
+    if config.rapprochement_burintel and burintel_stock is not None and not burintel_stock.empty:
+        rapprochement = rapprocher_burintel(dashboard, burintel_stock, config)
+        for nom in rapprochement.columns:
+            dashboard[nom] = rapprochement[nom]
+    
+    # KPI
+    dashboard["CA_HEBDO"] = dashboard["VENTES_HEBDO"] * dashboard["P.VENTE"]
+    dashboard["STOCK_TOTAL"] = dashboard["STOCK_EP"] + dashboard["BURINTEL_DEPOT"] + dashboard.get("STOCK_BURINTEL", 0)
+    demande = dashboard["DEMANDE_HEBDO"] if "DEMANDE_HEBDO" in dashboard.columns else dashboard["VENTES_HEBDO"]
+    dashboard["ROTATION"] = np.divide(demande, dashboard["STOCK_EP"], 
+                                       where=dashboard["STOCK_EP"]>0, 
+                                       out=np.zeros_like(demande, dtype=float)).round(2)
+    dashboard["COUVERTURE"] = np.where(demande > 0, 
+                                       dashboard["STOCK_EP"] / demande * 7, 999).round(1)
+    
+    # STATUS (SANS EMOJIS - on les ajoutera après), calcule une seule fois en categoriel
+    ventes = demande.to_numpy()
+    couverture = dashboard["COUVERTURE"].to_numpy()
+    conditions = [
+        (ventes == 0) & (dashboard["STOCK_EP"].to_numpy() > config.seuil_stock_mort),
+        couverture < config.seuil_urgent,
+        (couverture >= config.seuil_urgent) & (couverture < config.seuil_commande),
+        dashboard["ROTATION"].to_numpy() > config.seuil_blockbuster
+    ]
+    choices = ["STOCK MORT", "URGENT", "A COMMANDE", "BLOCKBUSTER"]
+    dashboard["STATUS"] = pd.Categorical(np.select(conditions, choices, default="STABLE"), categories=STATUS_ORDRE)
+    return dashboard
+
+
+STATUS_ORDRE = ["URGENT", "A COMMANDE", "BLOCKBUSTER", "STOCK MORT", "STABLE"]
+
+
+@dataclass
+class MetriquesDashboard:
+    """Indicateurs de la semaine, calcules en une passe et partages par l'affichage, les KPI et les recommandations"""
+    week_num: int
+    nb_articles: int
+    ca_total: float
+    stock_total_ep: float
+    burintel_total: float
+    ventes_totales: float
+    nb_urgents: int
+    nb_a_commander: int
+    nb_stock_mort: int
+    nb_blockbusters: int
+    valeur_immobilisee: float
+    par_status: pd.DataFrame       # NB, CA_HEBDO, STOCK_EP, VALEUR_STOCK par STATUS
+    top_urgents: pd.DataFrame
+    top_stock_mort: pd.DataFrame
+    top_blockbusters: pd.DataFrame
+    top_ca: pd.DataFrame
+
+
+def _top_k(valeurs, masque, k):
+    """Positions des k plus grandes valeurs sous le masque, dans l'ordre de nlargest (ex aequo : ordre d'origine)"""
+    idx = np.flatnonzero(masque)
+    v = valeurs[idx]
+    if len(idx) > k:
+        seuil = np.partition(v, len(v) - k)[len(v) - k]
+        au_dessus = idx[v > seuil]
+        idx = np.concatenate([au_dessus, idx[v == seuil][:k - len(au_dessus)]])
+        v = valeurs[idx]
+    return idx[np.lexsort((idx, -v))]
+
+
+def calculer_metriques(dashboard, week_num, config=None):
+    """Moteur d'indicateurs : un seul groupby sur STATUS + selections top-k sans copie filtree"""
+    config = config or Config()
+    ca = dashboard["CA_HEBDO"].to_numpy(dtype=float)
+    stock = dashboard["STOCK_EP"].to_numpy(dtype=float)
+    valeur_stock = stock * dashboard["P.ACHAT"].to_numpy(dtype=float)
+    status = dashboard["STATUS"]
+
+    par_status = pd.DataFrame({
+        "STATUS": status,
+        "NB": 1,
+        "CA_HEBDO": ca,
+        "STOCK_EP": stock,
+        "VALEUR_STOCK": valeur_stock,
+    }).groupby("STATUS", observed=False).sum()
+
+    # Le critere rotation est compte independamment de la priorite des STATUS
+    masque_blockbuster = dashboard["ROTATION"].to_numpy() > config.seuil_blockbuster
+    masque_urgent = (status == "URGENT").to_numpy()
+    masque_mort = (status == "STOCK MORT").to_numpy()
+
+    top_urgents = dashboard.iloc[_top_k(ca, masque_urgent, 3)][['LIBELLE', 'STOCK_EP', 'VENTES_HEBDO', 'COUVERTURE']]
+    top_stock_mort = dashboard.iloc[_top_k(valeur_stock, masque_mort, 3)][['LIBELLE', 'STOCK_EP']].copy()
+    top_stock_mort['VALEUR_IMMOBILISEE'] = valeur_stock[_top_k(valeur_stock, masque_mort, 3)]
+    top_blockbusters = dashboard.iloc[_top_k(ca, masque_blockbuster, 3)][['LIBELLE', 'CA_HEBDO', 'ROTATION']]
+
+    medailles = ["#1", "#2", "#3"] + [f"#{i}" for i in range(4,11)]
+    top_ca = dashboard.iloc[_top_k(ca, np.ones(len(ca), dtype=bool), 10)][["MARQUE", "LIBELLE", "CA_HEBDO", "VENTES_HEBDO", "STATUS"]]
+    if not top_ca.empty:
+        top_ca = top_ca.copy()
+        top_ca["STATUS"] = top_ca["STATUS"].astype(str)
+        top_ca.insert(0, "Rang", medailles[:len(top_ca)])
+        top_ca.columns = ["Rang", "MARQUE", "Article", "CA", "Ventes", "Status"]
+
+    return MetriquesDashboard(
+        week_num=week_num,
+        nb_articles=len(dashboard),
+        ca_total=float(ca.sum()),
+        stock_total_ep=float(stock.sum()),
+        burintel_total=float(dashboard["BURINTEL_DEPOT"].sum()),
+        ventes_totales=float(dashboard["VENTES_HEBDO"].sum()),
+        nb_urgents=int(par_status.loc["URGENT", "NB"]),
+        nb_a_commander=int(par_status.loc["A COMMANDE", "NB"]),
+        nb_stock_mort=int(par_status.loc["STOCK MORT", "NB"]),
+        nb_blockbusters=int(masque_blockbuster.sum()),
+        valeur_immobilisee=float(par_status.loc["STOCK MORT", "VALEUR_STOCK"]),
+        par_status=par_status,
+        top_urgents=top_urgents,
+        top_stock_mort=top_stock_mort,
+        top_blockbusters=top_blockbusters,
+        top_ca=top_ca,
+    )
+
+
+def calculer_kpi(metriques):
+    """KPI (SANS EMOJIS)"""
+    week_num = metriques.week_num
+    return {
+        f"CA W{week_num}": f"{metriques.ca_total:,.0f} DH",
+        "Stock EP": f"{metriques.stock_total_ep:,.0f} unites",
+        "Burintel Depot": f"{metriques.burintel_total:,.0f} unites",
+        "Ventes Hebdo": f"{metriques.ventes_totales:,.0f} unites",
+        "Articles Urgents": f"{metriques.nb_urgents} articles",
+        "Blockbusters": f"{metriques.nb_blockbusters} articles"
+    }
+
+
+def generer_recommandations(metriques, config=None):
+    """Génère des recommandations hebdomadaires basées sur les données"""
+    config = config or Config()
+    
+    week_num = metriques.week_num
+    nb_urgents = metriques.nb_urgents
+    nb_a_commander = metriques.nb_a_commander
+    nb_stock_mort = metriques.nb_stock_mort
+    nb_blockbusters = metriques.nb_blockbusters
+    
+    ca_total = metriques.ca_total
+    stock_total_ep = metriques.stock_total_ep
+    ventes_totales = metriques.ventes_totales
+    
+    top_urgents = metriques.top_urgents
+    top_stock_mort = metriques.top_stock_mort
+    top_blockbusters = metriques.top_blockbusters
+    
+    recommandations = []
+    
+    recommandations.append(["VUE D'ENSEMBLE", ""])
+    recommandations.append(["Semaine analysee", f"W{week_num}"])
+    recommandations.append(["CA hebdomadaire", f"{ca_total:,.0f} DH"])
+    recommandations.append(["Ventes totales", f"{ventes_totales:,.0f} unites"])
+    recommandations.append(["Stock total EP", f"{stock_total_ep:,.0f} unites"])
+    recommandations.append(["", ""])
+    
+    recommandations.append(["ACTIONS PRIORITAIRES", ""])
+    
+    if nb_urgents > 0:
+        recommandations.append(["[URGENT]", f"{nb_urgents} articles en risque de rupture"])
+        recommandations.append(["Action requise", f"Commander IMMEDIATEMENT ces articles (< {config.seuil_urgent} jours de stock)"])
+        if not top_urgents.empty:
+            recommandations.append(["Top 3 urgents", ""])
+            for idx, row in top_urgents.iterrows():
+                lib = str(row['LIBELLE'])[:40]
+                recommandations.append(["", f"- {lib} | Stock: {row['STOCK_EP']:.0f} | Ventes: {row['VENTES_HEBDO']:.0f} | Couvre: {row['COUVERTURE']:.1f}j"])
+    else:
+        recommandations.append(["[URGENT]", "Aucun article en rupture imminente"])
+    
+    recommandations.append(["", ""])
+    
+    if nb_a_commander > 0:
+        recommandations.append(["[A COMMANDER]", f"{nb_a_commander} articles a prevoir"])
+        recommandations.append(["Action requise", f"Planifier commande dans les 7 prochains jours ({config.seuil_urgent}-{config.seuil_commande} jours de stock)"])
+    else:
+        recommandations.append(["[A COMMANDER]", "Stock bien gere"])
+    
+    recommandations.append(["", ""])
+    
+    recommandations.append(["OPPORTUNITES", ""])
+    
+    if nb_blockbusters > 0:
+        recommandations.append(["[BLOCKBUSTERS]", f"{nb_blockbusters} produits stars (rotation > {config.seuil_blockbuster:.0%})"])
+        recommandations.append(["Action requise", "Augmenter le stock de ces articles a forte demande"])
+        if not top_blockbusters.empty:
+            recommandations.append(["Top 3 performers", ""])
+            for idx, row in top_blockbusters.iterrows():
+                lib = str(row['LIBELLE'])[:40]
+                recommandations.append(["", f"- {lib} | CA: {row['CA_HEBDO']:,.0f} DH | Rotation: {row['ROTATION']:.2f}"])
+    else:
+        recommandations.append(["[BLOCKBUSTERS]", "Aucun produit a forte rotation"])
+    
+    recommandations.append(["", ""])
+    
+    recommandations.append(["PROBLEMES A RESOUDRE", ""])
+    
+    if nb_stock_mort > 0:
+        valeur_immobilisee = metriques.valeur_immobilisee
+        recommandations.append(["[STOCK MORT]", f"{nb_stock_mort} articles sans vente"])
+        recommandations.append(["Valeur immobilisee", f"{valeur_immobilisee:,.0f} DH"])
+        recommandations.append(["Action requise", "Lancer promotions / destockage / retour fournisseur"])
+        if not top_stock_mort.empty:
+            recommandations.append(["Top 3 a destocquer", ""])
+            for idx, row in top_stock_mort.iterrows():
+                lib = str(row['LIBELLE'])[:40]
+                recommandations.append(["", f"- {lib} | Stock: {row['STOCK_EP']:.0f} | Valeur: {row['VALEUR_IMMOBILISEE']:,.0f} DH"])
+    else:
+        recommandations.append(["[STOCK MORT]", "Aucun article problematique"])
+    
+    recommandations.append(["", ""])
+    
+    recommandations.append(["PLAN D'ACTION CETTE SEMAINE", ""])
+    
+    action_num = 1
+    if nb_urgents > 0:
+        recommandations.append([f"Action {action_num}", f"Commander {nb_urgents} articles urgents avant rupture"])
+        action_num += 1
+    
+    if nb_a_commander > 0:
+        recommandations.append([f"Action {action_num}", f"Preparer commande de {nb_a_commander} articles (prevoir delai livraison)"])
+        action_num += 1
+    
+    if nb_stock_mort > 0:
+        recommandations.append([f"Action {action_num}", f"Lancer promotion sur {min(nb_stock_mort, 10)} articles sans rotation"])
+        action_num += 1
+    
+    if nb_blockbusters > 0:
+        recommandations.append([f"Action {action_num}", f"Augmenter stock des {nb_blockbusters} blockbusters pour maximiser CA"])
+        action_num += 1
+    
+    if action_num == 1:
+        recommandations.append(["Action 1", "Gestion normale - Surveillance continue"])
+    
+    return recommandations
+
+
+def _guide_demande(config):
+    """Lignes du guide decrivant la demande utilisee a la place des ventes de la semaine"""
+    n = config.demande_semaines
+    formules = {
+        "moyenne": f"'= Moyenne des ventes des {n} dernieres semaines",
+        "lissage": f"'= Lissage exponentiel des ventes (poids semaine en cours {config.demande_alpha:.0%})",
+        "tendance": f"'= Tendance des {n} dernieres semaines prolongee a la semaine suivante",
+    }
+    if config.demande not in formules:
+        return []
+    return [
+        ["DEMANDE HEBDO", formules[config.demande]],
+        ["", "Remplace Ventes Hebdo dans ROTATION, COUVERTURE et STATUS (une semaine atypique ne suffit plus)"],
+        ["", f"TENDANCE = evolution des ventes en unites par semaine sur {n} semaines"],
+        ["", ""],
+    ]
+
+
+# 📚 GUIDE DE LECTURE (CORRECTION DES FORMULES)
+def guide_lecture(config=None):
+    """Lignes du guide de lecture, seuils de la configuration inclus"""
+    config = config or Config()
+    return [
+        ["GUIDE DE LECTURE - COMPRENDRE LE DASHBOARD", ""],
+        ["", ""],
+        ["FORMULES UTILISEES", ""],
+        ["ROTATION", "'= Ventes Hebdo / Stock EP"],  # ✅ Apostrophe ajoutée
+        ["", "Mesure: Combien de fois le stock tourne par semaine"],
+        ["", "Exemple: Rotation 0.50 = 50% du stock vendu chaque semaine"],
+        ["", ""],
+        ["COUVERTURE", "'= (Stock EP / Ventes Hebdo) x 7 jours"],  # ✅ Apostrophe ajoutée
+        ["", "Mesure: Nombre de jours avant rupture au rythme actuel"],
+        ["", "Exemple: Couverture 14 jours = 2 semaines de stock"],
+        ["", ""],
+        ["CA HEBDO", "'= Ventes Hebdo x Prix de Vente"],  # ✅ Apostrophe ajoutée
+        ["", "Mesure: Chiffre d'affaires genere cette semaine"],
+        ["", ""],
+    ] + _guide_demande(config) + [
+        ["SIGNIFICATION DES STATUS", ""],
+        ["[URGENT]", f"Couverture < {config.seuil_urgent} jours -> Risque de rupture immediate"],
+        ["Action", "Commander IMMEDIATEMENT avant rupture de stock"],
+        ["", ""],
+        ["[A COMMANDE]", f"Couverture entre {config.seuil_urgent} et {config.seuil_commande} jours -> Stock normal"],
+        ["Action", "Planifier commande dans les 7 prochains jours"],
+        ["", ""],
+        ["[BLOCKBUSTER]", f"Rotation > {config.seuil_blockbuster} -> Plus de {config.seuil_blockbuster:.0%} du stock vendu/semaine"],
+        ["Action", "Maintenir stock eleve, produit star a forte demande"],
+        ["", ""],
+        ["[STOCK MORT]", f"0 ventes + Stock > {config.seuil_stock_mort} unites -> Immobilisation"],
+        ["Action", "Lancer promotion, destockage ou retour fournisseur"],
+        ["", ""],
+        ["[STABLE]", "Autres situations -> Gestion normale"],
+        ["Action", "Surveillance continue, pas d'urgence"],
+    ]
@@ -0,0 +1,147 @@
+"""Mesure par etape : temps reel, CPU, hausse du pic RSS et lignes, rapport + trace Chrome (chrome://tracing)."""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+_ACTIF = False
+_MESURES = []
+_PILE = threading.local()
+
+
+def activer(actif=True):
+    """Active (ou coupe) la prise de mesures dans le processus courant"""
+    global _ACTIF
+    _ACTIF = actif
+
+
+def est_active():
+    """Vrai si les etapes sont mesurees dans ce processus"""
+    return _ACTIF
+
+
+def init_pool(actif, niveau):
+    """Initialisation des threads / processus d'un pool : meme reglage et meme niveau que l'appelant"""
+    activer(actif)
+    _PILE.niveau = niveau
+
+
+def args_pool():
+    """initargs de init_pool pour un pool cree dans l'etape courante"""
+    return _ACTIF, getattr(_PILE, "niveau", 0)
+
+
+def nb_mesures():
+    """Nombre de mesures deja prises (point de depart de extraire_mesures)"""
+    return len(_MESURES)
+
+
+def extraire_mesures(depuis=0):
+    """Retire et retourne les mesures prises depuis la position `depuis` (rapatriement depuis un processus)"""
+    mesures = _MESURES[depuis:]
+    del _MESURES[depuis:]
+    return mesures
+
+
+def ajouter_mesures(mesures):
+    """Ajoute des mesures prises dans un autre processus"""
+    _MESURES.extend(m for m in mesures if "duree_s" in m)
+
+
+def _pic_memoire():
+    """Pic de memoire residente du processus en octets (None si non mesurable)"""
+    try:
+        import resource
+        pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pic if sys.platform == "darwin" else pic * 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return getattr(psutil.Process().memory_info(), "peak_wset", None)
+    except ImportError:
+        return None
+
+
+@contextmanager
+def etape(nom, lignes=None):
+    """Mesure une etape si l'instrumentation est active : temps reel, CPU, hausse du pic RSS, lignes.
+
+    Le nombre de lignes peut etre renseigne dans le bloc : with etape("fusion") as m: m["lignes"] = ...
+    """
+    mesure = {"etape": nom, "lignes": lignes}
+    if not _ACTIF:
+        yield mesure
+        return
+    principal = threading.current_thread() is threading.main_thread()
+    horloge_cpu = time.process_time if principal else time.thread_time
+    niveau = getattr(_PILE, "niveau", 0)
+    _PILE.niveau = niveau + 1
+    pic_avant = _pic_memoire()
+    debut_ts, debut, debut_cpu = time.time(), time.perf_counter(), horloge_cpu()
+    try:
+        yield mesure
+    finally:
+        duree, cpu = time.perf_counter() - debut, horloge_cpu() - debut_cpu
+        pic_apres = _pic_memoire()
+        _PILE.niveau = niveau
+        mesure.update({
+            "debut": debut_ts,
+            "duree_s": duree,
+            "cpu_s": cpu,
+            "rss_pic_mo": (pic_apres - pic_avant) / 1e6 if pic_avant is not None else None,
+            "niveau": niveau,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        })
+        _MESURES.append(mesure)
+
+
+def rapport(dossier_sortie, fichier=None):
+    """Tableau recapitulatif des etapes + fichier JSON au format Chrome trace (chrome://tracing, Perfetto).
+
+    Les mesures sont videes apres le rapport : un processus qui enchaine les lancements repart de zero.
+    """
+    if not _ACTIF or not _MESURES:
+        return None
+    mesures = sorted(_MESURES, key=lambda m: (m["debut"], m["niveau"]))
+    principal = os.getpid()
+
+    print(f"\nINSTRUMENTATION:")
+    print(f"   {'ETAPE':<52} {'TEMPS':>9} {'CPU':>9} {'PIC RSS':>10} {'LIGNES':>10}")
+    print(f"   {'-'*94}")
+    for m in mesures:
+        nom = "  " * m["niveau"] + m["etape"]
+        if m["pid"] != principal:
+            nom += f" [{m['pid']}]"
+        rss = f"+{m['rss_pic_mo']:.1f} Mo" if m["rss_pic_mo"] is not None else "-"
+        lignes = f"{int(m['lignes']):,}" if m["lignes"] is not None else "-"
+        print(f"   {nom[:52]:<52} {m['duree_s']:>8.2f}s {m['cpu_s']:>8.2f}s {rss:>10} {lignes:>10}")
+    total = sum(m["duree_s"] for m in mesures if m["niveau"] == 0 and m["pid"] == principal)
+    print(f"   {'total':<52} {total:>8.2f}s")
+
+    evenements = [{
+        "name": m["etape"], "cat": "dashboard", "ph": "X",
+        "ts": round(m["debut"] * 1e6), "dur": round(m["duree_s"] * 1e6),
+        "pid": m["pid"], "tid": m["tid"],
+        "args": {
+            "cpu_s": round(m["cpu_s"], 4),
+            "rss_pic_mo": round(m["rss_pic_mo"], 2) if m["rss_pic_mo"] is not None else None,
+            "lignes": int(m["lignes"]) if m["lignes"] is not None else None,
+        },
+    } for m in mesures]
+    etapes = [{"etape": e["name"], "niveau": m["niveau"], "pid": m["pid"],
+               "duree_s": round(m["duree_s"], 4), **e["args"]} for e, m in zip(evenements, mesures)]
+
+    fichier = fichier or os.path.join(
+        dossier_sortie, f"Trace_{datetime.now().strftime('%d%m%Y_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(fichier)), exist_ok=True)
+    with open(fichier, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": evenements, "displayTimeUnit": "ms", "etapes": etapes,
+                   "total_s": round(total, 4)}, f, indent=1, ensure_ascii=False)
+    print(f"   Trace: {fichier}")
+    _MESURES.clear()
+    return fichier
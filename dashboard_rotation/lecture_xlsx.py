@@ -0,0 +1,265 @@
+"""Lecture directe d'une feuille .xlsx limitee a quelques colonnes.
+
+Le XML de la feuille est parcouru par blocs avec une expression reguliere qui ne retient que
+les cellules des colonnes demandees : les autres ne sont ni converties ni gardees en memoire.
+Memes valeurs que pandas.read_excel, sauf les lignes vides dans les colonnes lues, ignorees.
+Structure inattendue (classeur .xls, balises prefixees, cellules sans reference...) : ValueError,
+la lecture pandas prend le relais.
+"""
+import re
+import zipfile
+from html import unescape
+from xml.etree.ElementTree import fromstring, iterparse
+
+import numpy as np
+import pandas as pd
+
+NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+TAILLE_BLOC = 1 << 24   # octets de XML decompresse traites a la fois
+
+_ATTRIBUT = re.compile(rb'\s([ts])="([^"]*)"')
+_VALEUR = re.compile(rb"<v>([^<]*)</v>")
+_TEXTE = re.compile(rb"<t(?:\s[^>]*)?>([^<]*)</t>")
+_PHONETIQUE = re.compile(rb"<rPh\b.*?</rPh>", re.S)
+_BALISE = re.compile(rb"<c[\s/>]")
+# Textes lus comme vides par pandas.read_excel (na_values par defaut)
+VIDES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+         "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"]
+
+
+def _inferer(valeurs):
+    """Comme pandas.read_excel : textes vides -> manquants, colonne de textes numeriques -> nombres"""
+    if valeurs.dtype != object:
+        return valeurs
+    vides = pd.Series(valeurs).isin(VIDES).to_numpy() | pd.isna(valeurs)
+    valeurs = np.where(vides, np.nan, valeurs)
+    try:
+        return pd.to_numeric(valeurs)
+    except (ValueError, TypeError):
+        return valeurs
+
+
+def _motif(lettres=None):
+    """Cellules <c ... r="B12" ...>...</c> des colonnes `lettres` (toutes si None), attributs dans n'importe quel
+    ordre : (attributs avant r, lettre, ligne, attributs apres r, contenu)"""
+    colonnes = b"|".join(l.encode() for l in lettres) if lettres else rb"[A-Z]+"
+    return re.compile(rb'<c((?:\s+(?!r=)[\w:]+="[^"]*")*)\s+r="(' + colonnes + rb')(\d+)"([^>]*?)(?:/>|>(.*?)</c>)',
+                      re.S)
+
+
+class ClasseurXlsx:
+    """Archive .xlsx ouverte : feuilles, chaines partagees et styles de date lus a la demande"""
+
+    def __init__(self, chemin):
+        try:
+            self.archive = zipfile.ZipFile(chemin)
+            classeur = fromstring(self.archive.read("xl/workbook.xml"))
+            rels = fromstring(self.archive.read("xl/_rels/workbook.xml.rels"))
+        except (zipfile.BadZipFile, KeyError) as e:
+            raise ValueError(f"classeur xlsx non reconnu ({e})")
+        self._cibles = {r.get("Type", "").rsplit("/", 1)[-1]: self._chemin(r.get("Target")) for r in rels}
+        ids = {r.get("Id"): self._chemin(r.get("Target")) for r in rels}
+        self.feuilles = [(f.get("name"), ids.get(f.get(NS_R + "id"))) for f in classeur.iter(NS + "sheet")]
+        pr = classeur.find(NS + "workbookPr")
+        date1904 = pr is not None and pr.get("date1904") in ("1", "true")
+        self.origine = pd.Timestamp("1904-01-01" if date1904 else "1899-12-30")
+        self._partages = None
+        self._dates = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.archive.close()
+
+    @staticmethod
+    def _chemin(cible):
+        return cible.lstrip("/") if cible.startswith("/") else "xl/" + cible
+
+    def feuille(self, nom=0):
+        """Chemin XML de la feuille (nom ou position)"""
+        if isinstance(nom, int):
+            if nom < len(self.feuilles):
+                return self.feuilles[nom][1]
+        else:
+            for titre, chemin in self.feuilles:
+                if titre == nom:
+                    return chemin
+        raise ValueError(f"Worksheet named '{nom}' not found")
+
+    @property
+    def partages(self):
+        """Chaines partagees (tableau NumPy d'objets)"""
+        if self._partages is None:
+            textes = []
+            if "sharedStrings" in self._cibles:
+                with self.archive.open(self._cibles["sharedStrings"]) as f:
+                    for _, el in iterparse(f):
+                        if el.tag == NS + "si":
+                            morceaux = el.findall(NS + "t") + el.findall(f"{NS}r/{NS}t")
+                            textes.append("".join(t.text or "" for t in morceaux))
+                            el.clear()
+            self._partages = np.array(textes, dtype=object)
+        return self._partages
+
+    @property
+    def dates(self):
+        """Indices des styles de cellule au format date"""
+        if self._dates is None:
+            from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+
+            self._dates = set()
+            if "styles" in self._cibles:
+                styles = fromstring(self.archive.read(self._cibles["styles"]))
+                codes = {int(n.get("numFmtId")): n.get("formatCode") for n in styles.iter(NS + "numFmt")}
+                xfs = styles.find(NS + "cellXfs")
+                for i, xf in enumerate(xfs if xfs is not None else []):
+                    id_format = int(xf.get("numFmtId", 0))
+                    if is_date_format(codes.get(id_format) or BUILTIN_FORMATS.get(id_format, "")):
+                        self._dates.add(i)
+        return self._dates
+
+    def _cellules(self, chemin, lettres=None):
+        """Listes de cellules (lettre, ligne, attributs, contenu) par bloc de lignes completes.
+
+        ValueError si les cellules de la premiere ligne n'ont pas toutes leur reference r (attribut facultatif) :
+        la lecture s'arrete plutot que de sauter des cellules.
+        """
+        motif = _motif(lettres)
+        reste = b""
+        verifie = False
+        with self.archive.open(chemin) as f:
+            while True:
+                bloc = f.read(TAILLE_BLOC)
+                if not bloc:
+                    return
+                bloc = reste + bloc
+                fin = bloc.rfind(b"</row>")
+                if fin < 0:
+                    reste = bloc
+                    continue
+                if not verifie:
+                    debut, fin_ligne = bloc.find(b"<row"), bloc.find(b"</row>")
+                    if len(_BALISE.findall(bloc, debut, fin_ligne)) != len(_motif().findall(bloc, debut, fin_ligne)):
+                        raise ValueError("cellules sans reference")
+                    verifie = True
+                yield [(lettre, ligne, avant + apres, contenu)
+                       for avant, lettre, ligne, apres, contenu in motif.findall(bloc, 0, fin + 6)]
+                reste = bloc[fin + 6:]
+
+    def entete(self, feuille=0):
+        """(numero de la ligne d'entete, {lettre: intitule}) : premiere ligne non vide de la feuille"""
+        premiere, intitules = None, {}
+        for cellules in self._cellules(self.feuille(feuille)):
+            for lettre, ligne, attributs, contenu in cellules:
+                if premiere is None:
+                    premiere = ligne
+                if ligne != premiere:
+                    break
+                valeur = self._convertir([attributs], [contenu])[0]
+                if valeur is not None:
+                    intitules[lettre.decode()] = valeur
+            if cellules:
+                break
+        if premiere is None:
+            raise ValueError("entete introuvable")
+        return int(premiere), intitules
+
+    def colonnes(self, feuille, lettres, apres=1):
+        """DataFrame {lettre: valeurs} des lignes situees apres la ligne `apres` (lignes vides ignorees)"""
+        chemin = self.feuille(feuille)
+        par_lettre = {l: ([], [], []) for l in lettres}
+        if lettres:
+            for cellules in self._cellules(chemin, lettres):
+                for lettre, ligne, attributs, contenu in cellules:
+                    lignes, attrs, contenus = par_lettre[lettre.decode()]
+                    lignes.append(ligne)
+                    attrs.append(attributs)
+                    contenus.append(contenu)
+
+        series = {}
+        for lettre, (lignes, attrs, contenus) in par_lettre.items():
+            numeros = np.array(lignes, dtype=object).astype(np.int64) if lignes else np.zeros(0, dtype=np.int64)
+            garde = numeros > apres
+            valeurs = self._convertir([a for a, g in zip(attrs, garde) if g], [c for c, g in zip(contenus, garde) if g])
+            series[lettre] = pd.Series(_inferer(valeurs), index=numeros[garde])
+        if not series:
+            return pd.DataFrame()
+        premier = next(iter(series.values())).index
+        if all(s.index.equals(premier) for s in series.values()):
+            # cas courant : memes lignes dans toutes les colonnes, pas d'alignement
+            df = pd.DataFrame({l: s.to_numpy() for l, s in series.items()})
+        else:
+            df = pd.DataFrame(series).reset_index(drop=True)
+        # cellules presentes mais vides (mise en forme seule) : ligne vide, ignoree comme par pandas
+        remplies = df.notna().any(axis=1).to_numpy()
+        return df if remplies.all() else df[remplies].reset_index(drop=True)
+
+    def _genre(self, attributs):
+        """Nature d'une cellule d'apres ses attributs t et s"""
+        attrs = dict(_ATTRIBUT.findall(attributs))
+        t = attrs.get(b"t", b"n")
+        if t == b"n":
+            return "d" if int(attrs.get(b"s", 0)) in self.dates else "n"
+        if t == b"d":
+            return "iso"        # date ISO 8601 en texte (t="d"), pas un numero de serie
+        return t.decode()
+
+    def _convertir(self, attributs, contenus):
+        """Valeurs d'une colonne : vectorise si toute la colonne est texte partage ou nombre, cellule par cellule sinon"""
+        genres = {a: self._genre(a) for a in set(attributs)}
+        textes = [c[3:-4] if c[:3] == b"<v>" and c[-4:] == b"</v>" else None for c in contenus]
+        natures = set(genres.values())
+        if textes and None not in textes and len(natures) == 1:
+            nature = natures.pop()
+            if nature == "s":
+                return self.partages[np.array(textes, dtype=object).astype(np.int64)]
+            if nature in ("n", "d"):
+                nombres = np.array(textes, dtype=object).astype(float)
+                if nature == "d":
+                    return np.asarray(pd.to_datetime(nombres, unit="D", origin=self.origine).round("ms"))
+                if np.all(np.mod(nombres, 1) == 0) and np.all(np.abs(nombres) < 2 ** 53):
+                    return nombres.astype(np.int64)
+                return nombres
+
+        valeurs = np.empty(len(contenus), dtype=object)
+        for i, (attrs, texte, contenu) in enumerate(zip(attributs, textes, contenus)):
+            genre = genres[attrs]
+            if genre == "inlineStr":
+                # texte simple ou riche (runs <r>), sans le texte phonetique
+                valeurs[i] = unescape(b"".join(_TEXTE.findall(_PHONETIQUE.sub(b"", contenu or b""))).decode("utf-8"))
+                continue
+            if texte is None:
+                m = _VALEUR.search(contenu)
+                texte = m.group(1) if m else None
+            if not texte or genre == "e":
+                continue
+            if genre == "s":
+                valeurs[i] = self.partages[int(texte)]
+            elif genre == "str":
+                valeurs[i] = unescape(texte.decode("utf-8"))
+            elif genre == "b":
+                valeurs[i] = texte == b"1"
+            elif genre == "d":
+                valeurs[i] = (self.origine + pd.Timedelta(days=float(texte))).round("ms")
+            elif genre == "iso":
+                valeurs[i] = pd.Timestamp(texte.decode())
+            else:
+                nombre = float(texte)
+                valeurs[i] = int(nombre) if nombre.is_integer() else nombre
+        return valeurs
+
+
+def lire_colonnes(chemin, feuille, choisir):
+    """Feuille reduite aux colonnes retenues : choisir(intitules de l'entete) -> intitules a lire"""
+    with ClasseurXlsx(chemin) as classeur:
+        ligne, intitules = classeur.entete(feuille)
+        retenus = set(choisir(list(intitules.values())))
+        lettres = {}
+        for lettre, nom in intitules.items():
+            # intitule en double : premiere colonne seulement
+            if nom in retenus and nom not in lettres.values():
+                lettres[lettre] = nom
+        df = classeur.colonnes(feuille, list(lettres), apres=ligne)
+    return df.rename(columns=lettres)
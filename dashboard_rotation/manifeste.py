@@ -0,0 +1,128 @@
+"""Manifeste des sorties generees : un classeur n'est pas regenere si les sources et les reglages n'ont pas change.
+
+La cle d'une sortie est l'empreinte SHA-256 du contenu des fichiers sources retenus, des reglages qui changent
+le resultat et du code du package. Les empreintes des fichiers sont gardees avec leur taille et leur mtime :
+un lancement sans nouvel export ne relit aucun fichier, il ne fait que comparer ces signatures.
+"""
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from datetime import datetime
+
+FICHIER_MANIFESTE = "manifeste_sorties.json"
+VERSION = 1
+MAX_SORTIES = 50            # sorties gardees dans le manifeste (les plus recentes)
+TAILLE_BLOC = 1 << 20
+
+# Reglages sans effet sur le contenu des fichiers produits
+REGLAGES_SANS_EFFET = {
+    "dossier_data", "dossier_sortie", "dossier_cache", "cache_actif", "cache_max_entrees", "cache_max_age_jours",
+    "fichier_catalogue", "chargement_parallele", "mode_batch", "batch_enseignes",
+    "batch_semaines", "batch_processus", "surveillance", "intervalle_surveillance", "serveur", "serveur_port",
+    "serveur_cache", "instrumentation", "fichier_trace", "reutiliser_sorties", "fichier_manifeste",
+}
+
+_version_code = None
+
+
+def version_code():
+    """Empreinte des sources .py du package (calculee une fois par processus)"""
+    global _version_code
+    if _version_code is None:
+        dossier = os.path.dirname(os.path.abspath(__file__))
+        h = hashlib.sha256()
+        for nom in sorted(os.listdir(dossier)):
+            if nom.endswith(".py"):
+                with open(os.path.join(dossier, nom), "rb") as f:
+                    h.update(nom.encode() + b"\0" + f.read())
+        _version_code = h.hexdigest()
+    return _version_code
+
+
+def empreinte_contenu(chemin):
+    """SHA-256 du contenu d'un fichier, lu par blocs"""
+    h = hashlib.sha256()
+    with open(chemin, "rb") as f:
+        for bloc in iter(lambda: f.read(TAILLE_BLOC), b""):
+            h.update(bloc)
+    return h.hexdigest()
+
+
+def reglages_effectifs(config):
+    """Reglages qui changent le contenu des sorties"""
+    return {nom: valeur for nom, valeur in asdict(config).items() if nom not in REGLAGES_SANS_EFFET}
+
+
+class Manifeste:
+    """Empreintes des sources deja vues et sorties produites par cle"""
+
+    def __init__(self, config):
+        self.fichier = config.fichier_manifeste or os.path.join(config.dossier_sortie, FICHIER_MANIFESTE)
+        self.empreintes = {}        # chemin absolu -> {taille, mtime_ns, sha256}
+        self.sorties = {}           # cle -> {fichier, week_num, kpi, date}
+        self.modifie = False
+        self._lire()
+
+    def _lire(self):
+        try:
+            with open(self.fichier, encoding="utf-8") as f:
+                contenu = json.load(f)
+        except (OSError, ValueError):
+            return
+        if contenu.get("version") == VERSION:
+            self.empreintes = contenu.get("empreintes", {})
+            self.sorties = contenu.get("sorties", {})
+
+    def sauver(self):
+        """Ecrit le manifeste (remplacement atomique ; ignore si le support est en lecture seule)"""
+        if not self.modifie:
+            return
+        tmp = self.fichier + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.fichier)), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": VERSION, "empreintes": self.empreintes, "sorties": self.sorties},
+                          f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.fichier)
+            self.modifie = False
+        except OSError as e:
+            print(f"Manifeste non ecrit: {e}")
+
+    def empreinte(self, chemin):
+        """SHA-256 du fichier, relu seulement si sa taille ou son mtime a change"""
+        chemin = os.path.abspath(chemin)
+        st = os.stat(chemin)
+        connu = self.empreintes.get(chemin)
+        if connu and connu["taille"] == st.st_size and connu["mtime_ns"] == st.st_mtime_ns:
+            return connu["sha256"]
+        sha = empreinte_contenu(chemin)
+        self.empreintes[chemin] = {"taille": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha}
+        self.modifie = True
+        return sha
+
+    def cle(self, fichiers, config):
+        """Cle de la sortie : contenu des sources retenues + reglages effectifs + version du code"""
+        sources = {nom: self.empreinte(chemin) if chemin else None for nom, chemin in sorted(fichiers.items())}
+        contenu = json.dumps({"sources": sources, "reglages": reglages_effectifs(config), "code": version_code()},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(contenu.encode("utf-8")).hexdigest()
+
+    def sortie(self, cle):
+        """Sortie deja produite pour cette cle (None si inconnue ou fichier supprime)"""
+        sortie = self.sorties.get(cle)
+        if sortie and os.path.exists(sortie["fichier"]):
+            return sortie
+        return None
+
+    def enregistrer(self, cle, fichier, week_num, kpi):
+        """Memorise la sortie produite (les MAX_SORTIES plus recentes sont gardees)"""
+        fichier = os.path.abspath(fichier)
+        # un fichier reecrit (meme nom, dans la meme minute) ne vaut plus pour ses anciennes cles
+        for ancienne in [c for c, sortie in self.sorties.items() if c == cle or sortie["fichier"] == fichier]:
+            del self.sorties[ancienne]
+        self.sorties[cle] = {"fichier": fichier, "week_num": int(week_num), "kpi": kpi,
+                             "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        for ancienne in list(self.sorties)[:-MAX_SORTIES]:
+            del self.sorties[ancienne]
+        self.modifie = True
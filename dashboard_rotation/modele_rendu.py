@@ -0,0 +1,452 @@
+"""Modele de rendu du classeur : libelles affiches (emojis compris), classes de style et position de chaque bloc.
+
+Tout est decide ici, avant l'ecriture : chaque moteur Excel (openpyxl, xlsxwriter) ecrit
+le modele en une seule passe, ligne par ligne, sans relire ni retoucher une cellule.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .commandes import synthese_commandes
+
+# COULEURS
+COULEURS_STATUS = {
+    "URGENT": "FF0000",
+    "COMMANDE": "FFA500",
+    "BLOCKBUSTER": "00B050",
+    "MORT": "FF6B35",
+    "STABLE": "D3D3D3"
+}
+COULEURS_SENS = {"TOP": "E2F0D9", "FLOP": "FFE6E6"}
+
+# LIBELLES AVEC EMOJIS : libelle brut -> libelle affiche (et classe de style de la ligne)
+STATUS_EMOJIS = {
+    "URGENT": "🔴 URGENT",
+    "A COMMANDE": "🟡 À COMMANDE",
+    "BLOCKBUSTER": "🟢 BLOCKBUSTER",
+    "STOCK MORT": "🟠 STOCK MORT",
+    "STABLE": "⚪ STABLE"
+}
+
+RECO_LIBELLES = {
+    "VUE D'ENSEMBLE": ("📊 VUE D'ENSEMBLE", "reco_rubrique"),
+    "ACTIONS PRIORITAIRES": ("🎯 ACTIONS PRIORITAIRES", "reco_rubrique"),
+    "OPPORTUNITES": ("💰 OPPORTUNITÉS", "reco_rubrique"),
+    "PROBLEMES A RESOUDRE": ("⚠️ PROBLÈMES À RÉSOUDRE", "reco_rubrique"),
+    "PLAN D'ACTION CETTE SEMAINE": ("📋 PLAN D'ACTION CETTE SEMAINE", "reco_rubrique"),
+    "[URGENT]": ("🔴 URGENT", "reco_urgent"),
+    "[A COMMANDE]": ("🟡 À COMMANDER", "reco_commande"),
+    "[BLOCKBUSTERS]": ("🟢 BLOCKBUSTERS", "reco_blockbuster"),
+    "[STOCK MORT]": ("🟠 STOCK MORT", "reco_stock_mort"),
+}
+
+GUIDE_LIBELLES = {
+    "FORMULES UTILISEES": ("📐 FORMULES UTILISÉES", "guide_rubrique"),
+    "ROTATION": ("ROTATION", "guide_rubrique"),
+    "COUVERTURE": ("COUVERTURE", "guide_rubrique"),
+    "CA HEBDO": ("CA HEBDO", "guide_rubrique"),
+    "SIGNIFICATION DES STATUS": ("🎯 SIGNIFICATION DES STATUS", "guide_rubrique"),
+    "[URGENT]": ("🔴 URGENT", "guide_rubrique"),
+    "[A COMMANDE]": ("🟡 À COMMANDE", "guide_rubrique"),
+    "[BLOCKBUSTER]": ("🟢 BLOCKBUSTER", "guide_rubrique"),
+    "[STOCK MORT]": ("🟠 STOCK MORT", "guide_rubrique"),
+    "[STABLE]": ("⚪ STABLE", "guide_rubrique"),
+}
+
+MEDAILLES = ["🥇", "🥈", "🥉"]
+
+
+def libelles_kpi(week_num):
+    """Libelles KPI avec emojis"""
+    return {
+        f"CA W{week_num}": f"💰 CA W{week_num}",
+        "Stock EP": "📦 Stock EP",
+        "Burintel Depot": "🏭 Burintel Dépôt",
+        "Ventes Hebdo": "📈 Ventes Hebdo",
+        "Articles Urgents": "🔴 Articles Urgents",
+        "Blockbusters": "🟢 Blockbusters"
+    }
+
+
+# CLASSES DE STYLE : proprietes neutres, traduites par chaque moteur
+# fond / couleur (police) / gras / taille / horizontal / vertical / retour (a la ligne) / bordure
+def _titre(couleur):
+    return {"fond": couleur, "couleur": "FFFFFF", "gras": True, "taille": 12,
+            "horizontal": "center", "vertical": "center", "retour": True, "bordure": True}
+
+
+STYLES = {
+    "titre_kpi": _titre("1F4E78"),
+    "titre_top": _titre("FF6B35"),
+    "titre_reco": _titre("00B050"),
+    "titre_guide": _titre("4472C4"),
+    "titre_suivi": _titre("00B050"),
+    "titre_top_ca": _titre("FFD966"),
+    "titre_classement": _titre("7030A0"),
+    "titre_variations": _titre("2F5597"),
+    "titre_commandes": _titre("C55A11"),
+    "titre_anomalies": _titre("C00000"),
+    "titre_sensibilite": _titre("375623"),
+    "entete": {"gras": True, "bordure": True, "horizontal": "center", "vertical": "top"},
+    "kpi_pair": {"fond": "E7F0F8", "gras": True, "taille": 11},
+    "kpi_impair": {"fond": "D9E8F5", "gras": True, "taille": 11},
+    "top_pair": {"fond": "FFF2CC"},
+    "top_impair": {"fond": "FFE6CC"},
+    "reco_urgent": {"fond": "FFE6E6", "gras": True, "taille": 11, "couleur": "C00000"},
+    "reco_commande": {"fond": "FFF4E6", "gras": True, "taille": 11, "couleur": "E67E22"},
+    "reco_blockbuster": {"fond": "E6FFE6", "gras": True, "taille": 11, "couleur": "27AE60"},
+    "reco_stock_mort": {"fond": "FFE6CC", "gras": True, "taille": 11, "couleur": "D35400"},
+    "reco_rubrique": {"fond": "DAEEF3", "gras": True, "taille": 11, "couleur": "000000"},
+    "reco_texte": {"fond": "F2F2F2"},
+    "reco_detail": {"fond": "FFFFFF", "retour": True, "vertical": "top"},
+    "guide_rubrique": {"fond": "E7E6F7", "gras": True, "taille": 10, "couleur": "4472C4"},
+    "guide_texte": {"fond": "F9F9F9"},
+    "guide_detail": {"fond": "FFFFFF", "retour": True},
+    "suivi_pair": {"fond": "E2F0D9"},
+    "suivi_impair": {"fond": "F2FFED"},
+    "top_ca_pair": {"fond": "FFF2CC"},
+    "top_ca_impair": {"fond": "FFFACD"},
+    "commande_pair": {"fond": "FBE5D6"},
+    "commande_impair": {"fond": "FFF5EE"},
+    "commande_total": {"fond": "F8CBAD", "gras": True},
+    "anomalie_pair": {"fond": "FFE6E6"},
+    "anomalie_impair": {"fond": "FFF5F5"},
+    "sensibilite_pair": {"fond": "EAF1DD"},
+    "sensibilite_impair": {"fond": "F7FBF1"},
+    "sensibilite_actuel": {"fond": "FFD966", "gras": True},
+    "centre": {"horizontal": "center"},
+    **{f"status_{cle}": {"fond": couleur, "couleur": "FFFFFF", "gras": True, "taille": 10}
+       for cle, couleur in COULEURS_STATUS.items()},
+    **{f"sens_{sens}": {"fond": couleur} for sens, couleur in COULEURS_SENS.items()},
+}
+
+# Largeurs de colonnes par feuille (au-dela de la liste : LARGEUR_DEFAUT)
+LARGEURS_DASHBOARD = [35, 70]
+LARGEURS_SUIVI = [15, 15, 40, 10, 12, 14, 12, 12, 10, 12, 16]
+LARGEURS_TOP_CA = [5, 15, 40, 12, 10, 16]
+LARGEURS_CLASSEMENT = [16, 20, 8, 6, 15, 40, 16, 12, 10, 18]
+LARGEURS_VARIATIONS = [30, 15, 40, 18, 18, 16, 14, 14]
+LARGEURS_COMMANDES = [28, 15, 40, 18, 10, 14, 12, 14, 14, 14, 12, 12, 14, 12, 14, 30]
+LARGEURS_ANOMALIES = [40, 16, 16, 40, 45]
+LARGEURS_SENSIBILITE = [15, 17, 19, 18, 12, 15, 15, 15, 11, 20, 16, 16, 11]
+LARGEUR_DEFAUT = 14
+
+# Colonnes du SUIVI centrees
+COLONNES_CENTREES = ["STOCK_EP", "BURINTEL_DEPOT", "VENTES_HEBDO", "ROTATION", "COUVERTURE", "DEMANDE_HEBDO", "TENDANCE",
+                     "STOCK_BURINTEL", "CONFIANCE_BURINTEL"]
+
+FEUILLES_CLASSEMENT = {"MARQUE": "🏷️ TOP FLOP MARQUE", "STATUS": "🎯 TOP FLOP STATUS"}
+
+# Blocs de la feuille VARIATIONS (table -> titre, classe des lignes)
+BLOCS_VARIATIONS = {
+    "statuts": ("🔀 TRANSITIONS DE STATUS", None),
+    "transitions": ("🎯 ARTICLES QUI CHANGENT DE STATUS", None),
+    "hausses_ca": ("📈 PLUS FORTES HAUSSES DE CA", "sens_TOP"),
+    "baisses_ca": ("📉 PLUS FORTES BAISSES DE CA", "sens_FLOP"),
+    "nouveaux": ("🆕 NOUVEAUX ARTICLES", None),
+    "disparus": ("❌ ARTICLES DISPARUS", None),
+}
+
+
+def fusionner(classes):
+    """Proprietes d'une cellule : classes appliquees dans l'ordre (la derniere l'emporte)"""
+    proprietes = {}
+    for classe in classes:
+        proprietes.update(STYLES[classe])
+    return proprietes
+
+
+def classe_status(valeur):
+    """Classe de couleur d'un STATUS (brut ou avec emoji), None si inconnu"""
+    texte = str(valeur)
+    return next((f"status_{cle}" for cle in COULEURS_STATUS if cle in texte), None)
+
+
+def _valeurs(serie):
+    """Valeurs affichees d'une colonne : scalaires Python, manquants a None"""
+    valeurs = serie.astype(object).to_numpy(copy=True)
+    valeurs[pd.isna(valeurs)] = None
+    return valeurs
+
+
+def _status(serie):
+    """STATUS affiches avec emoji et classe de couleur de chaque cellule"""
+    serie = serie.astype(object).map(STATUS_EMOJIS).fillna(serie.astype(object))
+    classes = {v: classe_status(v) for v in serie.unique()}
+    return _valeurs(serie), [classes[v] for v in serie]
+
+
+@dataclass
+class Bloc:
+    """Bloc de feuille : ligne de titre, entete eventuelle, puis lignes de donnees aux valeurs finales"""
+    titre: list
+    classe_titre: str
+    colonnes: list = field(default_factory=list)          # une sequence de valeurs affichees par colonne
+    entete: list = None                                   # noms des colonnes sous le titre (None : pas d'entete)
+    classes_lignes: list = None                           # classe de chaque ligne de donnees (fond alterne...)
+    classes_colonnes: dict = field(default_factory=dict)  # colonne -> classe fixe
+    classes_cellules: dict = field(default_factory=dict)  # colonne -> classe de chaque ligne (None : aucune)
+    conditions: dict = None                               # colonne -> {texte contenu: classe} : fond alterne et
+                                                          # classes par cellule ecrits en mise en forme conditionnelle
+    zebre: tuple = None                                   # (classe paire, classe impaire) posees par alterner
+    ligne: int = 0                                        # ligne du titre dans la feuille (0-based)
+
+    @property
+    def nb_lignes(self):
+        return len(self.colonnes[0]) if self.colonnes else 0
+
+    @property
+    def debut_donnees(self):
+        return self.ligne + 1 + (self.entete is not None)
+
+    @property
+    def fin(self):
+        """Premiere ligne apres le bloc"""
+        return self.debut_donnees + self.nb_lignes
+
+    def alterner(self, pair, impair):
+        """Fond alterne selon la parite de la ligne Excel (1-based) de chaque ligne de donnees"""
+        lignes = np.arange(self.debut_donnees, self.fin)
+        self.classes_lignes = np.where(lignes % 2 == 1, pair, impair).tolist()
+        self.zebre = (pair, impair)
+        return self
+
+    def regles(self):
+        """Mise en forme conditionnelle du bloc : (ligne, colonne, derniere ligne, derniere colonne, critere, classe).
+
+        critere : ("contient", texte) ou ("parite", reste de ROW() modulo 2). Vide si le bloc n'a pas de conditions.
+        """
+        if self.conditions is None or not self.nb_lignes:
+            return []
+        debut, fin = self.debut_donnees, self.fin - 1
+        regles = [(debut, c, fin, c, ("contient", texte), classe)
+                  for c, textes in self.conditions.items() for texte, classe in textes.items()]
+        if self.zebre is not None:
+            # ligne Excel paire (ROW() modulo 2 = 0) : classe paire, comme alterner
+            regles += [(debut, 0, fin, len(self.colonnes) - 1, ("parite", reste), classe)
+                       for reste, classe in zip((0, 1), self.zebre)]
+        return regles
+
+    def lignes(self, nb_colonnes, conditionnel=False):
+        """(ligne, [(valeur, classes), ...]) du titre, de l'entete et des donnees, dans l'ordre.
+
+        conditionnel : sans les classes rendues par les regles du bloc (fond alterne, classes par cellule).
+        """
+        conditionnel = conditionnel and self.conditions is not None
+        titre = [self.titre[c] if c < len(self.titre) else None for c in range(max(nb_colonnes, len(self.titre)))]
+        yield self.ligne, [(v, (self.classe_titre,)) for v in titre]
+        if self.entete is not None:
+            yield self.ligne + 1, [(str(nom), ("entete",)) for nom in self.entete]
+        fixes = [self.classes_colonnes.get(c) for c in range(len(self.colonnes))]
+        par_cellule = [None if conditionnel and c in self.conditions else self.classes_cellules.get(c)
+                       for c in range(len(self.colonnes))]
+        par_ligne = self.classes_lignes if not (conditionnel and self.zebre is not None) else None
+        for i in range(self.nb_lignes):
+            classe_ligne = par_ligne[i] if par_ligne is not None else None
+            cellules = []
+            for c, valeurs in enumerate(self.colonnes):
+                classes = (classe_ligne, fixes[c], par_cellule[c][i] if par_cellule[c] is not None else None)
+                cellules.append((valeurs[i], tuple(k for k in classes if k)))
+            yield self.debut_donnees + i, cellules
+
+
+@dataclass
+class Feuille:
+    """Onglet du classeur : blocs places les uns sous les autres, une ligne vide entre deux blocs"""
+    cle: str                     # nom court (etapes d'instrumentation)
+    nom: str                     # nom de l'onglet, emoji compris
+    largeurs: list
+    blocs: list = field(default_factory=list)
+    nb_colonnes: int = 0         # largeur des lignes de titre
+
+    def ajouter(self, bloc):
+        """Place le bloc sous le precedent (ligne fixee ici, jamais recalculee a l'ecriture)"""
+        bloc.ligne = self.blocs[-1].fin + 1 if self.blocs else 0
+        self.blocs.append(bloc)
+        return bloc
+
+    @property
+    def nb_lignes(self):
+        return self.blocs[-1].fin if self.blocs else 0
+
+    def lignes(self, conditionnel=False):
+        for bloc in self.blocs:
+            yield from bloc.lignes(self.nb_colonnes, conditionnel)
+
+    def regles(self):
+        return [regle for bloc in self.blocs for regle in bloc.regles()]
+
+
+def _largeurs(base, nb_colonnes):
+    return [base[c] if c < len(base) else LARGEUR_DEFAUT for c in range(nb_colonnes)]
+
+
+def feuille_dashboard(df_kpi, top_ca, df_reco, df_guide, week_num):
+    """DASHBOARD : blocs KPI, TOP, RECO et GUIDE"""
+    nb_colonnes = max(2, len(top_ca.columns)) if not top_ca.empty else 2
+    feuille = Feuille("DASHBOARD", "🏠 DASHBOARD", LARGEURS_DASHBOARD, nb_colonnes=nb_colonnes)
+
+    # KPI
+    emojis_kpi = libelles_kpi(week_num)
+    labels = [emojis_kpi.get(label, label) for label in df_kpi.iloc[:, 0]]
+    feuille.ajouter(Bloc(["📊 INDICATEURS CLÉS", "Valeur"], "titre_kpi",
+                         [labels, _valeurs(df_kpi.iloc[:, 1])])).alterner("kpi_pair", "kpi_impair")
+
+    # TOP
+    if not top_ca.empty:
+        colonnes = [_valeurs(top_ca[c]) for c in top_ca.columns]
+        colonnes[0] = np.array(MEDAILLES[:len(top_ca)] + list(colonnes[0][len(MEDAILLES):]), dtype=object)
+        feuille.ajouter(Bloc(["🏆"], "titre_top", colonnes, entete=list(top_ca.columns))).alterner("top_pair", "top_impair")
+
+    # RECO
+    reco = [RECO_LIBELLES.get(str(label), (str(label), "reco_texte")) for label in df_reco.iloc[:, 0]]
+    feuille.ajouter(Bloc(["🎯 RECOMMANDATIONS & ACTIONS"], "titre_reco",
+                         [[libelle for libelle, _ in reco], _valeurs(df_reco.iloc[:, 1])],
+                         entete=list(df_reco.columns),
+                         classes_colonnes={1: "reco_detail"},
+                         classes_cellules={0: [classe for _, classe in reco]}))
+
+    # GUIDE
+    guide = [GUIDE_LIBELLES.get(str(label), (str(label), "guide_texte")) for label in df_guide.iloc[:, 0]]
+    feuille.ajouter(Bloc(["📚 GUIDE DE LECTURE"], "titre_guide",
+                         [[libelle for libelle, _ in guide], _valeurs(df_guide.iloc[:, 1])],
+                         entete=list(df_guide.columns),
+                         classes_colonnes={1: "guide_detail"},
+                         classes_cellules={0: [classe for _, classe in guide]}))
+    return feuille
+
+
+def feuille_suivi(dashboard_export):
+    """SUIVI : STATUS avec emoji et couleur, colonnes de quantites centrees, lignes alternees"""
+    disp_cols = list(dashboard_export.columns)
+    colonnes, cellules = [], {}
+    for c, nom in enumerate(disp_cols):
+        if nom == "STATUS":
+            valeurs, cellules[c] = _status(dashboard_export[nom])
+            colonnes.append(valeurs)
+        else:
+            colonnes.append(_valeurs(dashboard_export[nom]))
+    centrees = {c: "centre" for c, nom in enumerate(disp_cols) if nom in COLONNES_CENTREES}
+    # moteurs a mise en forme conditionnelle : couleur du STATUS selon le mot-cle contenu, fond alterne
+    conditions = {c: {cle: f"status_{cle}" for cle in COULEURS_STATUS} for c in cellules}
+
+    feuille = Feuille("SUIVI", "📊 SUIVI", _largeurs(LARGEURS_SUIVI, len(disp_cols)), nb_colonnes=len(disp_cols))
+    feuille.ajouter(Bloc(disp_cols, "titre_suivi", colonnes, classes_colonnes=centrees,
+                         classes_cellules=cellules, conditions=conditions)).alterner("suivi_pair", "suivi_impair")
+    return feuille
+
+
+def feuille_top_ca(top_ca):
+    """TOP CA : classement du CA de la semaine"""
+    feuille = Feuille("TOP CA", "🥇 TOP CA", LARGEURS_TOP_CA, nb_colonnes=len(top_ca.columns))
+    feuille.ajouter(Bloc(list(top_ca.columns), "titre_top_ca",
+                         [_valeurs(top_ca[c]) for c in top_ca.columns])).alterner("top_ca_pair", "top_ca_impair")
+    return feuille
+
+
+def feuille_classement(groupe, table):
+    """TOP FLOP d'un groupe : couleur TOP / FLOP par ligne, STATUS colores"""
+    cellules = {}
+    if "STATUS" in table.columns:
+        statuts = table["STATUS"].astype(object)
+        classes = {v: classe_status(v) for v in statuts.unique()}
+        cellules[list(table.columns).index("STATUS")] = [classes[v] for v in statuts]
+    feuille = Feuille(f"TOP FLOP {groupe}", FEUILLES_CLASSEMENT[groupe], LARGEURS_CLASSEMENT,
+                      nb_colonnes=len(table.columns))
+    feuille.ajouter(Bloc(list(table.columns), "titre_classement", [_valeurs(table[c]) for c in table.columns],
+                         classes_lignes=[f"sens_{s}" if s in COULEURS_SENS else None for s in table["SENS"]],
+                         classes_cellules=cellules))
+    return feuille
+
+
+def feuille_variations(variations):
+    """VARIATIONS : transitions de STATUS, ecarts de CA, nouveaux et disparus (un bloc par table)"""
+    tables = variations.tables
+    nb_colonnes = max(len(t.columns) for t in tables.values())
+    feuille = Feuille("VARIATIONS", "🔀 VARIATIONS", _largeurs(LARGEURS_VARIATIONS, nb_colonnes), nb_colonnes=nb_colonnes)
+    periode = (f"W{variations.semaine_precedente.isocalendar()[1]:02d} -> W{variations.semaine.isocalendar()[1]:02d} "
+               f"({variations.semaine_precedente:%d/%m/%Y} -> {variations.semaine:%d/%m/%Y})")
+    for nom, (titre, classe_ligne) in BLOCS_VARIATIONS.items():
+        table = tables[nom]
+        colonnes, cellules = [], {}
+        for c, colonne in enumerate(table.columns):
+            if colonne in ("STATUS", "STATUS_PREC"):
+                valeurs, cellules[c] = _status(table[colonne])
+                colonnes.append(valeurs)
+            else:
+                colonnes.append(_valeurs(table[colonne]))
+        feuille.ajouter(Bloc([titre, periode] if nom == "statuts" else [titre], "titre_variations", colonnes,
+                             entete=list(table.columns), classes_cellules=cellules,
+                             classes_lignes=[classe_ligne] * len(table) if classe_ligne else None))
+    return feuille
+
+
+def feuille_commandes(commandes):
+    """COMMANDES : synthese par source, puis proposition article par article (les plus urgents d'abord)"""
+    synthese = synthese_commandes(commandes)
+    nb_colonnes = len(commandes.columns)
+    feuille = Feuille("COMMANDES", "🛒 COMMANDES", _largeurs(LARGEURS_COMMANDES, nb_colonnes), nb_colonnes=nb_colonnes)
+    feuille.ajouter(Bloc(["🛒 PROPOSITION DE COMMANDE"], "titre_commandes",
+                         [_valeurs(synthese[c]) for c in synthese.columns], entete=list(synthese.columns),
+                         classes_lignes=[None] * (len(synthese) - 1) + ["commande_total"] if len(synthese) else None))
+
+    colonnes, cellules = [], {}
+    for c, nom in enumerate(commandes.columns):
+        if nom == "STATUS":
+            valeurs, cellules[c] = _status(commandes[nom])
+            colonnes.append(valeurs)
+        else:
+            colonnes.append(_valeurs(commandes[nom]))
+    centrees = {c: "centre" for c, nom in enumerate(commandes.columns) if nom in COLONNES_CENTREES or nom.startswith("QTE_")}
+    feuille.ajouter(Bloc(["📦 DETAIL PAR ARTICLE"], "titre_commandes", colonnes, entete=list(commandes.columns),
+                         classes_colonnes=centrees, classes_cellules=cellules)).alterner("commande_pair", "commande_impair")
+    return feuille
+
+
+def feuille_sensibilite(sensibilite):
+    """SENSIBILITE : une ligne par combinaison de seuils, reglage actuel surligne"""
+    colonnes = list(sensibilite.columns)
+    feuille = Feuille("SENSIBILITE", "🎚️ SENSIBILITE", _largeurs(LARGEURS_SENSIBILITE, len(colonnes)),
+                      nb_colonnes=len(colonnes))
+    bloc = feuille.ajouter(Bloc(["🎚️ SENSIBILITE DES STATUS AUX SEUILS"], "titre_sensibilite",
+                                [_valeurs(sensibilite[c]) for c in colonnes], entete=colonnes,
+                                classes_colonnes={c: "centre" for c, nom in enumerate(colonnes) if nom.startswith("NB_")}))
+    bloc.alterner("sensibilite_pair", "sensibilite_impair")
+    actuel = sensibilite["REGLAGE"].to_numpy() == "ACTUEL"
+    bloc.classes_lignes = np.where(actuel, "sensibilite_actuel", bloc.classes_lignes).tolist()
+    return feuille
+
+
+def feuille_anomalies(anomalies):
+    """ANOMALIES : synthese des controles des sources, puis lignes concernees"""
+    feuille = Feuille("ANOMALIES", "⚠️ ANOMALIES", LARGEURS_ANOMALIES, nb_colonnes=len(LARGEURS_ANOMALIES))
+    if anomalies.vide:
+        feuille.ajouter(Bloc(["✅ AUCUNE ANOMALIE DANS LES SOURCES"], "titre_anomalies"))
+        return feuille
+    synthese, lignes = anomalies.synthese, anomalies.lignes
+    feuille.ajouter(Bloc(["⚠️ ANOMALIES DES SOURCES"], "titre_anomalies", [_valeurs(synthese[c]) for c in synthese.columns],
+                         entete=list(synthese.columns))).alterner("anomalie_pair", "anomalie_impair")
+    if not lignes.empty:
+        feuille.ajouter(Bloc(["🔎 LIGNES CONCERNEES"], "titre_anomalies", [_valeurs(lignes[c]) for c in lignes.columns],
+                             entete=list(lignes.columns))).alterner("anomalie_pair", "anomalie_impair")
+    return feuille
+
+
+def modele_classeur(df_kpi, top_ca, df_reco, df_guide, dashboard_export, week_num, classements=None, variations=None,
+                    commandes=None, anomalies=None, sensibilite=None):
+    """Feuilles du classeur dans l'ordre des onglets, pretes a ecrire"""
+    feuilles = [feuille_dashboard(df_kpi, top_ca, df_reco, df_guide, week_num), feuille_suivi(dashboard_export)]
+    if not top_ca.empty:
+        feuilles.append(feuille_top_ca(top_ca))
+    for groupe, table in (classements or {}).items():
+        feuilles.append(feuille_classement(groupe, table))
+    if commandes is not None:
+        feuilles.append(feuille_commandes(commandes))
+    if sensibilite is not None:
+        feuilles.append(feuille_sensibilite(sensibilite))
+    if variations is not None:
+        feuilles.append(feuille_variations(variations))
+    if anomalies is not None:
+        feuilles.append(feuille_anomalies(anomalies))
+    return feuilles
@@ -0,0 +1,350 @@
+"""Calcul du dashboard d'une enseigne pour une semaine (build_dashboard), puis ecriture du classeur (render_dashboard)."""
+import os
+from dataclasses import dataclass
+from datetime import datetime
+
+import pandas as pd
+
+from . import instrumentation
+from .chargement import (
+    charger_en_parallele, cible_semaine, extraire_stock_burintel, lire_source, lire_ventes_streaming, normaliser,
+    recap_depuis_stock, ventes_derniere_semaine,
+)
+from .catalogue import trouver_fichiers
+from .commandes import calculer_commandes
+from .config import Config, code_enseigne
+from .demande import demande_depuis_ventes
+from .historique import ventes_depuis_historique
+from .indicateurs import MetriquesDashboard, calculer_dashboard, calculer_metriques
+from .instrumentation import etape
+from .export_donnees import exporter_donnees
+from .rendu_excel import exporter_dashboard
+from .sensibilite import calculer_sensibilite
+from .validation import valider_sources
+from .variations import variations_semaine
+
+
+@dataclass
+class ResultatDashboard:
+    """Dashboard calcule, pret a etre rendu (ou lu directement : metriques seules)"""
+    enseigne: str
+    date_semaine: pd.Timestamp
+    week_num: int
+    dashboard: pd.DataFrame
+    metriques: MetriquesDashboard
+    fichiers: dict
+    variations: object = None   # Variations vs la photo precedente (config.variations_actives)
+    commandes: pd.DataFrame = None  # proposition de commande (config.commandes_actives)
+    anomalies: object = None    # Anomalies des sources (config.validation_active)
+    sensibilite: pd.DataFrame = None    # STATUS par combinaison de seuils (config.sensibilite_active)
+
+
+def signature_fichier(chemin):
+    """(chemin, taille, mtime) : change des qu'un export est remplace ou reecrit"""
+    if not chemin:
+        return None
+    try:
+        st = os.stat(chemin)
+    except OSError:
+        return None
+    return os.path.abspath(chemin), st.st_size, st.st_mtime_ns
+
+
+def _options_lecture(args):
+    """Arguments d'une lecture, la Config reduite aux champs lus par les lecteurs (cache, historique).
+
+    L'enseigne et la semaine n'en font pas partie : changer de vue ne relit pas le Stock, le RECAP ni le Burintel.
+    """
+    return repr(tuple((a.cache_actif, a.dossier_cache, a.fichier_historique, a.dossier_data, a.fichier_catalogue)
+                      if isinstance(a, Config) else a for a in args))
+
+
+class MemoireSources:
+    """Sources lues et normalisees + calculs derives, gardes en memoire entre deux lancements.
+
+    Une source n'est relue que si sa signature (fichier, taille, mtime, options) change ;
+    un calcul derive n'est refait que si la cle de ses entrees change.
+    """
+
+    def __init__(self):
+        self.sources = {}   # nom -> (signature, resultat)
+        self.derives = {}   # nom -> (cle, valeur)
+
+    def charger(self, taches, signatures, mode):
+        """Lit seulement les sources nouvelles ou modifiees : ({nom: resultat}, noms relus)"""
+        a_lire = {nom: tache for nom, tache in taches.items()
+                  if nom not in self.sources or self.sources[nom][0] != signatures[nom]}
+        lus = charger_en_parallele(a_lire, mode) if a_lire else {}
+        for nom in list(self.sources):
+            if nom not in taches:
+                del self.sources[nom]
+        for nom, resultat in lus.items():
+            self.sources[nom] = (signatures[nom], resultat)
+        return {nom: self.sources[nom][1] for nom in taches}, set(lus)
+
+    def derive(self, nom, cle, calcul):
+        """Valeur memorisee si `cle` est inchangee, sinon calcul()"""
+        if nom in self.derives and self.derives[nom][0] == cle:
+            return self.derives[nom][1]
+        valeur = calcul()
+        self.derives[nom] = (cle, valeur)
+        return valeur
+
+
+def decouvrir_fichiers(config, dossier=None):
+    """Fichiers sources {stock, ventes, recap, burintel} retenus dans un dossier (None : config.dossier_data et son catalogue)"""
+    with etape("decouverte"):
+        fichier_catalogue = None if dossier else config.fichier_catalogue
+        return trouver_fichiers(dossier or config.dossier_data, config.semaine, config.enseigne, fichier_catalogue)
+
+
+def decouvrir_sources(sources, config):
+    """Fichiers sources : dict {stock, ventes, recap, burintel}, dossier a parcourir ou None (config.dossier_data)"""
+    if isinstance(sources, dict):
+        fichiers = {nom: sources.get(nom) for nom in ("stock", "ventes", "recap", "burintel")}
+    else:
+        fichiers = decouvrir_fichiers(config, sources)
+
+    print(f"\nFichiers detectes:")
+    print(f"   Stock: {os.path.basename(fichiers['stock']) if fichiers['stock'] else 'INTROUVABLE'}")
+    print(f"   Ventes: {os.path.basename(fichiers['ventes']) if fichiers['ventes'] else 'INTROUVABLE'}")
+    print(f"   RECAP: {os.path.basename(fichiers['recap']) if fichiers['recap'] else 'INTROUVABLE'}")
+    print(f"   Burintel: {os.path.basename(fichiers['burintel']) if fichiers['burintel'] else 'INTROUVABLE'}")
+    return fichiers
+
+
+def _taches_chargement(fichiers, config):
+    """Lectures a lancer : {nom: (fonction, args)}"""
+    stock_file, vente_file = fichiers["stock"], fichiers["ventes"]
+    recap_file, burintel_file = fichiers["recap"], fichiers["burintel"]
+    enseigne = config.enseigne
+    taches = {}
+    if stock_file:
+        taches["stock"] = (lire_source, ("stock", stock_file, config))
+    if config.historique_actif:
+        cible = cible_semaine(config.semaine)
+        if config.demande != "hebdo":
+            # le moteur de demande a besoin de l'historique complet de l'enseigne
+            taches["ventes"] = (ventes_depuis_historique, (config, [enseigne]))
+        elif cible is None:
+            taches["ventes"] = (ventes_depuis_historique, (config, [enseigne], None, True))
+        else:
+            # numero ISO : toutes les semaines de l'enseigne, la selection se fait ensuite
+            semaines = [cible] if isinstance(cible, pd.Timestamp) else None
+            taches["ventes"] = (ventes_depuis_historique, (config, [enseigne], semaines))
+    elif config.ventes_streaming and vente_file:
+        taches["ventes_stream"] = (lire_ventes_streaming, (vente_file, enseigne, "Ventes hebdomadaires", config.semaine))
+    elif vente_file:
+        taches["ventes"] = (lire_source, ("ventes", vente_file, config))
+    if burintel_file:
+        taches["burintel"] = (lire_source, ("burintel", burintel_file, config))
+    if recap_file:
+        taches["recap"] = (lire_source, ("recap", recap_file, config))
+    return taches
+
+
+def _ventes_de_la_semaine(df_ventes, ventes_stream, enseigne, config):
+    """Quantité par EAN de la semaine retenue : (ventes_ean ou None, date_semaine, nb lignes de la semaine).
+
+    Hors mode "hebdo", ventes_ean porte aussi DEMANDE_HEBDO et TENDANCE calculees sur tout l'historique.
+    """
+    if ventes_stream is not None:
+        # Ventes deja filtrees et cumulees pendant la lecture
+        ventes_ean, date_semaine, _, nb_lignes_sem = ventes_stream
+        if config.demande != "hebdo":
+            print("Lecture streaming : une seule semaine lue -> demande = ventes de la semaine")
+        return (None if ventes_ean.empty else ventes_ean), date_semaine, nb_lignes_sem
+
+    with etape("ventes semaine", len(df_ventes)):
+        df_ventes_sem, date_semaine = ventes_derniere_semaine(df_ventes, enseigne, config.semaine)
+        ventes_ean = None
+        if not df_ventes_sem.empty and "Quantité" in df_ventes_sem.columns:
+            ventes_ean = df_ventes_sem.groupby("EAN", observed=True)["Quantité"].sum().reset_index(name="VENTES_HEBDO")
+    if ventes_ean is not None and config.demande != "hebdo":
+        with etape(f"demande {config.demande}", len(df_ventes)):
+            ventes_ean = demande_depuis_ventes(df_ventes, enseigne, date_semaine, config)
+    return ventes_ean, date_semaine, len(df_ventes_sem)
+
+
+def build_dashboard(sources=None, config=None, memoire=None):
+    """Charge les sources et calcule le dashboard de config.enseigne pour la semaine config.semaine.
+
+    Aucun classeur n'est ecrit (voir render_dashboard). Avec une MemoireSources, seules
+    les sources modifiees depuis l'appel precedent sont relues et, si ni le RECAP/Stock
+    ni les ventes de la semaine n'ont change, le meme dashboard est retourne.
+    Leve ValueError si aucune donnee n'est exploitable ou si la semaine demandee est absente des ventes.
+    """
+    config = config or Config()
+    memoire = memoire or MemoireSources()
+    instrumentation.activer(config.instrumentation)
+    enseigne = config.enseigne
+    fichiers = decouvrir_sources(sources, config)
+
+    # CHARGEMENT (sources modifiees seulement)
+    taches = _taches_chargement(fichiers, config)
+    signatures = {nom: (signature_fichier(fichiers["ventes" if nom == "ventes_stream" else nom]),
+                        _options_lecture(args))
+                  for nom, (_, args) in taches.items()}
+    sources_chargees, relus = memoire.charger(taches, signatures, config.chargement_parallele)
+
+    # NORMALISATION (des seules sources relues, les autres le sont deja)
+    frais = [sources_chargees[nom] for nom in relus if isinstance(sources_chargees[nom], pd.DataFrame)]
+    with etape("normalisation", sum(len(df) for df in frais)):
+        normaliser(*frais)
+
+    df_stock = sources_chargees.get("stock", pd.DataFrame())
+    df_ventes = sources_chargees.get("ventes", pd.DataFrame())
+    df_burintel = sources_chargees.get("burintel", pd.DataFrame())
+    df_recap = sources_chargees.get("recap", pd.DataFrame())
+    ventes_stream = sources_chargees.get("ventes_stream")
+    cle_ventes = signatures.get("ventes") or signatures.get("ventes_stream")
+    if "ventes_stream" in taches and ventes_stream is None:
+        def lecture_complete():
+            print("Lecture streaming impossible -> lecture complete")
+            with etape("chargement ventes") as mesure:
+                df = lire_source("ventes", fichiers["ventes"], config)
+                mesure["lignes"] = len(df)
+            normaliser(df)
+            return df
+        df_ventes = memoire.derive("ventes_completes", cle_ventes, lecture_complete)
+
+    # FALLBACK
+    cle_recap = signatures.get("recap")
+    if df_recap.empty and not df_stock.empty:
+        code = code_enseigne(enseigne, config.codes_enseignes)
+        print(f"RECAP vide -> Utilisation du Stock {code} filtre")
+        cle_recap = (signatures.get("stock"), enseigne)
+        df_recap = memoire.derive("recap_stock", cle_recap, lambda: recap_depuis_stock(df_stock, enseigne))
+        print(f"{len(df_recap)} articles Stock {code} utilises comme RECAP")
+
+    if df_recap.empty:
+        raise ValueError("AUCUNE DONNEE DISPONIBLE")
+
+    print(f"\n{len(df_recap)} articles charges dans RECAP")
+    print(f"{ventes_stream[2] if ventes_stream else len(df_ventes)} lignes de ventes chargees")
+    if not df_burintel.empty:
+        print(f"{len(df_burintel)} articles Burintel charges")
+
+    # STOCK BURINTEL
+    with etape("stock burintel", len(df_burintel)):
+        burintel_stock = memoire.derive("stock_burintel", signatures.get("burintel"),
+                                        lambda: extraire_stock_burintel(df_burintel))
+    if not burintel_stock.empty:
+        print(f"Stock Burintel: {burintel_stock['STOCK_BURINTEL'].sum():,.0f} unites")
+
+    # SEMAINE
+    cle_semaine = (cle_ventes, enseigne, config.semaine, config.demande, config.demande_semaines, config.demande_alpha)
+    ventes_ean, date_semaine, nb_lignes_sem = memoire.derive(
+        "ventes_semaine", cle_semaine, lambda: _ventes_de_la_semaine(df_ventes, ventes_stream, enseigne, config))
+    if pd.isna(date_semaine):
+        if config.semaine is not None:
+            raise ValueError(f"Semaine {config.semaine} absente des ventes {enseigne}")
+        date_semaine = pd.Timestamp.now()
+
+    week_num = date_semaine.isocalendar()[1]
+    print(f"\nSemaine W{week_num}: {date_semaine.strftime('%d/%m/%Y')}")
+    print(f"{nb_lignes_sem} lignes de ventes pour cette semaine")
+
+    # VENTES PAR EAN
+    if ventes_ean is not None:
+        nb_ean = (ventes_ean["VENTES_HEBDO"] > 0).sum() if "DEMANDE_HEBDO" in ventes_ean.columns else len(ventes_ean)
+        print(f"{nb_ean} EAN avec ventes")
+    else:
+        ventes_ean = pd.DataFrame({"EAN": df_recap["EAN"].unique(), "VENTES_HEBDO": 0})
+        print("Pas de ventes hebdo - Initialisation a 0")
+
+    # VALIDATION (avant la fusion : EAN en double ou invalides traites selon la politique)
+    anomalies = None
+    if config.validation_active:
+        def valider():
+            with etape("validation", len(df_recap) + len(ventes_ean)):
+                return valider_sources(df_recap, ventes_ean, config)
+        cle_validation = (cle_recap, cle_semaine, config.politique_doublons)
+        df_recap, ventes_ean, anomalies = memoire.derive("validation", cle_validation, valider)
+        cle_recap = cle_validation
+        print(f"VALIDATION: {len(anomalies.synthese)} anomalies, {len(df_recap)} articles et {len(ventes_ean)} EAN vendus gardes")
+
+    # DASHBOARD (recalcule seulement si le RECAP, les ventes de la semaine ou les seuils changent)
+    def calculer():
+        with etape("fusion", len(df_recap)):
+            dashboard = calculer_dashboard(df_recap, ventes_ean, config, burintel_stock)
+        with etape("kpi", len(dashboard)):
+            metriques = calculer_metriques(dashboard, week_num, config)
+        return dashboard, metriques
+
+    seuils = (config.seuil_urgent, config.seuil_commande, config.seuil_blockbuster, config.seuil_stock_mort)
+    rapprochement = (signatures.get("burintel"), config.seuil_rapprochement) if config.rapprochement_burintel else None
+    dashboard, metriques = memoire.derive("dashboard", (cle_recap, cle_semaine, seuils, rapprochement), calculer)
+    if "RAPPROCHEMENT" in dashboard.columns:
+        par_code, par_libelle = [int((dashboard["RAPPROCHEMENT"] == m).sum()) for m in ("CODE", "LIBELLE")]
+        print(f"RAPPROCHEMENT BURINTEL: {par_code} articles par code, {par_libelle} par libelle, "
+              f"{dashboard['STOCK_BURINTEL'].sum():,.0f} unites")
+
+    # VARIATIONS (photo de la semaine, jointe a la photo precedente : les semaines passees ne sont pas recalculees)
+    variations = None
+    if config.variations_actives:
+        def comparer():
+            with etape("variations", len(dashboard)):
+                return variations_semaine(dashboard, enseigne, date_semaine, config)[0]
+        cle_variations = (cle_recap, cle_semaine, seuils, rapprochement, config.variations_top_n)
+        variations = memoire.derive("variations", cle_variations, comparer)
+
+    # COMMANDES (depot EP, puis stock Burintel, puis fournisseur)
+    commandes = None
+    if config.commandes_actives:
+        def commander():
+            with etape("commandes", len(dashboard)):
+                return calculer_commandes(dashboard, burintel_stock, config)
+        cle_commandes = (cle_recap, cle_semaine, seuils, rapprochement, signatures.get("burintel"),
+                         config.couverture_cible, config.delai_livraison)
+        commandes = memoire.derive("commandes", cle_commandes, commander)
+        print(f"COMMANDES: {len(commandes)} articles, {commandes['VALEUR_ACHAT'].sum():,.0f} DH a P.ACHAT")
+
+    # SENSIBILITE (toutes les combinaisons des grilles de seuils en une passe)
+    sensibilite = None
+    if config.sensibilite_active:
+        def balayer():
+            with etape("sensibilite", len(dashboard)):
+                return calculer_sensibilite(dashboard, config)
+        cle_sensibilite = (cle_recap, cle_semaine, seuils, config.grille_urgent, config.grille_commande,
+                           config.grille_blockbuster, config.grille_stock_mort)
+        sensibilite = memoire.derive("sensibilite", repr(cle_sensibilite), balayer)
+        print(f"SENSIBILITE: {len(sensibilite)} combinaisons de seuils")
+
+    print(f"\nINDICATEURS:")
+    print(f"   Urgents: {metriques.nb_urgents}")
+    print(f"   A commander: {metriques.nb_a_commander}")
+    print(f"   Blockbusters: {metriques.nb_blockbusters}")
+    print(f"   Stock mort: {metriques.nb_stock_mort}")
+
+    return ResultatDashboard(enseigne, date_semaine, week_num, dashboard, metriques, fichiers, variations, commandes,
+                             anomalies, sensibilite)
+
+
+def render_dashboard(resultat, config=None, fichier=None):
+    """Ecrit les fichiers Suivi_<code>_Wxx d'un ResultatDashboard (config.formats_export) et retourne le principal.
+
+    Le principal est le classeur .xlsx, ou le premier fichier de donnees si "xlsx" n'est pas demande
+    (None si aucun fichier n'est ecrit).
+    """
+    config = config or Config()
+    if fichier is None:
+        os.makedirs(config.dossier_sortie, exist_ok=True)
+        code = code_enseigne(resultat.enseigne, config.codes_enseignes)
+        fichier = os.path.join(config.dossier_sortie,
+                               f"Suivi_{code}_W{resultat.week_num:02d}_{datetime.now().strftime('%d%m%Y_%H%M')}.xlsx")
+
+    if "xlsx" in config.formats_export:
+        print(f"\nGeneration du fichier Excel...")
+        exporter_dashboard(fichier, resultat.dashboard, resultat.metriques, config=config,
+                           variations=resultat.variations, commandes=resultat.commandes,
+                           anomalies=resultat.anomalies, sensibilite=resultat.sensibilite)
+    donnees = exporter_donnees(os.path.splitext(fichier)[0], resultat.dashboard, resultat.metriques,
+                               resultat.enseigne, resultat.date_semaine, config=config,
+                               variations=resultat.variations, commandes=resultat.commandes,
+                               anomalies=resultat.anomalies, sensibilite=resultat.sensibilite)
+    for f in donnees:
+        print(f"Donnees: {os.path.basename(f)}")
+    if "xlsx" in config.formats_export:
+        return fichier
+    return donnees[0] if donnees else None
@@ -0,0 +1,183 @@
+"""Rapprochement des articles EP avec le stock LABBURINTEL : code Burintel, puis ressemblance des libelles.
+
+1. Code : jointure par hachage du "Code Burintel" du RECAP sur le N° LABBURINTEL (confiance 1).
+2. Libelle : pour les articles restants, la Description des codes non encore rapproches est decoupee en
+   trigrammes de caracteres (libelle normalise, sans accents) et indexee une fois (index inverse trie par
+   trigramme). Chaque libelle EP ne parcourt que les listes de ses trigrammes les plus rares ; les quelques
+   descriptions qui en partagent le plus sont scorees sur tous leurs trigrammes, en bloc, sans comparer les
+   libelles deux a deux. La confiance est le coefficient de Dice ; un code ne va qu'a l'article le plus proche.
+"""
+import numpy as np
+import pandas as pd
+
+from .compact import texte_code
+from .config import Config
+
+ALPHABET = 37                       # espace, A-Z, 0-9
+NB_TRIGRAMMES = ALPHABET ** 3
+LONGUEUR_MAX = 64                   # caracteres d'un libelle pris en compte
+FREQUENCE_MAX = 0.01                # trigrammes presents dans plus de 1 % des descriptions : non indexes...
+FREQUENCE_MIN = 20                  # ... sauf s'ils sont dans 20 descriptions au plus
+RARES = 4                           # trigrammes les moins frequents d'un libelle qui designent les candidats
+CANDIDATS = 3                       # descriptions candidates par libelle, scorees sur tous leurs trigrammes
+BLOC = 2048                         # libelles cherches par bloc (memoire des candidats bornee)
+METHODES = np.array(["", "CODE", "LIBELLE"], dtype=object)
+
+_CARACTERES = np.zeros(128, dtype=np.int64)
+_CARACTERES[np.arange(ord("A"), ord("Z") + 1)] = np.arange(1, 27)
+_CARACTERES[np.arange(ord("0"), ord("9") + 1)] = np.arange(27, 37)
+
+
+def codes_burintel(serie):
+    """Codes Burintel en texte canonique (12345.0 -> '12345', vides : chaine vide)"""
+    return texte_code(serie).to_numpy(dtype=object)
+
+
+def stock_burintel_par_code(burintel_stock):
+    """STOCK_BURINTEL par code Burintel (N°), lignes d'un meme code cumulees (lignes sans N° ignorees)"""
+    if burintel_stock.empty:
+        return pd.Series(dtype=float)
+    codes = codes_burintel(burintel_stock["N°"])
+    return burintel_stock["STOCK_BURINTEL"][codes != ""].groupby(codes[codes != ""]).sum()
+
+
+def normaliser_libelles(serie):
+    """Libelles en majuscules sans accents, separateurs reduits a un espace"""
+    texte = pd.Series(serie, dtype=object).where(pd.notna(serie), "").astype(str)
+    texte = texte.str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii").str.upper()
+    return texte.str.replace(r"[^A-Z0-9]+", " ", regex=True).str.strip().str.slice(0, LONGUEUR_MAX).to_numpy()
+
+
+def _distinctes(cles):
+    """Valeurs distinctes triees et nombre d'occurrences (tri + ruptures, plus rapide que np.unique)"""
+    cles = np.sort(cles)
+    ruptures = np.flatnonzero(np.r_[True, cles[1:] != cles[:-1]])
+    return cles[ruptures], np.diff(np.r_[ruptures, len(cles)])
+
+
+def _rangs(groupes):
+    """Rang de chaque element dans son groupe (groupes contigus)"""
+    debuts = np.flatnonzero(np.r_[True, groupes[1:] != groupes[:-1]])
+    return np.arange(len(groupes)) - np.repeat(debuts, np.diff(np.r_[debuts, len(groupes)]))
+
+
+def _trigrammes(libelles):
+    """(ligne, trigramme) distincts de libelles normalises, bornes par un espace ; tries par ligne"""
+    bornes = np.array([f" {t} " if t else "" for t in libelles], dtype=f"U{LONGUEUR_MAX + 2}")
+    if not len(bornes):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    caracteres = _CARACTERES[np.minimum(bornes.view(np.uint32).reshape(len(bornes), -1), 127)]
+    longueurs = np.char.str_len(bornes)
+    trigrammes = (caracteres[:, :-2] * ALPHABET + caracteres[:, 1:-1]) * ALPHABET + caracteres[:, 2:]
+    valides = np.arange(trigrammes.shape[1]) + 3 <= longueurs[:, None]
+    lignes = np.broadcast_to(np.arange(len(bornes))[:, None], trigrammes.shape)[valides]
+    cles, _ = _distinctes(lignes.astype(np.int64) * NB_TRIGRAMMES + trigrammes[valides])
+    return cles // NB_TRIGRAMMES, cles % NB_TRIGRAMMES
+
+
+class IndexTrigrammes:
+    """Trigrammes des descriptions : cles (description, trigramme) triees et index inverse des trigrammes
+    informatifs (descriptions triees par trigramme, pointeur de debut de chaque trigramme)"""
+
+    def __init__(self, libelles):
+        self.taille = len(libelles)
+        docs, trigrammes = _trigrammes(libelles)
+        self.cles = docs * NB_TRIGRAMMES + trigrammes
+        self.nb = np.bincount(docs, minlength=self.taille)
+        frequence = np.bincount(trigrammes, minlength=NB_TRIGRAMMES)
+        garde = (frequence <= max(FREQUENCE_MIN, FREQUENCE_MAX * self.taille))[trigrammes]
+        ordre = np.argsort(trigrammes[garde], kind="stable")
+        self.docs = docs[garde][ordre]
+        self.debuts = np.searchsorted(trigrammes[garde][ordre], np.arange(NB_TRIGRAMMES + 1))
+
+    def _candidats(self, lignes, trigrammes):
+        """(ligne, description) : les CANDIDATS descriptions partageant le plus de ces trigrammes avec chaque ligne"""
+        longueurs = self.debuts[trigrammes + 1] - self.debuts[trigrammes]
+        # listes des trigrammes mises bout a bout : une cle (ligne, description) par trigramme commun
+        decalage = np.cumsum(longueurs) - longueurs
+        positions = np.repeat(self.debuts[trigrammes] - decalage, longueurs) + np.arange(longueurs.sum())
+        cles, communs = _distinctes(np.repeat(lignes, longueurs) * self.taille + self.docs[positions])
+        q, d = cles // self.taille, cles % self.taille
+        # par ligne, les descriptions aux plus nombreux trigrammes communs : deux tris stables sur de petits
+        # entiers (tri par base), les cles etant deja triees par (ligne, description)
+        ordre = np.argsort((RARES - communs).astype(np.int8), kind="stable")
+        ordre = ordre[np.argsort(q[ordre].astype(np.int16), kind="stable")]
+        q, d = q[ordre], d[ordre]
+        garde = _rangs(q) < CANDIDATS
+        return q[garde], d[garde]
+
+    def _communs(self, q, d, debuts, trigrammes):
+        """Trigrammes communs (tous, frequents compris) de chaque paire (libelle q, description d)"""
+        nb = debuts[q + 1] - debuts[q]
+        paires = np.repeat(np.arange(len(q)), nb)
+        positions = np.repeat(debuts[q] - (np.cumsum(nb) - nb), nb) + np.arange(nb.sum())
+        cles = d[paires] * NB_TRIGRAMMES + trigrammes[positions]
+        trouves = self.cles[np.minimum(np.searchsorted(self.cles, cles), len(self.cles) - 1)] == cles
+        return np.bincount(paires, weights=trouves, minlength=len(q))
+
+    def chercher(self, libelles):
+        """Description la plus proche de chaque libelle et coefficient de Dice (-1 et 0 si aucune)"""
+        meilleur, score = np.full(len(libelles), -1), np.zeros(len(libelles))
+        if not len(self.cles):
+            return meilleur, score
+        lignes, trigrammes = _trigrammes(libelles)
+        debuts = np.searchsorted(lignes, np.arange(len(libelles) + 1))
+        # CANDIDATS : par les RARES trigrammes indexes les moins frequents de chaque libelle
+        frequence = self.debuts[trigrammes + 1] - self.debuts[trigrammes]
+        ordre = np.argsort(lignes * (self.taille + 2) + np.where(frequence > 0, frequence, self.taille + 1))
+        rares = ordre[(_rangs(lignes[ordre]) < RARES) & (frequence[ordre] > 0)]
+        blocs = np.arange(0, len(libelles) + BLOC, BLOC)
+        coupes = np.searchsorted(lignes[rares], blocs)
+        for premiere, debut, fin in zip(blocs, coupes[:-1], coupes[1:]):
+            if debut == fin:
+                continue
+            q, d = self._candidats(lignes[rares[debut:fin]] - premiere, trigrammes[rares[debut:fin]])
+            q += premiere
+            # SCORE : Dice sur tous les trigrammes, la meilleure description de chaque libelle
+            dice = 2 * self._communs(q, d, debuts, trigrammes) / (debuts[q + 1] - debuts[q] + self.nb[d])
+            ordre = np.argsort(-dice, kind="stable")
+            ordre = ordre[np.argsort(q[ordre], kind="stable")]
+            premiers = ordre[_rangs(q[ordre]) == 0]
+            meilleur[q[premiers]], score[q[premiers]] = d[premiers], dice[premiers]
+        return meilleur, score
+
+
+def rapprocher_burintel(dashboard, burintel_stock, config=None):
+    """CODE_BURINTEL, STOCK_BURINTEL, RAPPROCHEMENT (CODE / LIBELLE) et CONFIANCE_BURINTEL de chaque article"""
+    config = config or Config()
+    n = len(dashboard)
+    stock_code = stock_burintel_par_code(burintel_stock)
+    index_codes = pd.Index(stock_code.index)
+
+    # CODE (jointure par hachage)
+    positions = np.full(n, -1)
+    if len(index_codes) and "Code Burintel" in dashboard.columns:
+        positions = index_codes.get_indexer(codes_burintel(dashboard["Code Burintel"]))
+    methode = np.where(positions >= 0, 1, 0)
+    confiance = np.where(positions >= 0, 1.0, 0.0)
+
+    # LIBELLE (articles sans code reconnu, codes Burintel encore libres)
+    requetes = np.flatnonzero(positions < 0)
+    libres = np.ones(len(index_codes), dtype=bool)
+    libres[positions[positions >= 0]] = False
+    libres = np.flatnonzero(libres)
+    if len(requetes) and len(libres) and "Libelle EP" in dashboard.columns:
+        descriptions = burintel_stock["Description"].groupby(codes_burintel(burintel_stock["N°"])).first()
+        descriptions = descriptions.reindex(index_codes)
+        index = IndexTrigrammes(normaliser_libelles(descriptions.to_numpy()[libres]))
+        trouve, score = index.chercher(normaliser_libelles(dashboard["Libelle EP"].to_numpy()[requetes]))
+        ok = (trouve >= 0) & (score >= config.seuil_rapprochement)
+        q, d, s = requetes[ok], libres[trouve[ok]], score[ok]
+        # un code pour un seul article : le plus ressemblant
+        ordre = np.lexsort((q, -s))
+        _, premiers = np.unique(d[ordre], return_index=True)
+        garde = ordre[premiers]
+        positions[q[garde]], methode[q[garde]], confiance[q[garde]] = d[garde], 2, s[garde]
+
+    # position -1 (aucun rapprochement) : derniere valeur ajoutee, vide
+    return pd.DataFrame({
+        "CODE_BURINTEL": np.append(index_codes.to_numpy(dtype=object), "")[positions],
+        "STOCK_BURINTEL": np.append(stock_code.to_numpy(dtype=float), 0.0)[positions],
+        "RAPPROCHEMENT": METHODES[methode],
+        "CONFIANCE_BURINTEL": confiance.round(3),
+    }, index=dashboard.index)
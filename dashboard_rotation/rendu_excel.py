@@ -0,0 +1,185 @@
+"""Rendu du classeur Excel : DASHBOARD, SUIVI, TOP CA, classements, COMMANDES, SENSIBILITE, VARIATIONS et ANOMALIES avec emojis et couleurs (openpyxl ou xlsxwriter).
+
+Libelles, styles et positions viennent du modele de rendu (modele_rendu) ; les moteurs l'ecrivent en une passe.
+openpyxl et xlsxwriter ne sont importes qu'au moment de l'ecriture.
+"""
+from copy import copy
+
+import numpy as np
+import pandas as pd
+
+from .classements import calculer_classements
+from .compact import texte_ean
+from .config import Config
+from .indicateurs import calculer_kpi, generer_recommandations, guide_lecture
+from .instrumentation import etape
+from .modele_rendu import STYLES, fusionner, modele_classeur
+
+
+def _styles_openpyxl(proprietes):
+    """Attributs openpyxl (fill, font, alignment, border) d'une cellule"""
+    from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
+
+    attributs = {}
+    if "fond" in proprietes:
+        attributs["fill"] = PatternFill(start_color=proprietes["fond"], end_color=proprietes["fond"], fill_type="solid")
+    if any(k in proprietes for k in ("couleur", "gras", "taille")):
+        attributs["font"] = Font(color=proprietes.get("couleur"), bold=proprietes.get("gras", False),
+                                 size=proprietes.get("taille"))
+    if any(k in proprietes for k in ("horizontal", "vertical", "retour")):
+        attributs["alignment"] = Alignment(horizontal=proprietes.get("horizontal"), vertical=proprietes.get("vertical"),
+                                           wrap_text=proprietes.get("retour"))
+    if proprietes.get("bordure"):
+        cote = Side(style="thin")
+        attributs["border"] = Border(left=cote, right=cote, top=cote, bottom=cote)
+    return attributs
+
+
+def exporter_openpyxl(fichier, feuilles):
+    """Ecrit le modele avec openpyxl en mode write_only : chaque ligne est ajoutee une fois, deja stylee"""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    styles = {}
+    for feuille in feuilles:
+        with etape(f"ecriture {feuille.cle}", feuille.nb_lignes):
+            ws = wb.create_sheet(feuille.nom)
+            for col, largeur in enumerate(feuille.largeurs, start=1):
+                ws.column_dimensions[get_column_letter(col)].width = largeur
+            suivante = 0
+            for row, cellules in feuille.lignes():
+                for _ in range(row - suivante):
+                    ws.append([])
+                ligne = []
+                for valeur, classes in cellules:
+                    cell = WriteOnlyCell(ws, value=valeur)
+                    if classes in styles:
+                        # meme copie d'indices de style que openpyxl (copy_worksheet) : pas de rehachage
+                        cell._style = copy(styles[classes])
+                    else:
+                        for attribut, style in _styles_openpyxl(fusionner(classes)).items():
+                            setattr(cell, attribut, style)
+                        styles[classes] = copy(cell._style)
+                    ligne.append(cell)
+                ws.append(ligne)
+                suivante = row + 1
+    with etape("sauvegarde"):
+        wb.save(fichier)
+
+
+def _ecrire_cellule(ws, row, col, valeur, fmt=None):
+    """Ecriture xlsxwriter typee (texte jamais interprete comme formule, NaN -> vide)"""
+    if isinstance(valeur, str) and valeur:
+        ws.write_string(row, col, valeur, fmt)
+    elif valeur is None or valeur == "" or (isinstance(valeur, float) and valeur != valeur):
+        if fmt is not None:
+            ws.write_blank(row, col, None, fmt)
+    elif isinstance(valeur, (int, float, np.integer, np.floating)):
+        ws.write_number(row, col, valeur, fmt)
+    else:
+        ws.write(row, col, valeur, fmt)
+
+
+def _format_xlsxwriter(proprietes):
+    """Proprietes d'un format xlsxwriter"""
+    correspondances = {"fond": "bg_color", "couleur": "font_color", "gras": "bold", "taille": "font_size",
+                       "horizontal": "align", "vertical": "valign", "retour": "text_wrap", "bordure": "border"}
+    props = {correspondances[k]: v for k, v in proprietes.items()}
+    for cle in ("bg_color", "font_color"):
+        if cle in props:
+            props[cle] = "#" + props[cle]
+    if props.get("valign") == "center":
+        props["valign"] = "vcenter"
+    if "border" in props:
+        props["border"] = 1
+    return props
+
+
+def exporter_xlsxwriter(fichier, feuilles):
+    """Ecrit le modele avec xlsxwriter en mode constant_memory.
+
+    Les lignes sont ecrites une seule fois, dans l'ordre, avec un format partage par combinaison de classes.
+    Les blocs a conditions (SUIVI) gardent leurs couleurs STATUS et leur fond alterne en mise en forme
+    conditionnelle de la feuille, pas en format par cellule.
+    """
+    import xlsxwriter
+
+    wb = xlsxwriter.Workbook(fichier, {"constant_memory": True})
+    formats, conditionnels = {(): None}, {}
+    for feuille in feuilles:
+        with etape(f"ecriture {feuille.cle}", feuille.nb_lignes):
+            ws = wb.add_worksheet(feuille.nom)
+            for col, largeur in enumerate(feuille.largeurs):
+                ws.set_column(col, col, largeur)
+            for row, cellules in feuille.lignes(conditionnel=True):
+                for col, (valeur, classes) in enumerate(cellules):
+                    if classes not in formats:
+                        formats[classes] = wb.add_format(_format_xlsxwriter(fusionner(classes)))
+                    _ecrire_cellule(ws, row, col, valeur, formats[classes])
+            for ligne, col, derniere_ligne, derniere_col, (critere, valeur), classe in feuille.regles():
+                if classe not in conditionnels:
+                    # une regle conditionnelle ne change que fond et police
+                    proprietes = {k: v for k, v in STYLES[classe].items() if k in ("fond", "couleur", "gras")}
+                    conditionnels[classe] = wb.add_format(_format_xlsxwriter(proprietes))
+                if critere == "contient":
+                    options = {"type": "text", "criteria": "containing", "value": valeur}
+                else:
+                    options = {"type": "formula", "criteria": f"=MOD(ROW(),2)={valeur}"}
+                ws.conditional_format(ligne, col, derniere_ligne, derniere_col,
+                                      dict(options, format=conditionnels[classe]))
+
+    with etape("sauvegarde"):
+        wb.close()
+
+
+def preparer_export(dashboard, metriques, recommandations=None, config=None):
+    """Blocs a ecrire : (df_kpi, top_ca, df_reco, df_guide, dashboard_export)"""
+    kpi_data = calculer_kpi(metriques)
+    top_ca = metriques.top_ca
+    if recommandations is None:
+        recommandations = generer_recommandations(metriques, config)
+
+    df_kpi = pd.DataFrame(list(kpi_data.items()), columns=["INDICATEURS CLES", "Valeur"])
+    df_reco = pd.DataFrame(recommandations, columns=["RECOMMANDATIONS & ACTIONS", "Details"])
+    df_guide = pd.DataFrame(guide_lecture(config), columns=["GUIDE DE LECTURE", "Explication"])
+    
+    cols_final = ["MARQUE", "EAN", "LIBELLE", "P.VENTE", "STOCK_EP", "BURINTEL_DEPOT", 
+                  "VENTES_HEBDO", "CA_HEBDO", "ROTATION", "COUVERTURE", "STATUS", "DEMANDE_HEBDO", "TENDANCE",
+                  "STOCK_BURINTEL", "CONFIANCE_BURINTEL"]
+    disp_cols = [c for c in cols_final if c in dashboard.columns]
+    dashboard_export = dashboard[disp_cols].sort_values("CA_HEBDO", ascending=False).copy()
+    if "EAN" in dashboard_export.columns:
+        dashboard_export["EAN"] = texte_ean(dashboard_export["EAN"])
+    return df_kpi, top_ca, df_reco, df_guide, dashboard_export
+
+
+def exporter_dashboard(fichier, dashboard, metriques, moteur=None, config=None, variations=None, commandes=None,
+                       anomalies=None, sensibilite=None):
+    """Recommandations + blocs, modele de rendu, puis ecriture du classeur en une passe
+    (COMMANDES, SENSIBILITE, VARIATIONS, ANOMALIES si fournies)"""
+    config = config or Config()
+    week_num = metriques.week_num
+    moteur = moteur or config.moteur_excel
+    kpi_data = calculer_kpi(metriques)
+    with etape("recommandations", metriques.nb_articles):
+        recommandations = generer_recommandations(metriques, config)
+    with etape("preparation export", len(dashboard)):
+        df_kpi, top_ca, df_reco, df_guide, dashboard_export = preparer_export(dashboard, metriques, recommandations, config)
+    
+    classements = None
+    if config.classement_top_n:
+        with etape("classements", len(dashboard)):
+            classements = calculer_classements(dashboard, config)
+    
+    with etape("modele de rendu", len(dashboard_export)):
+        feuilles = modele_classeur(df_kpi, top_ca, df_reco, df_guide, dashboard_export, week_num, classements,
+                                   variations, commandes, anomalies, sensibilite)
+
+    with etape(f"export {moteur}", len(dashboard_export)):
+        if moteur == "xlsxwriter":
+            exporter_xlsxwriter(fichier, feuilles)
+        else:
+            exporter_openpyxl(fichier, feuilles)
+    return kpi_data
@@ -0,0 +1,94 @@
+"""Schemas des fichiers sources : colonnes lues, alias des exports et types, resolus sur la seule ligne d'entete."""
+from dataclasses import dataclass, replace
+
+import pandas as pd
+
+from .compact import texte_code
+
+
+@dataclass(frozen=True)
+class Colonne:
+    """Colonne canonique : nom dans le modele, autres intitules acceptes (par priorite), type"""
+    nom: str
+    alias: tuple = ()
+    type: str = None        # "texte", "nombre", "code" (texte canonique, 12345.0 -> '12345') ou None (tel que lu)
+
+
+@dataclass(frozen=True)
+class Schema:
+    """Colonnes utiles d'un type de fichier et feuille a lire"""
+    type_fichier: str
+    feuille: object
+    colonnes: tuple
+
+    def resoudre(self, entete):
+        """{nom canonique: intitule du fichier} : pour chaque colonne, le premier intitule present.
+
+        Un meme intitule peut alimenter deux colonnes (Code Burintel, a defaut de MARQUE).
+        """
+        presents = {}
+        for brut in entete:
+            presents.setdefault(str(brut).strip(), brut)
+        correspondance = {}
+        for colonne in self.colonnes:
+            for intitule in (colonne.nom,) + colonne.alias:
+                if intitule in presents:
+                    correspondance[colonne.nom] = presents[intitule]
+                    break
+        return correspondance
+
+    def appliquer(self, df):
+        """Colonnes du schema sous leur nom canonique, typees"""
+        return self.typer(pd.DataFrame({nom: df[brut] for nom, brut in self.resoudre(df.columns).items()}, index=df.index))
+
+    def typer(self, df):
+        """Colonnes dans l'ordre du schema, nombres convertis (vides et textes -> NaN), textes et codes en str"""
+        df = df[[c.nom for c in self.colonnes if c.nom in df.columns]]
+        for colonne in self.colonnes:
+            if colonne.nom not in df.columns or colonne.type is None:
+                continue
+            serie = df[colonne.nom]
+            if colonne.type == "nombre" and not pd.api.types.is_numeric_dtype(serie.dtype):
+                df[colonne.nom] = pd.to_numeric(serie, errors="coerce")
+            elif colonne.type == "texte" and (pd.api.types.is_object_dtype(serie.dtype)
+                                              or not pd.api.types.is_string_dtype(serie.dtype)):
+                df[colonne.nom] = serie.astype(object).where(serie.isna(), serie.astype(str))
+            elif colonne.type == "code":
+                df[colonne.nom] = texte_code(serie).where(serie.notna())
+        return df
+
+    def restreint(self, noms):
+        """Meme schema limite aux colonnes `noms`"""
+        return replace(self, colonnes=tuple(c for c in self.colonnes if c.nom in noms))
+
+    def signature(self):
+        """Texte stable du schema (entre dans la cle du cache des feuilles)"""
+        return repr((self.feuille, self.colonnes))
+
+
+_ARTICLE = (
+    Colonne("EAN"),
+    Colonne("MARQUE", ("Code Burintel",), "texte"),
+    Colonne("Libelle EP", ("Libellé article",), "texte"),
+    Colonne("Stock EP", ("Quantité",), "nombre"),
+    Colonne("P.Vente", type="nombre"),
+    Colonne("P.Achat", type="nombre"),
+    Colonne("BURINTEL DEPOT", type="nombre"),
+    Colonne("Code Burintel", type="code"),
+)
+
+SCHEMAS = {
+    "recap": Schema("recap", 0, _ARTICLE),
+    "stock": Schema("stock", "Stock", _ARTICLE + (Colonne("Enseigne", type="texte"),)),
+    "ventes": Schema("ventes", "Ventes hebdomadaires", (
+        Colonne("EAN"),
+        Colonne("Libellé Enseigne", ("Enseigne",), "texte"),
+        Colonne("Début semaine"),
+        Colonne("Quantité", type="nombre"),
+    )),
+    "burintel": Schema("burintel", 0, (
+        Colonne("N°", type="code"),
+        Colonne("Description", type="texte"),
+        Colonne("Stock Burintel", type="nombre"),
+    )),
+}
@@ -0,0 +1,85 @@
+"""Sensibilite des STATUS aux seuils : toutes les combinaisons des grilles evaluees en une passe sur le dashboard.
+
+Les regles des STATUS sont monotones en COUVERTURE : pour chaque seuil de stock mort m, seuil de couverture t
+(union des grilles URGENT et A COMMANDE) et seuil de rotation b, un produit d'Einstein donne les sommes
+(articles, CA, valeur du stock) des articles vivants de couverture >= t et de rotation > b. Chaque combinaison
+(urgent, commande, blockbuster, stock mort) s'en deduit par differences, sans recalculer le dashboard.
+"""
+import numpy as np
+import pandas as pd
+
+from .config import Config
+
+FACTEURS_GRILLE = [0.5, 0.75, 1, 1.25, 1.5]     # grille par defaut : multiples du seuil de la config
+BLOC = 16384                                    # articles par bloc (memoire des produits bornee)
+SEUILS = ["SEUIL_URGENT", "SEUIL_COMMANDE", "SEUIL_BLOCKBUSTER", "SEUIL_STOCK_MORT"]
+
+
+def grilles(config):
+    """Valeurs essayees pour chaque seuil (config.grille_*, sinon FACTEURS_GRILLE x seuil de la config)"""
+    valeurs = {}
+    for nom, grille, seuil in [("urgent", config.grille_urgent, config.seuil_urgent),
+                               ("commande", config.grille_commande, config.seuil_commande),
+                               ("blockbuster", config.grille_blockbuster, config.seuil_blockbuster),
+                               ("stock_mort", config.grille_stock_mort, config.seuil_stock_mort)]:
+        grille = grille if grille is not None else [round(seuil * f, 2) for f in FACTEURS_GRILLE]
+        valeurs[nom] = np.unique(np.asarray(grille, dtype=float))
+    return valeurs
+
+
+def calculer_sensibilite(dashboard, config=None):
+    """Une ligne par combinaison de seuils : nombre d'articles par STATUS, valeur immobilisee, CA urgent"""
+    config = config or Config()
+    g = grilles(config)
+    urgent, commande, blockbuster, stock_mort = g["urgent"], g["commande"], g["blockbuster"], g["stock_mort"]
+    demande = dashboard["DEMANDE_HEBDO"] if "DEMANDE_HEBDO" in dashboard.columns else dashboard["VENTES_HEBDO"]
+    demande = demande.to_numpy(dtype=float)
+    stock = dashboard["STOCK_EP"].to_numpy(dtype=float)
+    couverture = dashboard["COUVERTURE"].to_numpy(dtype=float)
+    rotation = dashboard["ROTATION"].to_numpy(dtype=float)
+    # poids sommes : articles, CA de la semaine, valeur du stock au prix d'achat
+    poids = np.stack([np.ones(len(dashboard)), dashboard["CA_HEBDO"].to_numpy(dtype=float),
+                      stock * dashboard["P.ACHAT"].to_numpy(dtype=float)])
+    seuils = np.unique(np.concatenate([urgent, commande]))
+
+    morts = np.zeros((3, len(stock_mort)))
+    au_dessus = np.zeros((3, len(stock_mort), len(seuils)))                       # couverture >= t
+    actifs = np.zeros((3, len(stock_mort), len(seuils), len(blockbuster)))        # ... et rotation > b
+    for debut in range(0, len(dashboard), BLOC):
+        s = slice(debut, debut + BLOC)
+        mort = ((demande[s] == 0) & (stock[s] > stock_mort[:, None])).astype(float)
+        ge = (couverture[s] >= seuils[:, None]).astype(float)
+        gt = (rotation[s] > blockbuster[:, None]).astype(float)
+        w = poids[:, s]
+        morts += w @ mort.T
+        au_dessus += np.einsum("ki,mi,ti->kmt", w, 1 - mort, ge, optimize=True)
+        actifs += np.einsum("ki,mi,ti,bi->kmtb", w, 1 - mort, ge, gt, optimize=True)
+
+    # COMBINAISONS : axes (urgent, commande, blockbuster, stock mort)
+    iu = np.searchsorted(seuils, urgent)
+    imax = np.searchsorted(seuils, np.maximum.outer(urgent, commande))
+    total = poids.sum(axis=1)[:, None, None, None, None]
+    mort = morts[:, None, None, None, :]
+    vivants_u = au_dessus[:, :, iu].transpose(0, 2, 1)[:, :, None, None, :]
+    vivants_max = au_dessus[:, :, imax].transpose(0, 2, 3, 1)[:, :, :, None, :]
+    nb_urgent = total - mort - vivants_u
+    nb_commande = vivants_u - vivants_max
+    nb_blockbuster = actifs[:, :, imax].transpose(0, 2, 3, 4, 1)
+    nb_stable = total - mort - nb_urgent - nb_commande - nb_blockbuster
+    forme = (len(urgent), len(commande), len(blockbuster), len(stock_mort))
+
+    def plat(valeurs):
+        return np.broadcast_to(valeurs, forme).ravel()
+
+    axes = np.meshgrid(urgent, commande, blockbuster, stock_mort, indexing="ij")
+    table = pd.DataFrame({nom: a.ravel() for nom, a in zip(SEUILS, axes)})
+    for nom, valeurs in [("URGENT", nb_urgent), ("A COMMANDE", nb_commande), ("BLOCKBUSTER", nb_blockbuster),
+                         ("STOCK MORT", mort), ("STABLE", nb_stable)]:
+        table[f"NB_{nom.replace(' ', '_')}"] = np.rint(plat(valeurs[0])).astype(np.int64)
+    table["VALEUR_IMMOBILISEE"] = plat(mort[2])
+    table["CA_URGENT"] = plat(nb_urgent[1])
+    table["CA_A_COMMANDE"] = plat(nb_commande[1])
+    actuel = np.logical_and.reduce([table[nom].to_numpy() == valeur for nom, valeur in zip(SEUILS, (
+        config.seuil_urgent, config.seuil_commande, config.seuil_blockbuster, config.seuil_stock_mort))])
+    table["REGLAGE"] = np.where(actuel, "ACTUEL", "")
+    return table
@@ -0,0 +1,205 @@
+"""Serveur local de consultation : STATUS, couverture et stock d'EAN, KPI et recommandations en JSON, sans classeur.
+
+Le dashboard de chaque (enseigne, semaine) demande est calcule une fois (build_dashboard) puis garde en memoire
+avec un index EAN, dans un cache LRU. Les sources deja lues restent en memoire (MemoireSources) : apres un nouvel
+export dans le dossier de donnees, seul le fichier modifie est relu. Ecoute sur 127.0.0.1 uniquement.
+
+    GET /kpi                       indicateurs et libelles du bloc KPI
+    GET /ean/6111234567890,...     lignes du SUIVI de ces EAN
+    GET /status/URGENT?limite=50   articles d'un STATUS, par CA decroissant
+    GET /top?n=10&par=COUVERTURE&ordre=asc
+    GET /recommandations
+    GET /semaines                  (enseigne, semaine) en cache
+
+Parametres communs : enseigne=..., semaine=JJ/MM/AAAA ou W12 (par defaut ceux de la config).
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import numpy as np
+import pandas as pd
+
+from .compact import cle_ean, texte_ean
+from .config import Config
+from .export_donnees import tables_donnees
+from .pipeline import MemoireSources, build_dashboard
+from .surveillance import etat_dossier
+
+HOTE = "127.0.0.1"
+ROUTES = ["/kpi", "/ean/<ean>[,<ean>...]", "/status/<STATUS>", "/top?n=10&par=CA_HEBDO", "/recommandations", "/semaines"]
+INTERVALLE_RELEVE = 1       # secondes minimum entre deux releves du dossier de donnees
+
+
+@dataclass
+class VueDashboard:
+    """Dashboard d'une (enseigne, semaine) au schema des exports de donnees, indexe par EAN et STATUS"""
+    suivi: pd.DataFrame
+    reco: pd.DataFrame
+    kpi: dict
+    index_ean: pd.Index = None
+    par_status: dict = None
+    tris: dict = field(default_factory=dict)    # (colonne, croissant) -> positions triees
+
+    def __post_init__(self):
+        self.index_ean = pd.Index(self.suivi["EAN"])
+        self.par_status = {s: np.asarray(p) for s, p in self.suivi.groupby("STATUS", sort=False).indices.items()}
+
+    def lignes(self, positions):
+        return self.suivi.iloc[positions].to_dict("records")
+
+    def ean(self, codes):
+        """Lignes des EAN demandes (texte ou nombre, 6.111E+12 compris) : ({ean: ligne}, EAN inconnus)"""
+        cles = texte_ean(cle_ean(pd.Series(codes, dtype=object)))
+        positions = self.index_ean.get_indexer(cles.to_numpy())
+        trouves = {cle: self.suivi.iloc[p].to_dict() for cle, p in zip(cles, positions) if p >= 0}
+        return trouves, [code for code, p in zip(codes, positions) if p < 0]
+
+    def status(self, status, limite=None):
+        positions = self.par_status.get(status.upper(), np.zeros(0, dtype=np.int64))
+        return self.lignes(positions[:limite])
+
+    def top(self, n, par="CA_HEBDO", croissant=False):
+        if (par, croissant) not in self.tris:
+            valeurs = self.suivi[par].to_numpy()
+            ordre = np.argsort(valeurs if croissant else -valeurs, kind="stable")
+            self.tris[(par, croissant)] = ordre
+        return self.lignes(self.tris[(par, croissant)][:n])
+
+
+class DashboardsEnMemoire:
+    """Cache LRU (enseigne, semaine) -> VueDashboard, vide des que le dossier de donnees change"""
+
+    def __init__(self, config, taille=None):
+        self.config = config
+        self.taille = taille or config.serveur_cache
+        self.memoire = MemoireSources()
+        self.vues = OrderedDict()
+        self.verrou = threading.Lock()
+        self.etat = None
+        self.releve = 0
+
+    def _verifier_sources(self):
+        """Releve du dossier (au plus une fois par INTERVALLE_RELEVE) : cache vide si un export a change"""
+        if time.monotonic() - self.releve < INTERVALLE_RELEVE:
+            return
+        self.releve = time.monotonic()
+        etat = etat_dossier(self.config.dossier_data)
+        if etat != self.etat:
+            if self.etat is not None:
+                print(f"{time.strftime('%H:%M:%S')} - sources modifiees -> {len(self.vues)} dashboards a recalculer")
+            self.vues.clear()
+            self.etat = etat
+
+    def vue(self, enseigne=None, semaine=None):
+        """VueDashboard de l'enseigne et de la semaine (None : celles de la config), calculee au premier appel"""
+        cle = (enseigne or self.config.enseigne, semaine or self.config.semaine)
+        with self.verrou:
+            self._verifier_sources()
+            if cle in self.vues:
+                self.vues.move_to_end(cle)
+                return self.vues[cle]
+            config = replace(self.config, enseigne=cle[0], semaine=cle[1])
+            resultat = build_dashboard(config=config, memoire=self.memoire)
+            suivi, _, reco, kpi = tables_donnees(resultat.dashboard, resultat.metriques, resultat.enseigne,
+                                                 resultat.date_semaine, config=config)
+            self.vues[cle] = VueDashboard(suivi, reco, kpi)
+            while len(self.vues) > self.taille:
+                self.vues.popitem(last=False)
+            return self.vues[cle]
+
+
+def _entier(params, nom, defaut=None):
+    valeur = params.get(nom, [None])[0]
+    return int(valeur) if valeur not in (None, "") else defaut
+
+
+def repondre(dashboards, chemin, params):
+    """(code HTTP, contenu JSON) d'une requete GET"""
+    morceaux = [unquote(m) for m in chemin.strip("/").split("/") if m]
+    if not morceaux:
+        return 200, {"routes": ROUTES}
+    route, argument = morceaux[0], "/".join(morceaux[1:])
+    if not any(r.split("?")[0].split("/")[1] == route for r in ROUTES):
+        return 404, {"erreur": f"route inconnue : /{route}", "routes": ROUTES}
+    if route == "semaines":
+        return 200, {"semaines": [{"enseigne": e, "semaine": s} for e, s in dashboards.vues]}
+
+    vue = dashboards.vue(params.get("enseigne", [None])[0], params.get("semaine", [None])[0])
+    if route == "kpi":
+        return 200, vue.kpi
+    if route == "recommandations":
+        return 200, {"recommandations": vue.reco.to_dict("records")}
+    if route == "ean":
+        trouves, inconnus = vue.ean([c for c in (argument or params.get("ean", [""])[0]).split(",") if c.strip()])
+        return (200 if trouves else 404), {"articles": trouves, "inconnus": inconnus}
+    if route == "status":
+        return 200, {"status": argument.upper(), "articles": vue.status(argument, _entier(params, "limite"))}
+    if route == "top":
+        par = params.get("par", ["CA_HEBDO"])[0]
+        if par not in vue.suivi.columns or not pd.api.types.is_numeric_dtype(vue.suivi[par]):
+            return 400, {"erreur": f"colonne de tri inconnue ou non numerique : {par}"}
+        croissant = params.get("ordre", ["desc"])[0] == "asc"
+        return 200, {"par": par, "articles": vue.top(_entier(params, "n", 10), par, croissant)}
+
+
+def _json(valeur):
+    """Types NumPy / pandas restes dans les lignes"""
+    if isinstance(valeur, pd.Timestamp):
+        return valeur.strftime("%Y-%m-%d")
+    if isinstance(valeur, np.generic):
+        return valeur.item()
+    return str(valeur)
+
+
+def creer_serveur(config=None, port=None):
+    """Serveur HTTP sur 127.0.0.1:port (0 = port libre), pret a servir (serve_forever)"""
+    config = config or Config()
+    dashboards = DashboardsEnMemoire(config)
+
+    class Requetes(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            debut = time.perf_counter()
+            try:
+                code, contenu = repondre(dashboards, url.path, parse_qs(url.query))
+            except ValueError as e:
+                code, contenu = 404, {"erreur": str(e)}
+            except Exception as e:
+                code, contenu = 500, {"erreur": f"{type(e).__name__}: {e}"}
+            corps = json.dumps(contenu, ensure_ascii=False, default=_json).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(corps)))
+            self.end_headers()
+            self.wfile.write(corps)
+            print(f"{time.strftime('%H:%M:%S')} GET {self.path} -> {code} ({(time.perf_counter() - debut) * 1000:.1f} ms)")
+
+        def log_message(self, *args):
+            pass
+
+    serveur = ThreadingHTTPServer((HOTE, config.serveur_port if port is None else port), Requetes)
+    serveur.dashboards = dashboards
+    return serveur
+
+
+def servir(config=None):
+    """Lance le serveur local jusqu'a Ctrl+C (dashboard de la config calcule des le demarrage)"""
+    config = config or Config()
+    serveur = creer_serveur(config)
+    hote, port = serveur.server_address[:2]
+    try:
+        serveur.dashboards.vue()
+    except ValueError as e:
+        print(f"{e} -> dashboard calcule a la premiere requete")
+    print(f"\nSERVEUR sur http://{hote}:{port}/ (kpi, ean, status, top, recommandations ; Ctrl+C pour arreter)")
+    try:
+        serveur.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServeur arrete")
+    finally:
+        serveur.server_close()
@@ -0,0 +1,85 @@
+"""Surveillance du dossier de donnees : le dashboard est regenere des qu'un nouvel export y est depose.
+
+Les sources deja lues restent en memoire (MemoireSources) : seul le fichier modifie
+est relu et seules les etapes qui en dependent sont recalculees.
+"""
+import os
+import time
+
+from . import instrumentation
+from .config import Config
+from .pipeline import MemoireSources, build_dashboard, render_dashboard
+
+# sorties rendues dans le classeur : chacune est le meme objet tant que ses entrees n'ont pas change (MemoireSources.derive)
+SORTIES_RENDUES = ("dashboard", "variations", "commandes", "anomalies", "sensibilite")
+
+
+def etat_dossier(dossier):
+    """{nom: (taille, mtime)} des classeurs du dossier (fichiers verrous ~$ ignores)"""
+    etat = {}
+    try:
+        entrees = list(os.scandir(dossier))
+    except OSError:
+        return etat
+    for e in entrees:
+        if e.is_file() and e.name.lower().endswith(".xlsx") and not e.name.startswith("~$"):
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            etat[e.name] = (st.st_size, st.st_mtime_ns)
+    return etat
+
+
+def regenerer(memoire, config, precedent=None):
+    """Un passage : recalcule ce qui a change et reecrit le classeur si une de ses feuilles a change"""
+    debut = time.perf_counter()
+    resultat = build_dashboard(config=config, memoire=memoire)
+    if precedent is not None and all(getattr(resultat, nom) is getattr(precedent, nom) for nom in SORTIES_RENDUES):
+        print(f"\nDashboard inchange ({time.perf_counter() - debut:.1f}s)")
+        return resultat
+    fichier = render_dashboard(resultat, config)
+    if fichier is None:
+        print(f"\nAucun format d'export -> aucun fichier ecrit ({time.perf_counter() - debut:.1f}s)")
+    else:
+        print(f"\nMis a jour: {os.path.basename(fichier)} ({time.perf_counter() - debut:.1f}s)")
+    return resultat
+
+
+def surveiller(config=None, intervalle=None, max_passages=None):
+    """Scrute config.dossier_data toutes les `intervalle` secondes et regenere apres chaque depot (Ctrl+C pour arreter).
+
+    Un changement n'est traite qu'une fois le dossier stable sur deux releves,
+    pour ne pas lire un export en cours de copie.
+    """
+    config = config or Config()
+    intervalle = intervalle or config.intervalle_surveillance
+    memoire = MemoireSources()
+    resultat = None
+    traite = None
+    dernier_releve = etat_dossier(config.dossier_data)
+    passages = 0
+
+    print(f"\nSURVEILLANCE de {config.dossier_data} (toutes les {intervalle:g}s, Ctrl+C pour arreter)")
+    try:
+        while max_passages is None or passages < max_passages:
+            releve = etat_dossier(config.dossier_data)
+            if releve != traite and releve == dernier_releve:
+                print(f"\n{'='*80}")
+                print(f"{time.strftime('%H:%M:%S')} - changement detecte dans {config.dossier_data}")
+                print(f"{'='*80}")
+                try:
+                    resultat = regenerer(memoire, config, resultat)
+                except ValueError as e:
+                    print(f"{e} -> en attente du prochain export")
+                except Exception as e:
+                    print(f"Erreur: {e} -> en attente du prochain export")
+                instrumentation.rapport(config.dossier_sortie, config.fichier_trace)
+                traite = releve
+                passages += 1
+            dernier_releve = releve
+            if max_passages is None or passages < max_passages:
+                time.sleep(intervalle)
+    except KeyboardInterrupt:
+        print("\nSurveillance arretee")
+    return resultat
@@ -0,0 +1,138 @@
+"""Controle des sources avant la fusion RECAP + ventes : cles EAN, couverture, conversions et plages de valeurs.
+
+Tous les controles sont vectorises. Les controles de cle (EAN invalides, doublons du RECAP, taille de la fusion)
+passent toujours ; les autres s'arretent des que le budget de temps (config.validation_budget) est depasse.
+Les ventes sont controlees cumulees par EAN, telles qu'elles entrent dans la fusion : un export a une ligne
+par magasin n'a pas d'EAN en double.
+"""
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .compact import texte_ean
+from .config import Config
+
+POLITIQUES = ("premier", "rejeter", "garder")
+FACTEUR_FUSION_MAX = 2      # fusion refusee au dela de 2 lignes par article du RECAP (politique "garder")
+EXEMPLES = 50               # lignes detaillees par controle dans la feuille ANOMALIES
+COLONNES_NUMERIQUES = ["P.Vente", "P.Achat", "Stock EP", "BURINTEL DEPOT"]
+ACTIONS_DOUBLONS = {"premier": "premiere ligne gardee", "rejeter": "toutes les lignes ecartees",
+                    "garder": "conservees (lignes multipliees par la fusion)"}
+
+
+@dataclass
+class Anomalies:
+    """Resultat des controles : synthese (CONTROLE, SOURCE, LIGNES, ACTION) et lignes concernees"""
+    synthese: pd.DataFrame
+    lignes: pd.DataFrame
+
+    @property
+    def vide(self):
+        return self.synthese.empty
+
+
+class _Rapport:
+    """Anomalies relevees au fil des controles"""
+
+    def __init__(self):
+        self.synthese = []
+        self.lignes = []
+
+    def ajouter(self, controle, source, df, masque, action, valeur=None):
+        nb = int(np.count_nonzero(masque))
+        if not nb:
+            return
+        self.synthese.append((controle, source, nb, action))
+        exemples = df[masque].head(EXEMPLES)
+        libelles = exemples["Libelle EP"] if "Libelle EP" in exemples.columns else pd.Series("", index=exemples.index)
+        valeurs = exemples[valeur] if valeur else pd.Series("", index=exemples.index)
+        self.lignes.append(pd.DataFrame({
+            "CONTROLE": controle, "SOURCE": source,
+            "EAN": texte_ean(exemples["EAN"].to_numpy()).to_numpy(),
+            "LIBELLE": _texte(libelles), "VALEUR": _texte(valeurs),
+        }))
+
+    def anomalies(self):
+        synthese = pd.DataFrame(self.synthese, columns=["CONTROLE", "SOURCE", "LIGNES", "ACTION"])
+        colonnes = ["CONTROLE", "SOURCE", "EAN", "LIBELLE", "VALEUR"]
+        lignes = pd.concat(self.lignes, ignore_index=True) if self.lignes else pd.DataFrame(columns=colonnes)
+        return Anomalies(synthese, lignes)
+
+
+def _texte(serie):
+    return serie.astype(object).where(serie.notna(), "").astype(str).to_numpy()
+
+
+def _numerique(df, nom):
+    return pd.to_numeric(df[nom], errors="coerce").to_numpy(dtype=float)
+
+
+def lignes_fusion(gauche, droite):
+    """Lignes produites par la jointure gauche de deux colonnes de cles, sans la faire"""
+    par_cle = pd.Series(droite).value_counts(dropna=False)
+    return int(par_cle.reindex(pd.Series(gauche).to_numpy()).fillna(1).clip(lower=1).sum())
+
+
+def _cles(df, source, politique, rapport, doublons=True):
+    """EAN invalides et doublons (si `doublons`) d'une source, releves puis traites selon la politique : lignes gardees"""
+    ean = df["EAN"]
+    invalides = (ean.isna() | ean.eq(0)).to_numpy(dtype=bool, na_value=True)
+    doublons = (ean.duplicated(keep=False).to_numpy() if doublons else np.zeros(len(df), dtype=bool)) & ~invalides
+    rapport.ajouter("EAN vide, nul ou non numerique", source, df, invalides,
+                    "conservees" if politique == "garder" else "lignes ecartees")
+    rapport.ajouter("EAN en double", source, df, doublons, ACTIONS_DOUBLONS[politique])
+    if politique == "garder":
+        return df
+    ecartees = invalides | (ean.duplicated(keep="first").to_numpy() if politique == "premier" else doublons)
+    return df[~ecartees] if ecartees.any() else df
+
+
+def valider_sources(df_recap, ventes_ean, config=None):
+    """(RECAP, ventes par EAN, Anomalies) : sources controlees, EAN fautifs traites selon config.politique_doublons"""
+    config = config or Config()
+    if config.politique_doublons not in POLITIQUES:
+        raise ValueError(f"Politique de doublons inconnue : {config.politique_doublons} ({', '.join(POLITIQUES)})")
+    debut = time.perf_counter()
+    rapport = _Rapport()
+
+    # CLES
+    df_recap = _cles(df_recap, "RECAP", config.politique_doublons, rapport)
+    # ventes cumulees par EAN : EAN invalides seulement (plusieurs lignes par EAN = plusieurs magasins)
+    ventes_ean = _cles(ventes_ean, "VENTES", config.politique_doublons, rapport, doublons=False)
+    # fusion reelle : RECAP x ventes cumulees
+    lignes = lignes_fusion(df_recap["EAN"], ventes_ean["EAN"])
+    if lignes > len(df_recap):
+        rapport.synthese.append(("Lignes ajoutees par la fusion", "RECAP + VENTES", lignes - len(df_recap),
+                                 f"{lignes} lignes pour {len(df_recap)} articles"))
+        if lignes > FACTEUR_FUSION_MAX * max(len(df_recap), 1):
+            raise ValueError(f"Fusion RECAP + ventes : {lignes} lignes pour {len(df_recap)} articles "
+                             f"(EAN en double) -> politique de doublons 'premier' ou 'rejeter'")
+
+    # CONTROLES FACULTATIFS, dans la limite du budget : (controle, source, table, masque, action, colonne affichee)
+    vendus = ventes_ean[ventes_ean["VENTES_HEBDO"].to_numpy(dtype=float) > 0]
+    controles = [("EAN vendu absent du RECAP", "VENTES", vendus,
+                  lambda: ~vendus["EAN"].isin(df_recap["EAN"]).to_numpy(), "ventes non comptees", "VENTES_HEBDO")]
+    for nom in COLONNES_NUMERIQUES:
+        if nom in df_recap.columns:
+            controles.append((f"{nom} vide ou non numerique", "RECAP", df_recap,
+                              lambda nom=nom: np.isnan(_numerique(df_recap, nom)), "compte 0", None))
+    if "Stock EP" in df_recap.columns:
+        controles.append(("Stock EP negatif", "RECAP", df_recap,
+                          lambda: _numerique(df_recap, "Stock EP") < 0, "conserve", "Stock EP"))
+    if "P.Vente" in df_recap.columns:
+        controles.append(("P.Vente nul ou negatif", "RECAP", df_recap,
+                          lambda: _numerique(df_recap, "P.Vente") <= 0, "CA compte 0", "P.Vente"))
+        if "P.Achat" in df_recap.columns:
+            controles.append(("P.Achat superieur au P.Vente", "RECAP", df_recap,
+                              lambda: _numerique(df_recap, "P.Achat") > _numerique(df_recap, "P.Vente"),
+                              "marge negative", "P.Achat"))
+    controles.append(("Ventes negatives (retours)", "VENTES", ventes_ean,
+                      lambda: ventes_ean["VENTES_HEBDO"].to_numpy(dtype=float) < 0, "conservees", "VENTES_HEBDO"))
+    for controle, source, df, masque, action, valeur in controles:
+        if time.perf_counter() - debut > config.validation_budget:
+            rapport.synthese.append((controle, source, 0, f"non fait (budget de {config.validation_budget:g} s depasse)"))
+            continue
+        rapport.ajouter(controle, source, df, masque(), action, valeur)
+    return df_recap, ventes_ean, rapport.anomalies()
@@ -0,0 +1,166 @@
+"""Photo compacte de chaque semaine calculee et ecarts avec la photo precedente (feuille VARIATIONS).
+
+Les semaines passees ne sont ni relues ni recalculees : seule leur photo (quelques colonnes par EAN) est lue,
+puis jointe a la semaine courante sur l'index EAN.
+"""
+import os
+import pickle
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .compact import texte_ean
+from .config import Config, code_enseigne
+from .indicateurs import STATUS_ORDRE
+
+COLONNES_SNAPSHOT = ["EAN", "MARQUE", "LIBELLE", "STATUS", "STOCK_EP", "VENTES_HEBDO", "CA_HEBDO", "COUVERTURE"]
+_SNAPSHOT = re.compile(r"^(.+)_(\d{4}-\d{2}-\d{2})\.(feather|pkl)$")
+
+
+@dataclass
+class Variations:
+    """Ecarts d'une semaine avec la precedente : {nom: table} dans l'ordre de la feuille"""
+    semaine: pd.Timestamp
+    semaine_precedente: pd.Timestamp
+    tables: dict
+
+
+def photo(dashboard):
+    """Colonnes du snapshot, une ligne par EAN (EAN inconnus et doublons ecartes)"""
+    df = dashboard[[c for c in COLONNES_SNAPSHOT if c in dashboard.columns]]
+    df = df[df["EAN"].notna()].drop_duplicates("EAN")
+    return df.reset_index(drop=True)
+
+
+def snapshots(enseigne, config):
+    """{date de debut de semaine: chemin} des photos enregistrees pour l'enseigne"""
+    prefixe = code_enseigne(enseigne)
+    trouves = {}
+    try:
+        entrees = list(os.scandir(config.dossier_snapshots))
+    except OSError:
+        return trouves
+    for e in entrees:
+        m = _SNAPSHOT.match(e.name)
+        if m and m.group(1) == prefixe:
+            trouves[pd.Timestamp(m.group(2))] = e.path
+    return trouves
+
+
+def enregistrer_snapshot(photo_semaine, enseigne, date_semaine, config):
+    """Ecrit la photo de la semaine (Feather, ou pickle sans pyarrow) : chemin ecrit"""
+    os.makedirs(config.dossier_snapshots, exist_ok=True)
+    base = os.path.join(config.dossier_snapshots, f"{code_enseigne(enseigne)}_{date_semaine:%Y-%m-%d}")
+    try:
+        photo_semaine.to_feather(base + ".feather")
+        chemin, autre = base + ".feather", base + ".pkl"
+    except Exception:
+        # pyarrow absent ou colonne de types mixtes : repli sur pickle
+        photo_semaine.to_pickle(base + ".pkl", protocol=pickle.HIGHEST_PROTOCOL)
+        chemin, autre = base + ".pkl", base + ".feather"
+    if os.path.exists(autre):
+        os.remove(autre)
+    return chemin
+
+
+def snapshot_precedent(enseigne, date_semaine, config, connu=None):
+    """(date, photo) la plus recente avant date_semaine, (None, None) si aucune.
+
+    connu : (date, photo) deja en memoire (batch) ; relue sur disque seulement si une photo plus recente y existe.
+    """
+    date_semaine = pd.Timestamp(date_semaine).normalize()
+    anterieures = {d: chemin for d, chemin in snapshots(enseigne, config).items() if d < date_semaine}
+    if connu is not None and connu[0] < date_semaine and (not anterieures or connu[0] >= max(anterieures)):
+        return connu
+    if not anterieures:
+        return None, None
+    date = max(anterieures)
+    chemin = anterieures[date]
+    try:
+        df = pd.read_feather(chemin) if chemin.endswith(".feather") else pd.read_pickle(chemin)
+    except Exception as e:
+        print(f"Photo illisible {os.path.basename(chemin)} ({e}) -> pas de VARIATIONS")
+        return None, None
+    return date, df
+
+
+def _texte(serie):
+    return serie.astype(object).where(serie.notna(), "").to_numpy()
+
+
+def _articles(df, colonnes):
+    """Table d'articles a afficher (EAN en texte, categories en objets)"""
+    table = pd.DataFrame({"EAN": texte_ean(df.index.to_numpy())})
+    for nom in colonnes:
+        if nom in df.columns:
+            serie = df[nom]
+            table[nom] = _texte(serie) if not pd.api.types.is_numeric_dtype(serie.dtype) else serie.to_numpy()
+    return table
+
+
+def _par_ca(df):
+    return df.sort_values("CA_HEBDO", ascending=False, kind="stable")
+
+
+def calculer_variations(courant, precedent, n=10):
+    """Ecarts entre deux photos jointes sur l'EAN : {nom: table}.
+
+    statuts (nombre d'articles par transition), transitions (articles dont le STATUS change),
+    hausses_ca / baisses_ca (n plus forts ecarts de CA), nouveaux et disparus.
+    """
+    apres = courant.set_index("EAN")
+    avant = precedent.set_index("EAN")
+    communs = apres.index.intersection(avant.index)
+    a, b = apres.reindex(communs), avant.reindex(communs)
+
+    # TRANSITIONS DE STATUS
+    statut, statut_prec = a["STATUS"].astype(str).to_numpy(), b["STATUS"].astype(str).to_numpy()
+    change = statut != statut_prec
+    joint = pd.DataFrame({"MARQUE": a["MARQUE"].to_numpy(), "LIBELLE": a["LIBELLE"].to_numpy(),
+                          "STATUS_PREC": statut_prec, "STATUS": statut,
+                          "COUVERTURE_PREC": b["COUVERTURE"].to_numpy(dtype=float),
+                          "COUVERTURE": a["COUVERTURE"].to_numpy(dtype=float),
+                          "CA_PREC": b["CA_HEBDO"].to_numpy(dtype=float), "CA_HEBDO": a["CA_HEBDO"].to_numpy(dtype=float)},
+                         index=communs)
+    joint["ECART_CA"] = joint["CA_HEBDO"] - joint["CA_PREC"]
+    rang = pd.Categorical(statut, categories=STATUS_ORDRE).codes
+    ordre = np.lexsort((-joint["CA_HEBDO"].to_numpy()[change], rang[change]))
+    transitions = joint[change].iloc[ordre]
+    statuts = (transitions.groupby(["STATUS_PREC", "STATUS"], sort=False).size()
+               .reset_index(name="ARTICLES").sort_values("ARTICLES", ascending=False, kind="stable"))
+    statuts.insert(0, "TRANSITION", statuts.pop("STATUS_PREC") + " -> " + statuts.pop("STATUS"))
+
+    # CA : plus fortes hausses et baisses
+    ecarts = joint["ECART_CA"].to_numpy()
+    hausses = joint[ecarts > 0].iloc[np.argsort(-ecarts[ecarts > 0], kind="stable")[:n]]
+    baisses = joint[ecarts < 0].iloc[np.argsort(ecarts[ecarts < 0], kind="stable")[:n]]
+
+    colonnes_ca = ["MARQUE", "LIBELLE", "CA_PREC", "CA_HEBDO", "ECART_CA", "STATUS"]
+    colonnes_article = ["MARQUE", "LIBELLE", "STATUS", "STOCK_EP", "VENTES_HEBDO", "CA_HEBDO"]
+    return {
+        "statuts": statuts.reset_index(drop=True),
+        "transitions": _articles(transitions, ["MARQUE", "LIBELLE", "STATUS_PREC", "STATUS",
+                                               "COUVERTURE_PREC", "COUVERTURE", "CA_HEBDO"]),
+        "hausses_ca": _articles(hausses, colonnes_ca),
+        "baisses_ca": _articles(baisses, colonnes_ca),
+        "nouveaux": _articles(_par_ca(apres.loc[apres.index.difference(avant.index, sort=False)]), colonnes_article),
+        "disparus": _articles(_par_ca(avant.loc[avant.index.difference(apres.index, sort=False)]), colonnes_article),
+    }
+
+
+def variations_semaine(dashboard, enseigne, date_semaine, config=None, connu=None):
+    """Photo de la semaine enregistree + ecarts avec la photo precedente : (Variations ou None, (date, photo))"""
+    config = config or Config()
+    date_semaine = pd.Timestamp(date_semaine).normalize()
+    courant = photo(dashboard)
+    date_prec, precedent = snapshot_precedent(enseigne, date_semaine, config, connu)
+    enregistrer_snapshot(courant, enseigne, date_semaine, config)
+    if precedent is None:
+        print(f"Pas de photo avant le {date_semaine:%d/%m/%Y} pour {enseigne} -> pas de VARIATIONS")
+        return None, (date_semaine, courant)
+    tables = calculer_variations(courant, precedent, config.variations_top_n)
+    print(f"VARIATIONS vs {date_prec:%d/%m/%Y}: {len(tables['transitions'])} changements de STATUS, "
+          f"{len(tables['nouveaux'])} nouveaux, {len(tables['disparus'])} disparus")
+    return Variations(date_semaine, date_prec, tables), (date_semaine, courant)
@@ -0,0 +1,45 @@
+import importlib.util
+import os
+
+import pytest
+
+from dashboard_rotation import batch
+from dashboard_rotation.config import Config
+
+_spec = importlib.util.spec_from_file_location(
+    "generer_donnees_test", os.path.join(os.path.dirname(__file__), "..", "benchmark", "generer_donnees_test.py"))
+generateur = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(generateur)
+
+
+@pytest.fixture(scope="module")
+def donnees(tmp_path_factory):
+    dossier = tmp_path_factory.mktemp("donnees")
+    generateur.generer(str(dossier), nb_articles=80, nb_semaines=2, nb_enseignes=2, colonnes_extra=0)
+    return dossier
+
+
+def _config(donnees, sortie):
+    return Config(dossier_data=str(donnees), dossier_sortie=str(sortie), cache_actif=False, batch_processus=1,
+                  fichier_catalogue=None)
+
+
+def test_batch_enseigne_sans_recap(donnees, tmp_path):
+    # MARJANE n'a pas de RECAP : son Stock (sans BURINTEL DEPOT) sert de RECAP
+    generes = batch.generer_batch(config=_config(donnees, tmp_path))
+    assert len(generes) == 4
+    assert sum("MARJANE" in os.path.basename(f) for f in generes) == 2
+
+
+def test_batch_couple_en_erreur_saute(donnees, tmp_path, monkeypatch, capsys):
+    calculer = batch.calculer_dashboard
+
+    def calculer_sauf_marjane(df_recap, *args):
+        if "Enseigne" in df_recap.columns:
+            raise ValueError("RECAP illisible")
+        return calculer(df_recap, *args)
+
+    monkeypatch.setattr(batch, "calculer_dashboard", calculer_sauf_marjane)
+    generes = batch.generer_batch(config=_config(donnees, tmp_path))
+    assert len(generes) == 2
+    assert "Erreur MARJANE" in capsys.readouterr().out
@@ -0,0 +1,87 @@
+"""Proposition de commande : codes Burintel joints quel que soit leur type de lecture."""
+import numpy as np
+import pandas as pd
+
+from dashboard_rotation.commandes import _allouer, calculer_commandes
+from dashboard_rotation.compact import cle_ean, texte_code, texte_ean
+from dashboard_rotation.config import Config
+from dashboard_rotation.indicateurs import calculer_dashboard
+from dashboard_rotation.schemas import SCHEMAS
+
+
+def _recap(codes):
+    """RECAP de len(codes) articles sans stock EP, types comme a la lecture"""
+    n = len(codes)
+    recap = pd.DataFrame({
+        "EAN": np.arange(6111000000000, 6111000000000 + n), "MARQUE": "LG",
+        "Libelle EP": [f"TV modele {i}" for i in range(n)], "Stock EP": 0, "P.Vente": 100.0, "P.Achat": 60.0,
+        "BURINTEL DEPOT": 0, "Code Burintel": codes,
+    })
+    return SCHEMAS["recap"].typer(recap)
+
+
+def _dashboard(recap, ventes=7):
+    ventes_ean = pd.DataFrame({"EAN": recap["EAN"], "VENTES_HEBDO": ventes})
+    return calculer_dashboard(recap, ventes_ean, Config())
+
+
+def test_texte_code_canonique():
+    assert texte_code([12345, np.nan]).tolist() == ["12345", ""]
+    assert texte_code(pd.Series([12345.0, " B01 "], dtype=object)).tolist() == ["12345", "B01"]
+    assert texte_code(pd.Series(["12345.0", "12345"]).astype("category")).tolist() == ["12345", "12345"]
+
+
+def test_texte_ean_zeros_de_tete():
+    # EAN-13 commencant par 0 : perdus en Int64, rendus a l'export
+    assert texte_ean(cle_ean(["0012345678905", "6111234567890", "12345678901231"])).tolist() == [
+        "0012345678905", "6111234567890", "12345678901231"]
+
+
+def test_codes_burintel_avec_vides():
+    # colonne de codes avec un vide : lue en float64 (12345.0), N° LABBURINTEL lu en entier
+    recap = _recap([12345, np.nan])
+    burintel = pd.DataFrame({"N°": [12345], "Description": ["TV"], "STOCK_BURINTEL": [100.0]})
+    commandes = calculer_commandes(_dashboard(recap), burintel, Config())
+    par_ean = commandes.set_index("EAN")
+    assert par_ean.loc["6111000000000", "QTE_BURINTEL"] == par_ean.loc["6111000000000", "QTE_COMMANDE"] > 0
+    assert par_ean.loc["6111000000000", "SOURCE"] == "BURINTEL"
+    assert par_ean.loc["6111000000001", "QTE_BURINTEL"] == 0
+
+
+def test_ligne_burintel_sans_numero_ignoree():
+    recap = _recap([np.nan, np.nan])
+    burintel = pd.DataFrame({"N°": [np.nan], "Description": ["TV"], "STOCK_BURINTEL": [100.0]})
+    commandes = calculer_commandes(_dashboard(recap), burintel, Config())
+    assert (commandes["QTE_BURINTEL"] == 0).all()
+
+
+def _allouer_naif(besoin, groupes, disponible, priorite):
+    """Reference : lignes servies une a une, par groupe puis priorite croissante"""
+    reste = disponible.astype(float).copy()
+    servi = np.zeros(len(besoin))
+    for i in sorted(range(len(besoin)), key=lambda i: (groupes[i], priorite[i], i)):
+        if groupes[i] >= 0 and besoin[i] > 0:
+            servi[i] = min(besoin[i], max(reste[groupes[i]], 0))
+            reste[groupes[i]] -= servi[i]
+    return servi
+
+
+def test_allouer_comme_la_reference():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        n, nb_groupes = rng.integers(1, 40), rng.integers(1, 6)
+        besoin = rng.integers(0, 10, n).astype(float)
+        groupes = rng.integers(-1, nb_groupes, n)
+        disponible = rng.integers(0, 25, nb_groupes).astype(float)
+        priorite = rng.permutation(n).astype(float)      # priorites distinctes : ordre sans ambiguite
+        np.testing.assert_array_equal(_allouer(besoin, groupes, disponible, priorite),
+                                      _allouer_naif(besoin, groupes, disponible, priorite))
+
+
+def test_stock_burintel_partage_les_plus_urgents_dabord():
+    recap = _recap(["B1", "B1", "B1"])
+    recap["Stock EP"] = [3.0, 0.0, 6.0]        # couvertures 3, 0 et 6 jours
+    burintel = pd.DataFrame({"N°": ["B1"], "Description": ["TV"], "STOCK_BURINTEL": [40.0]})
+    commandes = calculer_commandes(_dashboard(recap), burintel, Config()).set_index("EAN")
+    # besoin = 7 / 7 x 35 - stock : 32, 35 puis 29 ; 40 unites pour le plus urgent puis le suivant
+    assert commandes["QTE_BURINTEL"].to_dict() == {"6111000000001": 35, "6111000000000": 5, "6111000000002": 0}
@@ -0,0 +1,98 @@
+import zipfile
+
+import pandas as pd
+import pytest
+
+from dashboard_rotation.lecture_xlsx import lire_colonnes
+
+NS = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+STYLES = (f'<styleSheet {NS}><fonts count="1"><font/></fonts><fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+          '<borders count="1"><border/></borders><cellStyleXfs count="1"><xf numFmtId="0"/></cellStyleXfs>'
+          '<cellXfs count="2"><xf numFmtId="0" xfId="0"/><xf numFmtId="14" xfId="0" applyNumberFormat="1"/></cellXfs>'
+          '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles></styleSheet>')
+
+
+def _classeur(chemin, lignes, partages=()):
+    """Classeur .xlsx minimal ecrit a la main : lignes XML de la feuille, chaines partagees (XML des <si>)"""
+    fichiers = {
+        "[Content_Types].xml":
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/></Types>',
+        "_rels/.rels":
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="xl/workbook.xml" Type="http://schemas.openxmlformats.org/'
+            'officeDocument/2006/relationships/officeDocument"/></Relationships>',
+        "xl/workbook.xml":
+            f'<workbook {NS} xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="Feuil1" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        "xl/_rels/workbook.xml.rels":
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="worksheets/sheet1.xml" Type="http://schemas.openxmlformats.org/'
+            'officeDocument/2006/relationships/worksheet"/>'
+            '<Relationship Id="rId2" Target="sharedStrings.xml" Type="http://schemas.openxmlformats.org/'
+            'officeDocument/2006/relationships/sharedStrings"/>'
+            '<Relationship Id="rId3" Target="styles.xml" Type="http://schemas.openxmlformats.org/'
+            'officeDocument/2006/relationships/styles"/></Relationships>',
+        "xl/worksheets/sheet1.xml": f'<worksheet {NS}><sheetData>{"".join(lignes)}</sheetData></worksheet>',
+        "xl/sharedStrings.xml": f'<sst {NS}>{"".join(partages)}</sst>',
+        "xl/styles.xml": STYLES,
+    }
+    with zipfile.ZipFile(chemin, "w") as archive:
+        for nom, contenu in fichiers.items():
+            archive.writestr(nom, '<?xml version="1.0" encoding="UTF-8"?>' + contenu)
+    return chemin
+
+
+ENTETE = ('<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c><c r="C1" t="s"><v>2</v></c>'
+          '<c r="D1" t="s"><v>3</v></c></row>')
+PARTAGES = ["<si><t>EAN</t></si>", "<si><t>Libelle</t></si>", "<si><t>Autre</t></si>", "<si><t>Date</t></si>",
+            # texte riche : runs concatenes, texte phonetique ignore
+            '<si><r><t>Tele</t></r><r><rPr><b/></rPr><t xml:space="preserve">vision 4K</t></r>'
+            '<rPh sb="0" eb="1"><t>terebi</t></rPh></si>',
+            "<si><t>Radio &amp; co</t></si>"]
+
+
+def _comparer(chemin, colonnes):
+    lu = lire_colonnes(chemin, 0, lambda entete: colonnes)
+    attendu = pd.read_excel(chemin, usecols=colonnes).dropna(how="all").reset_index(drop=True)
+    pd.testing.assert_frame_equal(lu, attendu, check_dtype=False)
+    return lu
+
+
+def test_textes_dates_et_vides_comme_pandas(tmp_path):
+    lignes = [
+        ENTETE,
+        # chaine partagee riche, date au style 14, attributs avant r
+        '<row r="2"><c r="A2"><v>6111000000001</v></c><c t="s" r="B2"><v>4</v></c><c r="C2"><v>1</v></c>'
+        '<c s="1" r="D2"><v>45292</v></c></row>',
+        # texte en ligne simple puis riche, entites echappees, date ISO (t="d")
+        '<row r="3"><c r="A3"><v>6111000000002</v></c><c r="B3" t="inlineStr"><is><t>Cafe &amp; &quot;the&quot;'
+        '</t></is></c><c r="C3"><v>2</v></c><c r="D3" t="d"><v>2024-01-08T00:00:00</v></c></row>',
+        '<row r="4"><c r="A4"><v>6111000000003</v></c><c r="B4" t="inlineStr"><is><r><t>Lave</t></r><r><rPr><i/>'
+        '</rPr><t xml:space="preserve">-linge</t></r></is></c><c r="D4" s="1"/></row>',
+        # cellules vides (style seul) et erreur : ligne ignoree dans les colonnes lues
+        '<row r="5"><c r="A5" s="1"/><c r="B5" t="e"><v>#N/A</v></c><c r="C5"><v>3</v></c></row>',
+        '<row r="7"><c r="A7"><v>6111000000004</v></c><c r="B7" t="s"><v>5</v></c><c r="C7"><v>4.5</v></c>'
+        '<c r="D7" s="1"><v>45306</v></c></row>',
+    ]
+    chemin = _classeur(tmp_path / "ventes.xlsx", lignes, PARTAGES)
+    lu = _comparer(chemin, ["EAN", "Libelle", "Date"])
+    assert list(lu["Libelle"]) == ["Television 4K", 'Cafe & "the"', "Lave-linge", "Radio & co"]
+    _comparer(chemin, ["Autre"])
+
+
+def test_cellules_sans_reference_refusees(tmp_path):
+    lignes = ['<row r="1"><c t="s"><v>0</v></c><c t="s"><v>1</v></c></row>',
+              '<row r="2"><c><v>6111000000001</v></c><c t="s"><v>2</v></c></row>']
+    chemin = _classeur(tmp_path / "sans_r.xlsx", lignes, PARTAGES)
+    with pytest.raises(ValueError, match="sans reference"):
+        lire_colonnes(chemin, 0, lambda entete: ["EAN"])
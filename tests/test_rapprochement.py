@@ -0,0 +1,73 @@
+"""Rapprochement LABBURINTEL : code, puis libelle par index de trigrammes, compare a un calcul naif."""
+import numpy as np
+import pandas as pd
+
+from dashboard_rotation.config import Config
+from dashboard_rotation.rapprochement import IndexTrigrammes, normaliser_libelles, rapprocher_burintel
+from dashboard_rotation.schemas import SCHEMAS
+
+
+def _trigrammes_naifs(libelle):
+    borne = f" {libelle} " if libelle else ""
+    return {borne[i:i + 3] for i in range(len(borne) - 2)}
+
+
+def _dice_naif(a, b):
+    ta, tb = _trigrammes_naifs(a), _trigrammes_naifs(b)
+    return 2 * len(ta & tb) / (len(ta) + len(tb)) if ta or tb else 0.0
+
+
+def test_normaliser_libelles():
+    assert normaliser_libelles(["Réfrigérateur  LG-320L", None]).tolist() == ["REFRIGERATEUR LG 320L", ""]
+
+
+def test_dice_comme_le_calcul_naif():
+    rng = np.random.default_rng(1)
+    mots = ["TV", "LED", "SAMSUNG", "LG", "55", "43", "UA55", "NOIR", "BLANC", "INOX", "FOUR", "4K", "SMART"]
+    descriptions = [" ".join(rng.choice(mots, rng.integers(1, 5))) for _ in range(300)]
+    libelles = [" ".join(rng.choice(mots, rng.integers(1, 5))) for _ in range(200)] + [""]
+    index = IndexTrigrammes(normaliser_libelles(descriptions))
+    trouve, score = index.chercher(normaliser_libelles(libelles))
+    for libelle, d, s in zip(libelles, trouve, score):
+        if d < 0:
+            continue
+        # score exact de la description retenue
+        assert np.isclose(s, _dice_naif(libelle, descriptions[d]))
+    # sur des descriptions toutes distinctes par un trigramme rare, le meilleur candidat est le meilleur absolu
+    references = [f"ARTICLE {i:05d} {rng.choice(mots)}" for i in range(500)]
+    requetes = [r.lower() for r in references[::7]]
+    trouve, score = IndexTrigrammes(normaliser_libelles(references)).chercher(normaliser_libelles(requetes))
+    for requete, d, s in zip(requetes, trouve, score):
+        naifs = [_dice_naif(requete.upper(), r) for r in references]
+        assert np.isclose(s, max(naifs)) and np.isclose(naifs[d], max(naifs))
+
+
+def test_code_puis_libelle_un_code_par_article():
+    # codes lus en float (cellule vide) des deux cotes
+    recap = SCHEMAS["recap"].typer(pd.DataFrame({
+        "EAN": [1, 2, 3, 4],
+        "Libelle EP": ["TV SAMSUNG 55 UA55AU7000", "LAVE LINGE BEKO 8KG WTV8", "LAVE LINGE BEKO 8KG WTV8 BLANC",
+                       "CLIMATISEUR SANS EQUIVALENT"],
+        "Code Burintel": [101.0, np.nan, np.nan, np.nan],
+    }))
+    burintel = pd.DataFrame({"N°": [101.0, 202.0, np.nan],
+                             "Description": ["Televiseur Samsung", "Lave-linge Beko 8kg WTV8", "Climatiseur"],
+                             "STOCK_BURINTEL": [5.0, 9.0, 3.0]})
+    r = rapprocher_burintel(recap, burintel, Config())
+    assert r["RAPPROCHEMENT"].tolist() == ["CODE", "LIBELLE", "", ""]
+    assert r["CODE_BURINTEL"].tolist() == ["101", "202", "", ""]
+    assert r["STOCK_BURINTEL"].tolist() == [5.0, 9.0, 0.0, 0.0]
+    assert r["CONFIANCE_BURINTEL"].iloc[0] == 1
+    # le code 202 va a l'article le plus proche (meme libelle une fois normalise) ; le second, au-dessus du
+    # seuil mais moins ressemblant, n'a rien
+    assert r["CONFIANCE_BURINTEL"].iloc[1] == 1
+    assert _dice_naif("LAVE LINGE BEKO 8KG WTV8 BLANC", "LAVE LINGE BEKO 8KG WTV8") >= Config().seuil_rapprochement
+
+
+def test_code_deja_rapproche_non_repris_par_libelle():
+    recap = pd.DataFrame({"EAN": [1, 2], "Libelle EP": ["TV SAMSUNG 55", "TV SAMSUNG 55"],
+                          "Code Burintel": ["B1", None]})
+    burintel = pd.DataFrame({"N°": ["B1"], "Description": ["TV SAMSUNG 55"], "STOCK_BURINTEL": [5.0]})
+    r = rapprocher_burintel(recap, burintel, Config())
+    assert r["RAPPROCHEMENT"].tolist() == ["CODE", ""]
+    assert r["STOCK_BURINTEL"].sum() == 5
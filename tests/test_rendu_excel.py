@@ -0,0 +1,20 @@
+import re
+import zipfile
+
+import pandas as pd
+
+from dashboard_rotation.modele_rendu import COULEURS_STATUS, feuille_suivi
+from dashboard_rotation.rendu_excel import exporter_xlsxwriter
+
+
+def test_suivi_xlsxwriter_en_mise_en_forme_conditionnelle(tmp_path):
+    suivi = pd.DataFrame({"EAN": ["1", "2", "3"], "STATUS": ["URGENT", "STABLE", "MORT"], "CA_HEBDO": [3.0, 2.0, 1.0]})
+    fichier = tmp_path / "suivi.xlsx"
+    exporter_xlsxwriter(str(fichier), [feuille_suivi(suivi)])
+
+    feuille = zipfile.ZipFile(fichier).read("xl/worksheets/sheet1.xml").decode()
+    assert re.findall(r'text="([A-Z]+)"', feuille) == list(COULEURS_STATUS)
+    assert re.findall(r'sqref="([A-Z0-9:]+)"', feuille) == ["A2:C4", "B2:B4"]
+    assert re.findall(r"<formula>(MOD\(ROW\(\),2\)=\d)</formula>", feuille) == ["MOD(ROW(),2)=0", "MOD(ROW(),2)=1"]
+    # couleurs portees par les regles : aucune cellule de donnees n'a de format propre au STATUS
+    assert len(set(re.findall(r'<c r="B[2-4]" s="(\d+)"', feuille))) <= 1
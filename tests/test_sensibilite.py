@@ -0,0 +1,49 @@
+"""Sensibilite aux seuils : chaque combinaison comparee au dashboard recalcule avec ces seuils."""
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from dashboard_rotation import sensibilite
+from dashboard_rotation.config import Config
+from dashboard_rotation.indicateurs import calculer_dashboard
+
+
+def _dashboard(n, config, seed=0):
+    rng = np.random.default_rng(seed)
+    recap = pd.DataFrame({
+        "EAN": np.arange(n), "Libelle EP": "Article", "Stock EP": rng.integers(0, 60, n),
+        "P.Vente": rng.uniform(10, 500, n).round(2), "P.Achat": rng.uniform(5, 300, n).round(2), "BURINTEL DEPOT": 0,
+    })
+    ventes = pd.DataFrame({"EAN": np.arange(n), "VENTES_HEBDO": rng.integers(0, 12, n) * (rng.random(n) < 0.8)})
+    return recap, ventes, calculer_dashboard(recap, ventes, config)
+
+
+def test_sensibilite_comme_le_recalcul(monkeypatch):
+    monkeypatch.setattr(sensibilite, "BLOC", 97)     # plusieurs blocs, le dernier incomplet
+    config = replace(Config(), grille_urgent=[7, 14, 20.5], grille_commande=[14, 28, 35],
+                     grille_blockbuster=[0.2, 0.5], grille_stock_mort=[0, 5, 20])
+    recap, ventes, dashboard = _dashboard(500, config)
+    table = sensibilite.calculer_sensibilite(dashboard, config)
+    assert len(table) == 3 * 3 * 2 * 3
+    assert (table["REGLAGE"] == "ACTUEL").sum() == 0      # seuils de la config hors grilles
+    for ligne in table.itertuples():
+        seuils = replace(config, seuil_urgent=ligne.SEUIL_URGENT, seuil_commande=ligne.SEUIL_COMMANDE,
+                         seuil_blockbuster=ligne.SEUIL_BLOCKBUSTER, seuil_stock_mort=ligne.SEUIL_STOCK_MORT)
+        reference = calculer_dashboard(recap, ventes, seuils)
+        status = reference["STATUS"].astype(str)
+        for nom in ["URGENT", "A COMMANDE", "BLOCKBUSTER", "STOCK MORT", "STABLE"]:
+            assert getattr(ligne, f"NB_{nom.replace(' ', '_')}") == (status == nom).sum(), (nom, ligne)
+        mort = status == "STOCK MORT"
+        assert np.isclose(ligne.VALEUR_IMMOBILISEE, (reference["STOCK_EP"] * reference["P.ACHAT"])[mort].sum())
+        assert np.isclose(ligne.CA_URGENT, reference["CA_HEBDO"][status == "URGENT"].sum())
+        assert np.isclose(ligne.CA_A_COMMANDE, reference["CA_HEBDO"][status == "A COMMANDE"].sum())
+
+
+def test_ligne_actuelle():
+    config = Config()
+    _, _, dashboard = _dashboard(200, config, seed=1)
+    table = sensibilite.calculer_sensibilite(dashboard, config)
+    actuel = table[table["REGLAGE"] == "ACTUEL"]
+    assert len(actuel) == 1
+    assert actuel["NB_URGENT"].iloc[0] == (dashboard["STATUS"] == "URGENT").sum()
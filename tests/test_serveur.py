@@ -0,0 +1,42 @@
+import importlib.util
+import os
+
+import pytest
+
+from dashboard_rotation.config import Config
+from dashboard_rotation.pipeline import MemoireSources
+from dashboard_rotation.serveur import DashboardsEnMemoire
+
+_spec = importlib.util.spec_from_file_location(
+    "generer_donnees_test", os.path.join(os.path.dirname(__file__), "..", "benchmark", "generer_donnees_test.py"))
+generateur = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(generateur)
+
+
+@pytest.fixture
+def relus(monkeypatch):
+    """Noms des sources relues a chaque chargement"""
+    lectures = []
+    charger = MemoireSources.charger
+
+    def charger_trace(self, taches, signatures, mode):
+        sources, noms = charger(self, taches, signatures, mode)
+        lectures.append(noms)
+        return sources, noms
+
+    monkeypatch.setattr(MemoireSources, "charger", charger_trace)
+    return lectures
+
+
+def test_changer_de_vue_ne_relit_pas_les_sources(tmp_path, relus):
+    generateur.generer(str(tmp_path), nb_articles=80, nb_semaines=2, nb_enseignes=2, colonnes_extra=0)
+    dashboards = DashboardsEnMemoire(Config(dossier_data=str(tmp_path), cache_actif=False, enseigne="ELECTROPLANET"))
+    dashboards.vue()
+    assert relus[0] == {"stock", "ventes", "burintel", "recap"}
+    # semaine absente : erreur sans relecture
+    with pytest.raises(ValueError):
+        dashboards.vue(semaine="W40")
+    assert relus[1] == set()
+    # autre enseigne : seuls ses propres fichiers seraient relus, le Stock, les ventes et le Burintel sont partages
+    dashboards.vue(enseigne="MARJANE")
+    assert relus[2] == set()
@@ -0,0 +1,33 @@
+import glob
+import importlib.util
+import os
+
+from dashboard_rotation import surveillance
+from dashboard_rotation.config import Config
+from dashboard_rotation.pipeline import MemoireSources
+
+_spec = importlib.util.spec_from_file_location(
+    "generer_donnees_test", os.path.join(os.path.dirname(__file__), "..", "benchmark", "generer_donnees_test.py"))
+generateur = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(generateur)
+
+
+def test_nouvel_export_burintel_reecrit_les_commandes(tmp_path, monkeypatch):
+    generateur.generer(str(tmp_path), nb_articles=80, nb_semaines=2, nb_enseignes=2, colonnes_extra=0)
+    config = Config(dossier_data=str(tmp_path), cache_actif=False, enseigne="ELECTROPLANET", commandes_actives=True)
+    rendus = []
+    monkeypatch.setattr(surveillance, "render_dashboard", lambda resultat, config: rendus.append(resultat))
+    memoire = MemoireSources()
+
+    premier = surveillance.regenerer(memoire, config)
+    surveillance.regenerer(memoire, config, premier)
+    assert len(rendus) == 1
+
+    # nouvel export Burintel : dashboard identique (sans rapprochement), commandes recalculees
+    burintel, = glob.glob(os.path.join(str(tmp_path), "LABBURINTEL_*"))
+    st = os.stat(burintel)
+    os.utime(burintel, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    second = surveillance.regenerer(memoire, config, premier)
+    assert second.dashboard is premier.dashboard
+    assert second.commandes is not premier.commandes
+    assert len(rendus) == 2
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from dashboard_rotation.compact import cle_ean
+from dashboard_rotation.config import Config
+from dashboard_rotation.validation import valider_sources
+
+
+def _sources(recap_eans=("611", "612", "613")):
+    recap = pd.DataFrame({"EAN": cle_ean(list(recap_eans)), "Libelle EP": [f"L{i}" for i in range(len(recap_eans))],
+                          "P.Vente": 10.0})
+    # export a une ligne par magasin : 611 vendu dans deux magasins, cumule avant la validation
+    lignes = pd.DataFrame({"EAN": cle_ean(["611", "611", "612", "0"]), "Quantité": [4, 4, 1, 2]})
+    ventes_ean = lignes.groupby("EAN")["Quantité"].sum().reset_index(name="VENTES_HEBDO")
+    return recap, ventes_ean
+
+
+def _synthese(anomalies):
+    return {(c, s): n for c, s, n in anomalies.synthese[["CONTROLE", "SOURCE", "LIGNES"]].itertuples(index=False)}
+
+
+@pytest.mark.parametrize("politique", ["premier", "rejeter", "garder"])
+def test_ventes_multi_magasins_gardees(politique):
+    recap, ventes_ean = _sources()
+    _, ventes, anomalies = valider_sources(recap, ventes_ean, Config(politique_doublons=politique))
+    synthese = _synthese(anomalies)
+    assert ("EAN en double", "VENTES") not in synthese
+    assert synthese[("EAN vide, nul ou non numerique", "VENTES")] == 1
+    assert dict(zip(ventes["EAN"], ventes["VENTES_HEBDO"]))[611] == 8
+
+
+def test_doublons_du_recap_selon_la_politique():
+    recap, ventes_ean = _sources(("611", "611", "612"))
+    gardes = {p: valider_sources(recap, ventes_ean, Config(politique_doublons=p))[0]
+              for p in ("premier", "rejeter", "garder")}
+    assert list(gardes["premier"]["Libelle EP"]) == ["L0", "L2"]
+    assert list(gardes["rejeter"]["Libelle EP"]) == ["L2"]
+    assert len(gardes["garder"]) == 3
+
+
+def test_fusion_calculee_sur_les_ventes_cumulees():
+    recap, ventes_ean = _sources(("611",) * 3 + ("612",))
+    _, _, anomalies = valider_sources(recap, ventes_ean, Config(politique_doublons="garder"))
+    assert ("Lignes ajoutees par la fusion", "RECAP + VENTES") not in _synthese(anomalies)